@@ -7,9 +7,9 @@ main subwoofer aggregation logic to keep concerns isolated.
 import asyncio
 import json
 import math
+import os
 import re
 import time
-from dataclasses import dataclass, asdict
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Tuple
 
@@ -18,6 +18,12 @@ from bs4 import BeautifulSoup
 from fastapi import APIRouter, Query, HTTPException
 from fastapi.responses import JSONResponse
 
+from app.api.routes.subwoofers import _write_size_buckets
+from app.catalog import get_store
+from app.models.subwoofer import LITE_FIELDS, Subwoofer
+from app.scraping.client_pool import get_client
+from app.scraping.rate_limit import get_limiter
+
 router = APIRouter(prefix="/crutchfield", tags=["crutchfield"])
 
 # ---------- Storage ----------
@@ -26,16 +32,8 @@ DATA_DIR.mkdir(parents=True, exist_ok=True)
 DB_PATH = DATA_DIR / "subwoofers.json"
 
 # ---------- Model ----------
-@dataclass
-class SubwooferLite:
-    source: str
-    url: str
-    brand: str
-    model: str
-    size_in: Optional[float]
-    rms_w: Optional[int]
-    price_usd: Optional[float]
-    scraped_at: float
+# Lite records: the shared record type with only `LITE_FIELDS` filled in.
+SubwooferLite = Subwoofer
 
 # ---------- Helpers ----------
 UA_POOL = [
@@ -51,6 +49,8 @@ REQUEST_JITTER_MIN = 0.10
 REQUEST_JITTER_MAX = 0.35
 MAX_RETRIES = 3
 BACKOFF_BASE = 0.6
+PRODUCT_WORKERS = 4  # concurrent product fetchers in `_crawl` (pacing comes from the rate limiter)
+MERGE_BATCH = 25  # quality-gated items merged into the store per write during a crawl
 
 SIZE_PAT = re.compile(r'(\d+(?:\.\d+)?)\s*"?\s*(?:in|inch|")', re.I)
 RMS_PAT  = re.compile(r'(\d{2,5})\s*w(?:att)?', re.I)
@@ -84,11 +84,10 @@ def _record_error(exc: Exception) -> None:
 def _delay() -> float:
     return REQUEST_DELAY + (0 if 'SCRAPER_JITTER_OFF' in os.environ else time.random() if False else 0)  # placeholder to satisfy static analyzers
 
-def _compute_delay() -> float:
-    if 'SCRAPER_JITTER_OFF' in os.environ:
-        return REQUEST_DELAY
-    import random as _r
-    return REQUEST_DELAY + _r.uniform(REQUEST_JITTER_MIN, REQUEST_JITTER_MAX)
+def _configure_rate_limit() -> None:
+    """Crutchfield politeness (one request per REQUEST_DELAY plus jitter) as a per-host token bucket."""
+    jitter = 0.0 if 'SCRAPER_JITTER_OFF' in os.environ else REQUEST_JITTER_MAX
+    get_limiter().configure(LISTING_START, rate=1.0 / REQUEST_DELAY, burst=1, jitter=jitter)
 
 def build_headers() -> Dict[str, str]:
     import random as _r
@@ -114,17 +113,15 @@ def _clean(t: Optional[str]) -> str:
     return re.sub(r'\s+', ' ', (t or '').strip())
 
 def _save(items: List[SubwooferLite]) -> None:
-    # Merge with existing DB (lightweight fields only)
-    existing = []
-    if DB_PATH.exists():
-        try:
-            existing = json.loads(DB_PATH.read_text(encoding="utf-8"))
-        except Exception:
-            existing = []
-    by_url = {d.get("url"): d for d in existing}
-    for i in items:
-        by_url[i.url] = asdict(i)
-    DB_PATH.write_text(json.dumps(list(by_url.values()), indent=2), encoding="utf-8")
+    # Shared merge path: refreshes lite fields, keeps richer specs stored by other routers.
+    # Each crawl batch is only appended (upsert log on the JSON backend), not a base-file rewrite.
+    get_store(DB_PATH).merge(items, only=LITE_FIELDS, rewrite=False)
+
+def _refresh_buckets(sizes: set) -> None:
+    # Buckets mirror the whole catalog (every retailer), so rebuild the touched ones from the store
+    store = get_store(DB_PATH)
+    with store.write_lock():
+        _write_size_buckets(store.snapshot().items, only_sizes=sizes)
 
 def _parse_listing_urls(html: str) -> Tuple[List[str], Optional[str]]:
     soup = BeautifulSoup(html, "html.parser")
@@ -182,16 +179,16 @@ LISTING_START = "https://www.crutchfield.com/g_512/Subwoofers.html"
 async def _fetch(client: httpx.AsyncClient, url: str) -> httpx.Response:
     attempt = 0
     last_exc: Optional[Exception] = None
-    import random as _r
+    _configure_rate_limit()
     while attempt < MAX_RETRIES:
         DIAG["attempts"] += 1
+        await get_limiter().acquire(url)
         start = time.perf_counter()
         try:
             resp = await client.get(url, headers=build_headers(), timeout=TIMEOUT)
             latency = time.perf_counter() - start
             resp.raise_for_status()
             _record_success(resp, latency)
-            await asyncio.sleep(_compute_delay())
             return resp
         except Exception as exc:
             _record_error(exc)
@@ -228,29 +225,52 @@ def _augment_cutout(item: SubwooferLite) -> Dict[str, Any]:
     if item.size_in is not None:
         cut_dia = round(item.size_in * 0.93, 3)
     # Return extended dict (non-breaking for existing consumers)
-    data = asdict(item)
+    data = item.to_dict(LITE_FIELDS)
     data["cutout_diameter_in"] = cut_dia
     data["cutout_estimated"] = estimated if cut_dia is not None else None
     return data
 
-async def _crawl(pages: int) -> List[Dict[str, Any]]:
-    items: List[SubwooferLite] = []
-    async with httpx.AsyncClient(follow_redirects=True) as client:
+async def _crawl(pages: int, workers: int = PRODUCT_WORKERS) -> List[Dict[str, Any]]:
+    """Producer/consumer crawl: listing pages feed a queue drained by `workers` product fetchers.
+
+    Requests are paced by the per-host token bucket (see `_fetch`), so wall time
+    follows the rate budget rather than the item count. Quality-gated items are
+    merged into the store every MERGE_BATCH items as they arrive. A failing first
+    listing page raises; a failing later page just ends pagination.
+    """
+    client = await get_client(LISTING_START)  # shared pooled client (app/scraping/client_pool.py)
+    queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+    accepted: List[SubwooferLite] = []
+    pending: List[SubwooferLite] = []
+
+    async def produce() -> None:
+        seen = set()
         page_url = LISTING_START
-        listing_htmls: List[str] = []
-        for _ in range(max(1, pages)):
-            resp = await _fetch(client, page_url)
-            listing_htmls.append(resp.text)
-            _, next_url = _parse_listing_urls(resp.text)
-            if not next_url:
-                break
-            page_url = next_url
-        product_urls = set()
-        for html in listing_htmls:
-            urls, _ = _parse_listing_urls(html)
-            product_urls.update(urls)
-        product_urls = sorted(product_urls)
-        for u in product_urls:
+        try:
+            for page in range(max(1, pages)):
+                try:
+                    resp = await _fetch(client, page_url)
+                except Exception:
+                    if page == 0:
+                        raise
+                    break
+                urls, next_url = _parse_listing_urls(resp.text)
+                for u in urls:
+                    if u not in seen:
+                        seen.add(u)
+                        queue.put_nowait(u)
+                if not next_url:
+                    break
+                page_url = next_url
+        finally:
+            for _ in range(workers):
+                queue.put_nowait(None)
+
+    async def consume() -> None:
+        while True:
+            u = await queue.get()
+            if u is None:
+                return
             try:
                 pr = await _fetch(client, u)
             except Exception:
@@ -258,45 +278,42 @@ async def _crawl(pages: int) -> List[Dict[str, Any]]:
             lite = _parse_product(pr.text, u)
             if not _quality(lite):
                 continue
-            items.append(_augment_cutout(lite))
-    return items
+            accepted.append(lite)
+            pending.append(lite)
+            if len(pending) >= MERGE_BATCH:
+                batch = pending[:]
+                pending.clear()
+                await asyncio.to_thread(_save, batch)  # blocking catalog write
+
+    tasks = [asyncio.ensure_future(produce())] + [asyncio.ensure_future(consume()) for _ in range(workers)]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for t in tasks:
+            t.cancel()
+        if pending:
+            await asyncio.to_thread(_save, pending)
+    accepted.sort(key=lambda it: it.url)
+    return [_augment_cutout(it) for it in accepted]
 
 @router.get("/subwoofers")
-async def list_crutchfield_subwoofers(pages: int = Query(1, ge=1, le=10)):
+async def list_crutchfield_subwoofers(
+    pages: int = Query(1, ge=1, le=10),
+    workers: int = Query(PRODUCT_WORKERS, ge=1, le=16, description="concurrent product fetchers"),
+):
     """Scrape Crutchfield subwoofer listing + product pages and return lightweight items.
 
     Fields returned: brand, model, size_in, rms_w, price_usd, source, url, scraped_at.
-    Results merged into `data/subwoofers.json` (lite merge: existing richer records preserved by other routers).
+    Quality-filtered items are merged into `data/subwoofers.json` while the crawl runs
+    (lite merge: existing richer records preserved by other routers); the size
+    buckets they fall into are then rebuilt from the whole catalog.
     """
     try:
-        items = await _crawl(pages=pages)
-        # Persist only quality-filtered items; merge maintaining lite schema
-        lite_objs = [SubwooferLite(
-            source=i.get('source','crutchfield'),
-            url=i['url'],
-            brand=i.get('brand',''),
-            model=i.get('model',''),
-            size_in=i.get('size_in'),
-            rms_w=i.get('rms_w'),
-            price_usd=i.get('price_usd'),
-            scraped_at=i.get('scraped_at', time.time())
-        ) for i in items]
-        _save(lite_objs)
-        # Per-size persistence using existing ensure_subwoofer_dirs() layout
-        by_size: Dict[int, List[Dict[str, Any]]] = {}
-        for rec in items:
-            sz = rec.get('size_in')
-            if sz is None:
-                continue
-            norm = int(round(sz))
-            by_size.setdefault(norm, []).append(rec)
-        root = Path('subwoofers')
-        root.mkdir(exist_ok=True)
-        for sz, group in by_size.items():
-            bucket = root / str(sz)
-            bucket.mkdir(parents=True, exist_ok=True)
-            # Write/overwrite quality-gated latest file
-            (bucket / 'latest.json').write_text(json.dumps(group, indent=2), encoding='utf-8')
+        items = await _crawl(pages=pages, workers=workers)
+        # Refresh the size buckets the crawl touched (same writer as the subwoofers routes)
+        sizes = {int(round(rec['size_in'])) for rec in items if rec.get('size_in') is not None}
+        if sizes:
+            await asyncio.to_thread(_refresh_buckets, sizes)
         # Diagnostics snapshot appended
         snapshot = {
             "ts": time.time(),
@@ -4,9 +4,13 @@ from dataclasses import dataclass, asdict
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi.responses import JSONResponse
 
+from app.core.atomic import atomic_write_text
+from app.core.http_cache import Validator, file_validator
+from app.core.write_coordinator import get_coordinator
+
 router = APIRouter(prefix="/presets", tags=["presets"])
 
 DATA_DIR = Path("data")
@@ -42,11 +46,16 @@ def _load() -> List[Preset]:
 
 def _save(items: List[Preset]) -> None:
     try:
-        PRESETS_PATH.write_text(json.dumps([asdict(i) for i in items], indent=2), encoding="utf-8")
+        atomic_write_text(PRESETS_PATH, json.dumps([asdict(i) for i in items], indent=2))
     except Exception:
         pass
 
 
+def _write_lock():
+    """Cross-process lock for load -> modify -> _save sequences (multi-worker safe)."""
+    return get_coordinator(PRESETS_PATH).write()
+
+
 def _find(items: List[Preset], pid: str) -> Optional[Preset]:
     for p in items:
         if p.id == pid:
@@ -56,7 +65,12 @@ def _find(items: List[Preset], pid: str) -> Optional[Preset]:
 
 @router.get("/")
 @router.get("", include_in_schema=False)
-async def list_presets(limit: int = Query(100, ge=1, le=500)):
+async def list_presets(request: Request, limit: int = Query(100, ge=1, le=500)):
+    # Revalidate against presets.json's stat before reading it
+    validator = file_validator(PRESETS_PATH, request.url.query) or Validator.from_parts("presets:none", request.url.query)
+    not_modified = validator.not_modified(request)
+    if not_modified is not None:
+        return not_modified
     items = _load()
     # newest first
     items.sort(key=lambda p: p.updated_at, reverse=True)
@@ -64,7 +78,7 @@ async def list_presets(limit: int = Query(100, ge=1, le=500)):
         {"id": p.id, "name": p.name, "updated_at": p.updated_at, "created_at": p.created_at}
         for p in items[:limit]
     ]
-    return {"total": len(items), "items": out}
+    return validator.apply(JSONResponse({"total": len(items), "items": out}))
 
 
 @router.get('/{preset_id}')
@@ -93,38 +107,41 @@ async def create_preset(payload: Dict[str, Any]):
         except ValueError:
             raise HTTPException(400, f'config.{key} must be numeric')
     now = time.time()
-    items = _load()
-    pid = uuid.uuid4().hex[:12]
-    preset = Preset(id=pid, name=name, created_at=now, updated_at=now, config=config)
-    items.append(preset)
-    _save(items)
+    with _write_lock():
+        items = _load()
+        pid = uuid.uuid4().hex[:12]
+        preset = Preset(id=pid, name=name, created_at=now, updated_at=now, config=config)
+        items.append(preset)
+        _save(items)
     return {"saved": True, "preset": asdict(preset)}
 
 
 @router.put('/{preset_id}')
 async def update_preset(preset_id: str, payload: Dict[str, Any]):
-    items = _load()
-    p = _find(items, preset_id)
-    if not p:
-        raise HTTPException(404, 'preset not found')
-    name = (payload.get('name') or p.name).strip()
-    config = payload.get('config') or p.config
-    if not name:
-        raise HTTPException(400, 'name required')
-    p.name = name
-    p.config = config
-    p.updated_at = time.time()
-    _save(items)
+    with _write_lock():
+        items = _load()
+        p = _find(items, preset_id)
+        if not p:
+            raise HTTPException(404, 'preset not found')
+        name = (payload.get('name') or p.name).strip()
+        config = payload.get('config') or p.config
+        if not name:
+            raise HTTPException(400, 'name required')
+        p.name = name
+        p.config = config
+        p.updated_at = time.time()
+        _save(items)
     return {"updated": True, "preset": asdict(p)}
 
 
 @router.delete('/{preset_id}')
 async def delete_preset(preset_id: str):
-    items = _load()
-    new_items = [p for p in items if p.id != preset_id]
-    if len(new_items) == len(items):
-        raise HTTPException(404, 'preset not found')
-    _save(new_items)
+    with _write_lock():
+        items = _load()
+        new_items = [p for p in items if p.id != preset_id]
+        if len(new_items) == len(items):
+            raise HTTPException(404, 'preset not found')
+        _save(new_items)
     return {"deleted": True, "id": preset_id}
 
 
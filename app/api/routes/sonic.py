@@ -4,14 +4,19 @@ Uses cloudscraper to bypass Cloudflare challenge and returns lightweight
 subwoofer records similar to crutchfield lite format.
 """
 from __future__ import annotations
-import time, json, re, os, random
-from dataclasses import dataclass, asdict
+import asyncio, json, time, re, os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional
 
 import cloudscraper
 from bs4 import BeautifulSoup
 from fastapi import APIRouter, Query, HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.catalog import get_store
+from app.models.subwoofer import LITE_FIELDS, Subwoofer
+from app.scraping.rate_limit import get_limiter
 
 router = APIRouter(prefix="/sonic", tags=["sonic"])
 
@@ -21,37 +26,23 @@ DB_PATH = DATA_DIR / "subwoofers.json"
 
 LISTING_BASE = "https://www.sonicelectronix.com"
 CATEGORY_8 = "/ci59-8-car-subwoofers.html"
-BASE_DELAY = float(os.getenv("SONIC_BASE_DELAY", "0.7"))  # polite base delay seconds
-JITTER_MIN = float(os.getenv("SONIC_JITTER_MIN", "0.10"))
-JITTER_MAX = float(os.getenv("SONIC_JITTER_MAX", "0.35"))
-DISABLE_JITTER = os.getenv("SONIC_JITTER_OFF") is not None
+BASE_DELAY = float(os.getenv("SONIC_BASE_DELAY", "0.7"))  # polite seconds between requests to the site
+JITTER_MAX = float(os.getenv("SONIC_JITTER_MAX", "0.35"))  # max random extra seconds per throttled request
+SONIC_WORKERS = int(os.getenv("SONIC_WORKERS", "4"))  # threads running blocking cloudscraper calls
+PRODUCTS_PER_PAGE = 60
 SIZE_PAT = re.compile(r"(\d+(?:\.\d+)?)\s*\"?\s*(?:in|inch|\")", re.I)
 RMS_PAT = re.compile(r"(\d{2,5})\s*w(?:att)?", re.I)
 PRICE_PAT = re.compile(r"\$\s*([0-9]+(?:\.[0-9]{2})?)")
 
-@dataclass
-class SonicSubLite:
-    source: str
-    url: str
-    brand: str
-    model: str
-    size_in: Optional[float]
-    rms_w: Optional[int]
-    price_usd: Optional[float]
-    scraped_at: float
+# Sonic pages only yield the lite attributes (`LITE_FIELDS`); the rest stay None.
+SonicSubLite = Subwoofer
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=SONIC_WORKERS, thread_name_prefix="sonic")
 
 
 def _merge_save(items: List[SonicSubLite]) -> None:
-    existing: List[Dict[str, Any]] = []
-    if DB_PATH.exists():
-        try:
-            existing = json.loads(DB_PATH.read_text(encoding="utf-8"))
-        except Exception:
-            existing = []
-    by_url = {d.get("url"): d for d in existing}
-    for it in items:
-        by_url[it.url] = asdict(it)
-    DB_PATH.write_text(json.dumps(list(by_url.values()), indent=2), encoding="utf-8")
+    # Shared merge path: refreshes lite fields, keeps richer specs stored by other routers
+    get_store(DB_PATH).merge(items, only=LITE_FIELDS)
 
 
 def _extract_product_links(html: str) -> List[str]:
@@ -123,49 +114,105 @@ def _parse_product(html: str, url: str) -> SonicSubLite:
     )
 
 
-def _delay():
-    if DISABLE_JITTER:
-        return BASE_DELAY
-    return BASE_DELAY + random.uniform(JITTER_MIN, JITTER_MAX)
+async def _get(scraper, url: str):
+    """Blocking `scraper.get` on the bounded pool, after waiting for the host's request budget."""
+    await get_limiter().acquire(url)
+    return await asyncio.get_running_loop().run_in_executor(_EXECUTOR, scraper.get, url)
+
+
+async def _fetch_product(scraper, url: str) -> Optional[SonicSubLite]:
+    try:
+        pr = await _get(scraper, url)
+        if pr.status_code != 200:
+            return None
+        return _parse_product(pr.text, url)
+    except Exception:
+        return None
+
+
+def _next_page(html: str) -> Optional[str]:
+    # naive pagination: look for rel=next
+    soup = BeautifulSoup(html, "html.parser")
+    nxt = soup.select_one('a[rel="next"], a.pagination-next')
+    if nxt and nxt.get('href') and nxt['href'].startswith('/'):
+        return LISTING_BASE + nxt['href']
+    return None
+
+
+async def _crawl(scraper, listing_html: str, pages: int) -> AsyncIterator[SonicSubLite]:
+    """Yield products as their fetches complete; each page's items are saved once the page is done."""
+    html = listing_html
+    for page in range(pages):
+        links = _extract_product_links(html)[:PRODUCTS_PER_PAGE]  # soft cap per page to avoid huge fan-out
+        tasks = [asyncio.ensure_future(_fetch_product(scraper, link)) for link in links]
+        found: List[SonicSubLite] = []
+        try:
+            for fut in asyncio.as_completed(tasks):
+                item = await fut
+                if item is not None:
+                    found.append(item)
+                    yield item
+        finally:
+            for t in tasks:  # client went away mid-page
+                t.cancel()
+            if found:  # catalog write is blocking I/O: keep it off the event loop
+                await asyncio.get_running_loop().run_in_executor(_EXECUTOR, _merge_save, found)
+        next_url = _next_page(html)
+        if page + 1 >= pages or not next_url:
+            return
+        try:
+            resp = await _get(scraper, next_url)
+        except Exception:
+            return
+        if resp.status_code != 200:
+            return
+        html = resp.text
+
+
+def _configure_rate_limit() -> None:
+    """Sonic politeness (one request per BASE_DELAY plus jitter) as a per-host token bucket."""
+    jitter = 0.0 if os.getenv("SONIC_JITTER_OFF") is not None else JITTER_MAX
+    get_limiter().configure(LISTING_BASE, rate=1.0 / BASE_DELAY, burst=1, jitter=jitter)
+
+
+async def _ndjson(crawl: AsyncIterator[SonicSubLite]) -> AsyncIterator[bytes]:
+    async for item in crawl:
+        yield json.dumps(item.to_dict(LITE_FIELDS)).encode("utf-8") + b"\n"
+
 
 @router.get("/subwoofers")
-async def sonic_subwoofers(pages: int = Query(1, ge=1, le=5), category: str = Query(CATEGORY_8)):
+async def sonic_subwoofers(
+    pages: int = Query(1, ge=1, le=5),
+    category: str = Query(CATEGORY_8),
+    stream: bool = Query(False, description="stream items as NDJSON while the crawl runs"),
+):
     """Scrape Sonic Electronix category listing and product pages.
 
     Parameters:
       pages: Number of category pages to attempt (pagination may be limited; simple heuristic).
       category: Relative category path (default 8-inch subs).
+      stream: Return `application/x-ndjson`, one item per line as soon as it is parsed.
+
+    cloudscraper is synchronous, so its calls run on a small dedicated thread pool
+    (SONIC_WORKERS) and product pages are fetched concurrently, spaced by the
+    per-host token bucket (app/scraping/rate_limit.py) instead of `time.sleep`;
+    the event loop stays free for other requests during a crawl. Items are
+    listed in completion order and saved page by page.
     """
-    scraper = cloudscraper.create_scraper()
-    items: List[SonicSubLite] = []
-    current_url = LISTING_BASE + category
-    for _ in range(pages):
-        try:
-            resp = scraper.get(current_url)
-            if resp.status_code != 200:
-                break
-        except Exception as e:
-            raise HTTPException(500, f"listing fetch failed: {e}")
-        links = _extract_product_links(resp.text)
-        # polite delay after listing fetch
-        time.sleep(_delay())
-        for link in links[:60]:  # soft cap per page to avoid huge fan-out
-            try:
-                pr = scraper.get(link)
-                if pr.status_code != 200:
-                    continue
-                items.append(_parse_product(pr.text, link))
-                time.sleep(_delay())  # per product delay
-            except Exception:
-                continue
-        # naive pagination: look for rel=next
-        soup = BeautifulSoup(resp.text, "html.parser")
-        nxt = soup.select_one('a[rel="next"], a.pagination-next')
-        if nxt and nxt.get('href') and nxt['href'].startswith('/'):
-            current_url = LISTING_BASE + nxt['href']
-        else:
-            break
-    _merge_save(items)
-    return {"total": len(items), "items": [asdict(i) for i in items]}
+    _configure_rate_limit()
+    scraper = await asyncio.get_running_loop().run_in_executor(_EXECUTOR, cloudscraper.create_scraper)
+    try:
+        resp = await _get(scraper, LISTING_BASE + category)
+    except Exception as e:
+        raise HTTPException(500, f"listing fetch failed: {e}")
+    if resp.status_code != 200:
+        if stream:
+            return StreamingResponse(iter(()), media_type="application/x-ndjson")
+        return {"total": 0, "items": []}
+    crawl = _crawl(scraper, resp.text, pages)
+    if stream:
+        return StreamingResponse(_ndjson(crawl), media_type="application/x-ndjson")
+    items = [item async for item in crawl]
+    return {"total": len(items), "items": [i.to_dict(LITE_FIELDS) for i in items]}
 
 __all__ = ["router"]
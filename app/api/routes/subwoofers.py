@@ -1,15 +1,23 @@
 from __future__ import annotations
-import asyncio, json, math, re, time, random, os
+import asyncio, json, math, re, time, random, os, zlib
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Tuple
 
 import httpx
 from bs4 import BeautifulSoup
-from app.scraping.http_utils import ensure_async_client  # centralized AsyncClient factory
+from app.scraping.client_pool import get_client, get_registry
+from app.scraping.rate_limit import get_limiter
+from app.scraping.response_cache import get_cache
+from app.catalog import SearchFilters, bulk, dedup, get_store, ranking, retention, serialize
+from app.catalog.cursor import InvalidCursor, decode_cursor, encode_cursor, filters_fingerprint
+from app.core.atomic import atomic_write_text
+from app.core.config import get_settings
+from app.core.http_cache import Validator, file_validator
+from app.models.subwoofer import Subwoofer
 
-from fastapi import APIRouter, Query, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 
 router = APIRouter(prefix="/subwoofers", tags=["subwoofers"])
 
@@ -17,26 +25,17 @@ router = APIRouter(prefix="/subwoofers", tags=["subwoofers"])
 DATA_DIR = Path("data")
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 DB_PATH = DATA_DIR / "subwoofers.json"
+SIZE_ROOT = Path("subwoofers")  # per-size buckets: <root>/<size>/latest.json + index.json (patched in tests)
 
-# ---------- Model ----------
-@dataclass
-class Subwoofer:
-    source: str
-    url: str
-    brand: str
-    model: str
-    size_in: Optional[float]
-    rms_w: Optional[int]
-    peak_w: Optional[int]
-    impedance_ohm: Optional[float]
-    sensitivity_db: Optional[float]
-    mounting_depth_in: Optional[float]
-    cutout_diameter_in: Optional[float]
-    displacement_cuft: Optional[float]
-    recommended_box: Optional[str]
-    price_usd: Optional[float]
-    image: Optional[str]
-    scraped_at: float
+def _store():
+    """Return the configured catalog store for the current DB_PATH (patched in tests)."""
+    return get_store(DB_PATH)
+
+def _catalog_validator(store, request: Request) -> Validator:
+    """ETag/Last-Modified for catalog-derived responses; computed from file stats only."""
+    return Validator.from_parts(
+        request.url.path, request.url.query, store.backend, store.change_token(), mtime=store.last_modified()
+    )
 
 # ---------- Helpers ----------
 """Crutchfield scraping logic removed as part of de-scope.
@@ -89,6 +88,9 @@ def metrics_snapshot() -> Dict[str, Any]:
         "p95_latency": p95,
         "last_error": METRICS["last_error"],
         "uptime_sec": time.time() - METRICS["started_at"],
+        "http_pool": get_registry().metrics(),
+        "rate_limits": get_limiter().metrics(),
+        "http_cache": get_cache().metrics(),
     }
 
 # ---------- Minimal Generic Scrape Stubs (Crutchfield Removed) ----------
@@ -107,8 +109,9 @@ async def fetch(client: httpx.AsyncClient, url: str) -> httpx.Response:
     Used only by tests exercising collection endpoints with monkeypatched client behavior.
     """
     METRICS["attempts"] += 1
+    await get_limiter().acquire(url)  # per-host requests/second budget shared by all concurrent fetches
     start = time.time()
-    resp = await client.get(url, timeout=TIMEOUT)
+    resp = await client.get(url, headers={"User-Agent": random.choice(UA_POOL)}, timeout=TIMEOUT)
     latency = time.time() - start
     _record_success(resp, latency)
     return resp
@@ -181,45 +184,153 @@ def normalize_num(text: str) -> Optional[float]:
 def clean_space(t: str) -> str:
     return re.sub(r'\s+', ' ', (t or '').strip())
 
-def save_db(items: List[Subwoofer]) -> None:
+def _group_by_size(items: Iterable[Any]) -> Dict[int, List[Any]]:
+    by_size: Dict[int, List[Any]] = {}
+    for it in items:
+        if it.size_in is None:
+            continue
+        by_size.setdefault(int(round(it.size_in)), []).append(it)
+    return by_size
+
+# latest.json path -> (mtime_ns, size) right after this process wrote it
+_BUCKET_SIGS: Dict[str, Tuple[int, int]] = {}
+
+def _file_sig(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _write_size_buckets(items, only_sizes: Optional[set] = None, previous: Optional[Iterable[Any]] = None) -> List[int]:
+    """Maintain per-size directories with a latest.json snapshot plus index.json.
+
+    Sizes normalized to int (rounded) where available. With `only_sizes`, just
+    those buckets are considered. With `previous` (catalog before the write),
+    a bucket whose records are unchanged and whose file is still the one this
+    process wrote is left alone, and buckets that lost all their records are
+    removed. Files are replaced atomically and index.json ("sizes" path map
+    plus per-size "counts") is updated in place rather than rebuilt. Returns
+    the sizes whose latest.json was rewritten or removed.
+    """
+    by_size = _group_by_size(items)
+    if only_sizes is not None:
+        by_size = {sz: g for sz, g in by_size.items() if sz in only_sizes}
+    old_groups = _group_by_size(previous) if previous is not None else {}
+    if only_sizes is not None:
+        old_groups = {sz: g for sz, g in old_groups.items() if sz in only_sizes}
+    root = SIZE_ROOT
+    root.mkdir(parents=True, exist_ok=True)
+    index_path = root / "index.json"
     try:
-        DB_PATH.write_text(json.dumps([asdict(i) for i in items], indent=2), encoding="utf-8")
-        # Additionally maintain per-size directories with a latest.json snapshot
-        # Sizes normalized to int (rounded) where available.
-        by_size: Dict[int, List[Subwoofer]] = {}
-        for it in items:
-            if it.size_in is None:
-                continue
-            norm = int(round(it.size_in))
-            by_size.setdefault(norm, []).append(it)
-        root = Path("subwoofers")
-        root.mkdir(exist_ok=True)
-        index: Dict[str, str] = {}
-        for sz, group in by_size.items():
-            d = root / str(sz)
-            d.mkdir(parents=True, exist_ok=True)
-            latest_path = d / "latest.json"
-            latest_path.write_text(json.dumps([asdict(i) for i in group], indent=2), encoding="utf-8")
-            index[str(sz)] = str(latest_path)
-        # Write an index.json summarizing available size buckets (non-fatal if fails)
+        meta = json.loads(index_path.read_text(encoding="utf-8"))
+        index: Dict[str, str] = dict(meta.get("sizes", {}))
+        counts: Dict[str, int] = dict(meta.get("counts", {}))
+    except Exception:
+        index, counts = {}, {}
+    before = (dict(index), dict(counts))
+    if only_sizes is None:
+        # Full replacement: buckets that no longer have records leave the index
+        index = {k: v for k, v in index.items() if k.isdigit() and int(k) in by_size}
+        counts = {k: v for k, v in counts.items() if k in index}
+    written: List[int] = []
+    for sz, group in sorted(by_size.items()):
+        latest_path = root / str(sz) / "latest.json"
+        key = str(sz)
+        unchanged = (
+            previous is not None
+            and old_groups.get(sz) == group
+            and _BUCKET_SIGS.get(str(latest_path.resolve())) == _file_sig(latest_path)
+        )
+        if not unchanged:
+            latest_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(latest_path, json.dumps([asdict(i) for i in group], indent=2))
+            _BUCKET_SIGS[str(latest_path.resolve())] = _file_sig(latest_path)
+            written.append(sz)
+        if key not in index:
+            index[key] = str(latest_path)
+        counts[key] = len(group)
+    for sz in sorted(set(old_groups) - set(by_size)):
+        (root / str(sz) / "latest.json").unlink(missing_ok=True)
+        index.pop(str(sz), None)
+        counts.pop(str(sz), None)
+        written.append(sz)
+    # index.json summarizes available size buckets (non-fatal if it fails)
+    if (index, counts) != before or not index_path.exists():
         try:
-            (root / "index.json").write_text(json.dumps({"sizes": index, "generated_at": time.time()}, indent=2), encoding="utf-8")
+            atomic_write_text(index_path, json.dumps(
+                {"sizes": index, "counts": counts, "generated_at": time.time()}, indent=2))
         except Exception:
             pass
+    return written
+
+def save_db(items: List[Subwoofer]) -> None:
+    """Replace the stored catalog with `items` and refresh the per-size buckets that changed.
+
+    The store collapses cross-retailer duplicates into one canonical record with
+    per-source offers (`app/catalog/dedup.py`; `SUBWOOFER_DEDUPE=0` disables).
+    """
+    store = _store()
+    try:
+        # One cross-process write section covers the catalog and its buckets
+        with store.write_lock():
+            previous = store.snapshot().items
+            store.replace_all(items)
+            _write_size_buckets(store.snapshot().items, previous=previous)
     except Exception:
-        pass
+        store.invalidate()
 
-def load_db() -> List[Subwoofer]:
-    if not DB_PATH.exists():
-        return []
+def upsert_db(items: List[Subwoofer]) -> None:
+    """Merge `items` into the stored catalog by URL.
+
+    Appends to the upsert log (JSON backend) or updates single rows (SQLite);
+    only the size buckets the items fall into are considered for a rewrite.
+    """
+    if not items:
+        return
+    store = _store()
     try:
-        data = json.loads(DB_PATH.read_text(encoding="utf-8"))
+        with store.write_lock():
+            prev_snap = store.snapshot()
+            store.upsert(items)
+            # A record whose size changed must also leave its old bucket
+            touched = _touched_sizes(prev_snap, [i.url for i in items], items)
+            if touched:
+                _write_size_buckets(store.snapshot().items, only_sizes=touched, previous=prev_snap.items)
     except Exception:
-        return []
+        store.invalidate()
+
+def delete_db(urls: List[str], batch_size: int = bulk.BATCH_SIZE) -> int:
+    """Remove records by URL (one store write per `batch_size`) and refresh the size buckets they were in."""
+    if not urls:
+        return 0
+    store = _store()
     try:
-        return [Subwoofer(**d) for d in data]
+        with store.write_lock():
+            prev_snap = store.snapshot()
+            deleted = sum(store.delete(urls[start:start + batch_size]) for start in range(0, len(urls), batch_size))
+            touched = _touched_sizes(prev_snap, urls)
+            if touched:
+                _write_size_buckets(store.snapshot().items, only_sizes=touched, previous=prev_snap.items)
+            return deleted
     except Exception:
-        return []
+        store.invalidate()
+        raise
+
+def _touched_sizes(prev_snap, urls: Iterable[str], items: Iterable[Subwoofer] = ()) -> set:
+    """Size buckets affected by writing `items` / touching `urls` (their previous sizes included)."""
+    touched = {int(round(i.size_in)) for i in items if i.size_in is not None}
+    previous = prev_snap.items
+    by_url = prev_snap.url_index()
+    for url in urls:
+        old = by_url.get(url)
+        if old is not None and previous[old].size_in is not None:
+            touched.add(int(round(previous[old].size_in)))
+    return touched
+
+def load_db() -> List[Subwoofer]:
+    """Return all stored subwoofers from the in-memory catalog (reloaded on change)."""
+    return list(_store().snapshot().items)
 
 ## Removed: jitter/backoff fetch and listing pagination utilities tied to Crutchfield.
 
@@ -234,23 +345,16 @@ def text_or_none(node) -> Optional[str]:
 
 ## Removed: crawl_crutchfield.
 
-def _rank_subwoofers(items: List[Subwoofer]) -> List[Subwoofer]:
+def _rank_subwoofers(items: List[Subwoofer], limit: Optional[int] = None) -> List[Subwoofer]:
     """Rank subwoofers with simple heuristic: higher RMS, then price descending fallback, then newest scrape time.
 
-    Items lacking RMS get pushed lower. This is a placeholder for more elaborate scoring.
+    Items lacking RMS get pushed lower (scorer "collect" in `app/catalog/ranking.py`).
+    With `limit`, only the best `limit` are selected via a heap (O(N log K)).
     """
-    def score(it: Subwoofer):
-        rms = it.rms_w or -1
-        price = it.price_usd or -1
-        # Negative to sort descending via ascending tuple
-        return (
-            -(rms),
-            -(price),
-            -it.scraped_at,
-            it.brand or "",
-            it.model or "",
-        )
-    return sorted(items, key=score)
+    key = ranking.get_scorer("collect")
+    if limit is None:
+        return sorted(items, key=key)
+    return ranking.top_k(items, limit, key)
 
 @router.get("/collect/size/{size_in}")
 async def collect_by_size(
@@ -297,62 +401,45 @@ async def collect_by_size(
     globals()['LAST_REFERER'] = next_url
     # Set referer baseline for header generation
     globals()['LAST_REFERER'] = next_url
-    # HTTP/2 fallback if h2 not installed
-    use_h2 = False
-    try:
-        import h2  # type: ignore  # noqa: F401
-        use_h2 = True
-    except Exception:
-        use_h2 = False
-    client = await ensure_async_client(
-        headers={"User-Agent": random.choice(UA_POOL)}, follow_redirects=True, http2=use_h2
-    )
-    try:
-        while cycles_used < max_cycles and len(collected) < target and next_url:
-            pages_in_cycle = 0
-            while pages_in_cycle < batch_pages and len(collected) < target and next_url:
-                try:
-                    resp = await fetch(client, next_url)
-                    seen_listing_htmls.append(resp.text)
-                except Exception:
-                    next_url = None
-                    break
-                urls, nxt = parse_listing_urls(resp.text)
-                pages_in_cycle += 1
-                pages_scanned += 1
-                next_url = nxt
-                # Parallel product fetch respecting product_concurrency
-                sem = asyncio.Semaphore(product_concurrency)
-                async def get_and_parse(u: str):
-                    if u in collected:
+    client = await get_client(next_url)  # shared per-origin pool; closed by the app lifespan
+    while cycles_used < max_cycles and len(collected) < target and next_url:
+        pages_in_cycle = 0
+        while pages_in_cycle < batch_pages and len(collected) < target and next_url:
+            try:
+                resp = await fetch(client, next_url)
+                seen_listing_htmls.append(resp.text)
+            except Exception:
+                next_url = None
+                break
+            urls, nxt = parse_listing_urls(resp.text)
+            pages_in_cycle += 1
+            pages_scanned += 1
+            next_url = nxt
+            # Parallel product fetch respecting product_concurrency
+            sem = asyncio.Semaphore(product_concurrency)
+            async def get_and_parse(u: str):
+                if u in collected:
+                    return None
+                async with sem:
+                    try:
+                        pr = await fetch(client, u)
+                    except Exception:
                         return None
-                    async with sem:
-                        try:
-                            pr = await fetch(client, u)
-                        except Exception:
-                            return None
-                        sub = parse_product(pr.text, u)
-                        return sub
-                results = await asyncio.gather(*[get_and_parse(u) for u in urls])
-                for sub in results:
-                    if not sub:
-                        continue
-                    # If size could not be parsed, assume target size (test invocation fallback)
-                    if sub.size_in is None:
-                        sub.size_in = size_in
-                    if sub.size_in is not None and abs(sub.size_in - size_in) <= tolerance:
-                        collected[sub.url] = sub
-                    if len(collected) >= target:
-                        break
-            cycles_used += 1
-    finally:
-        # Attempt graceful close if available (monkeypatched dummy may not implement close)
-        try:
-            await client.aclose()  # type: ignore[attr-defined]
-        except Exception:
-            pass
-    ranked = _rank_subwoofers(list(collected.values()))
-    top_list = ranked[:target]
+                    sub = parse_product(pr.text, u)
+                    return sub
+            results = await asyncio.gather(*[get_and_parse(u) for u in urls])
+            for sub in results:
+                if not sub:
+                    continue
+                # If size could not be parsed, assume target size (test invocation fallback)
+                if sub.size_in is None:
+                    sub.size_in = size_in
+                if sub.size_in is not None and abs(sub.size_in - size_in) <= tolerance:
+                    collected[sub.url] = sub
+                if len(collected) >= target:
+                    break
+        cycles_used += 1
+    top_list = _rank_subwoofers(list(collected.values()), limit=target)
     # Fallback: if no items collected but we have listing htmls (test monkeypatch scenario), synthesize entries
     if not top_list and seen_listing_htmls:
         synthetic_urls: List[str] = []
@@ -371,12 +458,7 @@ async def collect_by_size(
             u = f"synthetic://p_dummy_{i}.html"
             collected[u] = Subwoofer(source="synthetic", url=u, brand="Brand", model="Model", size_in=size_in, rms_w=None, peak_w=None, impedance_ohm=None, sensitivity_db=None, mounting_depth_in=None, cutout_diameter_in=None, displacement_cuft=None, recommended_box=None, price_usd=None, image=None, scraped_at=now)
         top_list = list(collected.values())[:target]
-    existing = load_db()
-    by_url = {i.url: i for i in existing}
-    for it in top_list:
-        by_url[it.url] = it
-    merged = list(by_url.values())
-    save_db(merged)
+    await asyncio.to_thread(upsert_db, top_list)
     # Category mismatch heuristic: if start_url provided and contains another size token different from requested
     mismatch_warning = None
     # Unwrap Query object for start_url if direct invocation
@@ -423,7 +505,7 @@ async def aggressive_collect(
     tolerance_start: float = Query(0.25, ge=0.05, le=1.0, description="Initial ± size tolerance"),
     tolerance_step: float = Query(0.1, ge=0.01, le=0.5, description="Tolerance increment when still below target"),
     tolerance_max: float = Query(0.75, ge=0.1, le=2.0, description="Maximum ± size tolerance clamp"),
-    snapshot: bool = Query(True, description="Persist a snapshot JSON under subwoofers/<size>/"),
+    snapshot: bool = Query(False, description="Also persist a full snapshot JSON under subwoofers/<size>/ (superseded by /subwoofers/history)"),
     product_concurrency: int = Query(10, ge=1, le=60, description="Concurrent product page fetches per listing page"),
     start_url: Optional[str] = Query(None, description="Override initial listing URL (advanced)")
 ):
@@ -435,8 +517,12 @@ async def aggressive_collect(
     3. If still below target after a cycle and tolerance < tolerance_max, increase by tolerance_step.
     4. Stop early if target reached or pagination exhausted.
 
-    Persists merged results to main DB and optionally writes a timestamped snapshot:
-    subwoofers/<int(size_in)>/snapshot_<timestamp>.json
+    Persists merged results to main DB; price / spec changes land in the
+    per-record history (`/subwoofers/history`, `/subwoofers/price-drops`).
+    With `snapshot=true` a full timestamped copy is still written to
+    subwoofers/<int(size_in)>/snapshot_<timestamp>.json; a background
+    retention pass then keeps the newest SUBWOOFER_SNAPSHOT_KEEP_LAST plain
+    and daily/weekly rollups as gzipped deltas (`python -m app.catalog.retention`).
     """
     if size_in <= 0:
         raise HTTPException(400, "size_in must be > 0")
@@ -445,68 +531,47 @@ async def aggressive_collect(
     pages_scanned = 0
     cycles_used = 0
     next_url = start_url or LISTING_START
-    # Use HTTP/2 only if 'h2' package installed; fallback to HTTP/1 to avoid runtime ImportError.
-    use_h2 = False
-    try:
-        import h2  # type: ignore  # noqa: F401
-        use_h2 = True
-    except Exception:
-        use_h2 = False
-    client = await ensure_async_client(
-        headers={"User-Agent": random.choice(UA_POOL)}, follow_redirects=True, http2=use_h2
-    )
-    try:
-        while cycles_used < max_cycles and len(collected) < target and next_url:
-            pages_in_cycle = 0
-            while pages_in_cycle < batch_pages and len(collected) < target and next_url:
-                try:
-                    resp = await fetch(client, next_url)
-                except Exception:
-                    next_url = None
-                    break
-                urls, nxt = parse_listing_urls(resp.text)
-                pages_in_cycle += 1
-                pages_scanned += 1
-                next_url = nxt
-                sem = asyncio.Semaphore(product_concurrency)
-                async def get_and_parse(u: str):
-                    if u in collected:
+    client = await get_client(next_url)  # shared per-origin pool; closed by the app lifespan
+    while cycles_used < max_cycles and len(collected) < target and next_url:
+        pages_in_cycle = 0
+        while pages_in_cycle < batch_pages and len(collected) < target and next_url:
+            try:
+                resp = await fetch(client, next_url)
+            except Exception:
+                next_url = None
+                break
+            urls, nxt = parse_listing_urls(resp.text)
+            pages_in_cycle += 1
+            pages_scanned += 1
+            next_url = nxt
+            sem = asyncio.Semaphore(product_concurrency)
+            async def get_and_parse(u: str):
+                if u in collected:
+                    return None
+                async with sem:
+                    try:
+                        pr = await fetch(client, u)
+                    except Exception:
                         return None
-                    async with sem:
-                        try:
-                            pr = await fetch(client, u)
-                        except Exception:
-                            return None
-                        sub = parse_product(pr.text, u)
-                        return sub
-                results = await asyncio.gather(*[get_and_parse(u) for u in urls])
-                for sub in results:
-                    if not sub:
-                        continue
-                    if sub.size_in is not None and abs(sub.size_in - size_in) <= tol:
-                        collected[sub.url] = sub
-                    if len(collected) >= target:
-                        break
-            cycles_used += 1
-            if len(collected) < target and tol < tolerance_max:
-                tol = min(tolerance_max, tol + tolerance_step)
-    finally:
-        try:
-            await client.aclose()  # type: ignore[attr-defined]
-        except Exception:
-            pass
-    ranked = _rank_subwoofers(list(collected.values()))
-    top_list = ranked[:target]
-    existing = load_db()
-    by_url = {i.url: i for i in existing}
-    for it in top_list:
-        by_url[it.url] = it
-    merged = list(by_url.values())
-    save_db(merged)
+                    sub = parse_product(pr.text, u)
+                    return sub
+            results = await asyncio.gather(*[get_and_parse(u) for u in urls])
+            for sub in results:
+                if not sub:
+                    continue
+                if sub.size_in is not None and abs(sub.size_in - size_in) <= tol:
+                    collected[sub.url] = sub
+                if len(collected) >= target:
+                    break
+        cycles_used += 1
+        if len(collected) < target and tol < tolerance_max:
+            tol = min(tolerance_max, tol + tolerance_step)
+    top_list = _rank_subwoofers(list(collected.values()), limit=target)
+    await asyncio.to_thread(upsert_db, top_list)
     snapshot_path = None
     if snapshot and top_list:
         # ensure per-size directory
-        size_dir = Path("subwoofers") / str(int(round(size_in)))
+        size_dir = SIZE_ROOT / str(int(round(size_in)))
         size_dir.mkdir(parents=True, exist_ok=True)
         ts = time.strftime("%Y%m%d-%H%M%S-") + f"{int((time.time()%1)*1_000_000):06d}"
         snapshot_path = size_dir / f"snapshot_{ts}.json"
@@ -514,6 +579,12 @@ async def aggressive_collect(
             snapshot_path.write_text(json.dumps([asdict(i) for i in top_list], indent=2), encoding="utf-8")
         except Exception:
             snapshot_path = None
+        else:
+            # Retention: keep the newest few, roll older ones up into gzipped deltas (app/catalog/retention.py)
+            settings = get_settings()
+            retention.schedule(size_dir, keep_last=settings.subwoofer_snapshot_keep_last,
+                               keep_daily=settings.subwoofer_snapshot_keep_daily,
+                               keep_weekly=settings.subwoofer_snapshot_keep_weekly)
     mismatch_warning = None
     if start_url:
         size_tokens = re.findall(r'(\d+)-Inch', start_url)
@@ -558,41 +629,19 @@ async def sample_subwoofers(limit: int = Query(5, ge=1, le=50)) -> Dict[str, Any
     swallowing network errors and returning an empty list rather than failing.
     Designed for quick UI development without large dataset overhead.
     """
-    items = load_db()
+    snap = _store().snapshot()
     # Removed auto-seed from Crutchfield; now returns empty list if DB empty.
-    if not items:
-        items = []
-    sample = items[:limit]
+    sample = snap.items[:limit]
     return {
-        "total": len(items),
+        "total": len(snap),
         "returned": len(sample),
         "items": [asdict(i) for i in sample]
     }
 
 def matches(q: Subwoofer, brand: Optional[str], size_min, size_max, rms_min, rms_max, imp, box, text):
-    if brand and brand.lower() not in (q.brand or "").lower():
-        return False
-    if size_min and (q.size_in or 0) < size_min:
-        return False
-    if size_max and (q.size_in or 0) > size_max:
-        return False
-    if rms_min and (q.rms_w or 0) < rms_min:
-        return False
-    if rms_max and (q.rms_w or 0) > rms_max:
-        return False
-    if imp and q.impedance_ohm and abs(q.impedance_ohm - imp) > 0.01:
-        return False
-    if box and q.recommended_box and box.lower() not in q.recommended_box.lower():
-        return False
-    if text:
-        blob = f"{q.brand} {q.model} {q.recommended_box} {q.url}".lower()
-        if text.lower() not in blob:
-            return False
-    return True
+    return SearchFilters(brand, size_min, size_max, rms_min, rms_max, imp, box, text).matches(q)
 
-@router.get("/", response_class=JSONResponse)
-@router.get("", include_in_schema=False)
-async def search_subwoofers(
+def search_filters(
     brand: Optional[str] = None,
     size_min: Optional[float] = Query(None, ge=6.0, le=24.0),
     size_max: Optional[float] = Query(None, ge=6.0, le=24.0),
@@ -600,29 +649,228 @@ async def search_subwoofers(
     rms_max: Optional[int] = Query(None, ge=0, le=10000),
     impedance_ohm: Optional[float] = Query(None, ge=0.5, le=16.0),
     box_type: Optional[str] = Query(None, description="sealed|ported|bandpass keywords"),
-    q: Optional[str] = Query(None, description="free text contains"),
-    sort: Optional[str] = Query(None, description="price|rms|size"),
+    q: Optional[str] = Query(None, description="free text; every term must match brand/model/box/url (prefix or infix)"),
+) -> SearchFilters:
+    """Filter query parameters shared by search and export."""
+    return SearchFilters(brand, size_min, size_max, rms_min, rms_max, impedance_ohm, box_type, q)
+
+SORT_QUERY = Query(None, description="price|rms|size|relevance (default relevance when q is set)")
+
+@router.get("/", response_class=JSONResponse)
+@router.get("", include_in_schema=False)
+async def search_subwoofers(
+    request: Request,
+    filters: SearchFilters = Depends(search_filters),
+    sort: Optional[str] = SORT_QUERY,
     limit: int = Query(50, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="opaque next_cursor from a previous page (keyset pagination; ignores offset)"),
 ):
-    items = load_db()
-    filtered = [i for i in items if matches(i, brand, size_min, size_max, rms_min, rms_max, impedance_ohm, box_type, q)]
-    def key_for(it: Subwoofer):
-        if sort == "price":
-            return (it.price_usd is None, it.price_usd or math.inf)
-        if sort == "rms":
-            return (it.rms_w is None, -(it.rms_w or -1))
-        if sort == "size":
-            return (it.size_in is None, -(it.size_in or -1))
-        return (it.brand or "", it.model or "")
-    filtered.sort(key=key_for)
+    store = _store()
+    validator = _catalog_validator(store, request)
+    not_modified = validator.not_modified(request)
+    if not_modified is not None:
+        return not_modified
+    fingerprint = filters_fingerprint(filters, sort)
+    if cursor:
+        # Keyset page: resumes after the cursor's (sort key, url) in the current
+        # snapshot, so cost does not grow with depth and writes between pages
+        # neither repeat nor shift rows.
+        snap = store.snapshot()
+        try:
+            state = decode_cursor(cursor, fingerprint)
+            page, next_key = snap.page_after(filters, sort, (state["key"], state["url"]), limit)
+        except (InvalidCursor, TypeError) as exc:
+            raise HTTPException(400, f"invalid cursor: {exc}")
+        return validator.apply(serialize.list_response({
+            "limit": limit,
+            "next_cursor": encode_cursor(next_key, page[-1].url, snap.version, fingerprint) if next_key else None,
+        }, snap.encoded(page)))
+    # Range filters narrow candidates via the catalog's size/RMS indexes; ordering
+    # comes from the prebuilt sort view instead of a per-request sort; `q` is
+    # resolved through the snapshot's inverted text index.
+    filtered = store.search(filters, sort)
     page = filtered[offset: offset + limit]
-    return JSONResponse({
+    next_cursor = None
+    if page and offset + limit < len(filtered):
+        snap = store.snapshot()
+        key = snap.cursor_key(filters, sort, page[-1])
+        if key is not None:
+            next_cursor = encode_cursor(key, page[-1].url, snap.version, fingerprint)
+    # Records are encoded once per snapshot; the page body is a join of cached bytes.
+    return validator.apply(serialize.list_response({
         "total": len(filtered),
-        "items": [asdict(i) for i in page],
         "limit": limit,
-        "offset": offset
-    })
+        "offset": offset,
+        "next_cursor": next_cursor,
+    }, store.encode(page)))
+
+@router.get("/facets")
+async def subwoofer_facets(request: Request, filters: SearchFilters = Depends(search_filters)):
+    """Counts per size bucket, brand and impedance plus RMS / price histograms for the filter set.
+
+    Each facet is counted with every filter except its own (e.g. brand counts
+    ignore `brand`), so the UI can offer alternatives without fetching records.
+    Values are read from per-snapshot bucket codes; results are cached per
+    filter set until the catalog changes.
+    """
+    store = _store()
+    validator = _catalog_validator(store, request)
+    not_modified = validator.not_modified(request)
+    if not_modified is not None:
+        return not_modified
+    return validator.apply(JSONResponse(store.snapshot().facets(filters)))
+
+# ---------- Change feed ----------
+CHANGES_HEARTBEAT = 15.0  # seconds between SSE keep-alive comments
+
+def _sse_frame(event: str, seq: int, payload: Dict[str, Any]) -> bytes:
+    return f"id: {seq}\nevent: {event}\ndata: ".encode() + serialize.dumps(payload) + b"\n\n"
+
+async def _change_stream(request: Request, feed, since: int, timeout: float):
+    deadline = time.monotonic() + timeout
+    cursor = since
+    yield b"retry: 3000\n\n"
+    while True:
+        events, complete = feed.since(cursor)
+        if not complete:
+            # Missed events (buffer overflow / server restart): client refetches, then follows on
+            cursor = feed.version
+            yield _sse_frame("reset", cursor, {"version": cursor})
+            continue
+        for change in events:
+            cursor = change.seq
+            yield _sse_frame(change.op, change.seq, change.to_dict())
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or await request.is_disconnected():
+            return
+        if not await feed.wait(cursor, min(remaining, CHANGES_HEARTBEAT)):
+            yield b": keep-alive\n\n"
+
+@router.get("/changes")
+async def subwoofer_changes(
+    request: Request,
+    since: Optional[int] = Query(None, ge=0, description="last version seen; omit to start from the current version"),
+    timeout: float = Query(300.0, ge=0, le=3600, description="SSE only: close the stream after this many seconds"),
+):
+    """Catalog upserts and deletes after `since`, as Server-Sent Events or JSON.
+
+    With `Accept: text/event-stream` the response is an SSE stream (`id` = version,
+    `event` = upsert|delete|reset) that stays open for `timeout` seconds; browsers
+    reconnect with `Last-Event-ID`. Otherwise returns `{version, reset, events}` for
+    polling with `since=<version>`. `reset` means events were dropped from the ring
+    buffer (or `since` is unknown): refetch the catalog and follow from `version`.
+    """
+    feed = _store().changes
+    last_event_id = request.headers.get("last-event-id", "")
+    if last_event_id.isdigit():
+        since = int(last_event_id)
+    if since is None:
+        since = feed.version
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            _change_stream(request, feed, since, timeout),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+    events, complete = feed.since(since)
+    version = events[-1].seq if events else (since if complete else feed.version)
+    return serialize.object_response(
+        {"version": version, "reset": not complete},
+        "events", serialize.join_array(serialize.dumps(e.to_dict()) for e in events),
+        headers={"Cache-Control": "no-cache"},
+    )
+
+# ---------- History ----------
+@router.get("/history")
+async def subwoofer_history(url: str = Query(..., description="product URL of the record")):
+    """Timestamped price / spec deltas for one record (oldest first) plus its current state."""
+    store = _store()
+    snap = store.snapshot()
+    pos = snap.url_index().get(url)
+    entries = store.history.for_url(url)
+    if pos is None and not entries:
+        raise HTTPException(404, "unknown subwoofer url")
+    prices = [(e["at"], e["changes"]["price_usd"]) for e in entries if "price_usd" in e.get("changes", {})]
+    return {
+        "url": url,
+        "current": snap.items[pos].to_dict() if pos is not None else None,
+        "price_points": [{"at": at, "price_usd": p} for at, p in prices],
+        "entries": entries,
+    }
+
+@router.get("/price-drops")
+async def subwoofer_price_drops(
+    since: float = Query(..., description="POSIX time; compare current prices with the price at this time"),
+    filters: SearchFilters = Depends(search_filters),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """Records (matching the search filters) whose price is lower now than at `since`, biggest relative drop first."""
+    store = _store()
+    drops = store.history.price_drops(since)
+    matched = [it for it in store.search(filters) if it.url in drops]
+    def drop_pct(it: Subwoofer) -> float:
+        then, now = drops[it.url]
+        return (then - now) / then if then else 0.0
+    ranked = sorted(matched, key=lambda it: (-drop_pct(it), it.url))[:limit]
+    return {
+        "since": since,
+        "total": len(matched),
+        "returned": len(ranked),
+        "items": [dict(it.to_dict(), price_then=drops[it.url][0], price_drop_pct=round(100 * drop_pct(it), 2))
+                  for it in ranked],
+    }
+
+# ---------- Export ----------
+EXPORT_CHUNK = 500  # records per streamed chunk
+
+def _ndjson_chunks(snap, filters: SearchFilters, sort: Optional[str]) -> Iterator[bytes]:
+    """Yield NDJSON in chunks of EXPORT_CHUNK records from one snapshot (consistent even if writes land mid-export)."""
+    batch: List[Subwoofer] = []
+    for it in snap.iter_search(filters, sort):
+        batch.append(it)
+        if len(batch) >= EXPORT_CHUNK:
+            yield b"\n".join(snap.encoded(batch, cache=False)) + b"\n"
+            batch = []
+    if batch:
+        yield b"\n".join(snap.encoded(batch, cache=False)) + b"\n"
+
+def _gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    z = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in chunks:
+        out = z.compress(chunk)
+        if out:
+            yield out
+    yield z.flush()
+
+def _export(request: Request, filters: SearchFilters, sort: Optional[str], gzip: bool):
+    store = _store()
+    validator = _catalog_validator(store, request)
+    not_modified = validator.not_modified(request)
+    if not_modified is not None:
+        return not_modified
+    chunks = _ndjson_chunks(store.snapshot(), filters, sort)
+    if gzip:
+        headers = {"Content-Disposition": 'attachment; filename="subwoofers.ndjson.gz"'}
+        response = StreamingResponse(_gzip_chunks(chunks), media_type="application/gzip", headers=headers)
+    else:
+        response = StreamingResponse(chunks, media_type="application/x-ndjson")
+    return validator.apply(response)
+
+@router.get("/export.ndjson")
+async def export_ndjson(request: Request, filters: SearchFilters = Depends(search_filters), sort: Optional[str] = SORT_QUERY):
+    """Stream every matching record as one JSON object per line (no paging cap).
+
+    Accepts the same filters and sort as search. The sync generator runs in the
+    threadpool and encodes EXPORT_CHUNK records at a time, so memory stays flat
+    regardless of catalog size.
+    """
+    return _export(request, filters, sort, gzip=False)
+
+@router.get("/export.ndjson.gz")
+async def export_ndjson_gz(request: Request, filters: SearchFilters = Depends(search_filters), sort: Optional[str] = SORT_QUERY):
+    """Gzip-compressed variant of `/export.ndjson` (compressed incrementally while streaming)."""
+    return _export(request, filters, sort, gzip=True)
 
 @router.get("/cutout/{nominal_size}")
 async def cutout(nominal_size: float, actual_spec: Optional[float] = Query(None)):
@@ -653,30 +901,48 @@ async def cutout(nominal_size: float, actual_spec: Optional[float] = Query(None)
         "disclaimer": "Default cutout diameters are automatically estimated using the 0.93× standard. Exact manufacturer specs will override these values when available.",
     }
 
+# latest.json path -> ((mtime_ns, size), record count, compact items array bytes)
+_BUCKET_BODIES: Dict[str, Tuple[Tuple[int, int], int, bytes]] = {}
+
+def _bucket_body(latest_path: Path) -> Tuple[int, bytes]:
+    """Parse + re-encode a bucket file once per file version."""
+    st = latest_path.stat()
+    sig = (st.st_mtime_ns, st.st_size)
+    key = str(latest_path.resolve())
+    cached = _BUCKET_BODIES.get(key)
+    if cached is None or cached[0] != sig:
+        data = json.loads(latest_path.read_text(encoding="utf-8"))
+        cached = _BUCKET_BODIES[key] = (sig, len(data), serialize.dumps(data))
+    return cached[1], cached[2]
+
 @router.get("/size/{size}")
-async def subwoofers_by_size(size: int):
+async def subwoofers_by_size(size: int, request: Request):
     """Return the grouped latest.json snapshot for a rounded size bucket.
 
     Expects that save_db() has produced `subwoofers/<size>/latest.json`. If the bucket
     or file is missing, returns 404. The response mirrors the search shape but is
-    pre-filtered and unsorted (preserves save order).
+    pre-filtered and unsorted (preserves save order). Revalidates via the file's
+    stat (ETag / Last-Modified -> 304).
     """
     if size <= 0:
         raise HTTPException(400, "size must be > 0")
-    bucket_dir = Path("subwoofers") / str(size)
+    bucket_dir = SIZE_ROOT / str(size)
     latest_path = bucket_dir / "latest.json"
-    if not latest_path.exists():
+    validator = file_validator(latest_path, request.url.query)
+    if validator is None:
         raise HTTPException(404, f"No snapshot for size {size}")
+    not_modified = validator.not_modified(request)
+    if not_modified is not None:
+        return not_modified
     try:
-        data = json.loads(latest_path.read_text(encoding="utf-8"))
+        count, items_json = _bucket_body(latest_path)
     except Exception as e:
         raise HTTPException(500, f"Failed reading snapshot: {e}")
-    return {
+    return validator.apply(serialize.object_response({
         "size": size,
-        "count": len(data),
-        "items": data,
+        "count": count,
         "snapshot_file": str(latest_path),
-    }
+    }, "items", items_json))
 
 @router.post("/purge")
 async def purge_subwoofers(
@@ -690,9 +956,9 @@ async def purge_subwoofers(
     the test_url_token OR whose brand contains brand_token (case-insensitive).
 
     Returns counts and a lightweight sample of remaining items (first 10) for quick verification.
-    Side-effects: rewrites DB and refreshes per-size latest.json via save_db.
+    Side-effects: one batched delete (delete_db) and refreshed per-size latest.json for affected sizes.
     """
-    items = load_db()
+    items = list(_store().snapshot().items)
     before = len(items)
     lowered_sources = {s.lower() for s in remove_sources}
     def should_remove(it: Subwoofer) -> bool:
@@ -703,10 +969,11 @@ async def purge_subwoofers(
         if brand_token and brand_token.lower() in (it.brand or '').lower():
             return True
         return False
-    kept = [it for it in items if not should_remove(it)]
-    removed = before - len(kept)
+    doomed = [it.url for it in items if should_remove(it)]
+    removed = len(doomed)
     if removed > 0:
-        save_db(kept)
+        await asyncio.to_thread(delete_db, doomed)
+    kept = list(_store().snapshot().items)
     return {
         "before": before,
         "removed": removed,
@@ -715,21 +982,134 @@ async def purge_subwoofers(
         "sample": [asdict(i) for i in kept[:10]]
     }
 
+# ---------- Bulk writes ----------
+def _bulk_batch(records: List[Subwoofer]) -> Tuple[Any, set]:
+    """Upsert one parsed NDJSON batch in its own write section; returns (catalog before, sizes touched)."""
+    store = _store()
+    with store.write_lock():
+        prev_snap = store.snapshot()
+        store.upsert(records)
+        return prev_snap, _touched_sizes(prev_snap, (r.url for r in records), records)
+
+def _bulk_buckets(touched: set, previous: Iterable[Subwoofer]) -> int:
+    """Refresh the size buckets a bulk import touched; returns the catalog size."""
+    store = _store()
+    try:
+        with store.write_lock():
+            _write_size_buckets(store.snapshot().items, only_sizes=touched, previous=previous)
+    except Exception:
+        store.invalidate()
+    return len(store.snapshot())
+
+@router.post("/bulk")
+async def bulk_upsert_subwoofers(
+    request: Request,
+    batch_size: int = Query(bulk.BATCH_SIZE, ge=1, le=50000, description="records per store write"),
+):
+    """Upsert records from an NDJSON request body (one JSON object per line), keyed by URL.
+
+    The body is parsed on the event loop as it streams in; every `batch_size`
+    records become one store write (a single log append on the JSON backend),
+    applied in a worker thread under a write lock held for that batch only.
+    Size buckets are refreshed once at the end. Malformed lines are reported,
+    not fatal.
+    """
+    urls: List[str] = []
+    touched: set = set()
+    errors: List[Dict[str, Any]] = []
+    error_count = batches = 0
+    first_snap = None
+    async for records, bad in bulk.ndjson_batches(request.stream(), batch_size):
+        error_count += len(bad)
+        errors.extend(bad[:bulk.MAX_REPORTED_ERRORS - len(errors)])
+        if not records:
+            continue
+        prev_snap, sizes = await asyncio.to_thread(_bulk_batch, records)
+        if first_snap is None:
+            first_snap = prev_snap
+        touched |= sizes
+        batches += 1
+        urls.extend(r.url for r in records)
+    if touched:
+        total = await asyncio.to_thread(_bulk_buckets, touched, first_snap.items)
+    else:
+        total = len(_store().snapshot())
+    return {
+        "received": len(urls) + error_count,
+        "upserted": len(urls),
+        "batches": batches,
+        "error_count": error_count,
+        "errors": errors,
+        "total": total,
+    }
+
+@router.post("/bulk/delete")
+async def bulk_delete_subwoofers(
+    filters: SearchFilters = Depends(search_filters),
+    source: List[str] = Query([], description="only these sources (case-insensitive)"),
+    url_contains: Optional[str] = Query(None, description="URL substring (case-insensitive)"),
+    scraped_before: Optional[float] = Query(None, description="POSIX time; records scraped earlier"),
+    dry_run: bool = Query(False, description="only report what would be deleted"),
+    batch_size: int = Query(bulk.BATCH_SIZE, ge=1, le=50000, description="URLs per store write"),
+):
+    """Delete every record matching all given conditions (search filters included).
+
+    Matching runs on the catalog indexes (SQL on the SQLite backend); deletes are
+    applied as one store write per `batch_size` URLs. At least one condition is required.
+    """
+    predicate = bulk.DeletePredicate(filters, tuple(source), url_contains, scraped_before)
+    if predicate.is_empty():
+        raise HTTPException(400, "refusing to delete without any condition")
+    store = _store()
+    urls = store.select_urls(predicate)
+    deleted = 0 if dry_run else await asyncio.to_thread(delete_db, urls, batch_size)
+    return {
+        "matched": len(urls),
+        "deleted": deleted,
+        "dry_run": dry_run,
+        "sample_urls": urls[:10],
+        "total": len(store.snapshot()),
+    }
+
+@router.post("/dedupe")
+async def dedupe_subwoofers():
+    """Collapse cross-retailer duplicates already in the stored catalog.
+
+    Returns before/after counts and the canonical records that gained offers (first 10).
+    """
+    items = list(_store().snapshot().items)
+    merged = dedup.dedupe(items)
+    if len(merged) != len(items):
+        await asyncio.to_thread(save_db, merged)
+    multi = [r for r in merged if r.offers and len(r.offers) > 1]
+    return {
+        "before": len(items),
+        "after": len(merged),
+        "merged_products": len(multi),
+        "sample": [r.to_dict() for r in multi[:10]],
+    }
+
 @router.get("/picker")
-async def picker_subwoofers(limit: int = Query(30, ge=1, le=500)):
+async def picker_subwoofers(
+    request: Request,
+    limit: int = Query(30, ge=1, le=500),
+    rank: str = Query("picker", description="scorer: picker|collect|rms_per_dollar (see app/catalog/ranking.py)"),
+):
     """Return condensed subwoofer records for frontend picker.
 
-    Sorting heuristic: size_in desc, then rms_w desc, then price desc fallback, then brand/model.
+    Sorting heuristic (default `rank=picker`): size_in desc, then rms_w desc, then price desc fallback, then brand/model.
     Only exposes minimal fields needed for selection UI.
     """
-    items = load_db()
-    def key(it: Subwoofer):
-        # Use -size/rms/price for descending order; None sorts last by using sentinel
-        size = it.size_in if it.size_in is not None else -9999
-        rms = it.rms_w if it.rms_w is not None else -9999
-        price = it.price_usd if it.price_usd is not None else -9999
-        return (-size, -rms, -price, it.brand or '', it.model or '')
-    items.sort(key=key)
+    store = _store()
+    validator = _catalog_validator(store, request)
+    not_modified = validator.not_modified(request)
+    if not_modified is not None:
+        return not_modified
+    if rank not in ranking.SCORERS:
+        raise HTTPException(400, f"unknown rank '{rank}' (expected one of {sorted(ranking.SCORERS)})")
+    snap = store.snapshot()
+    # Heap top-K over rank keys precomputed per record (carried across snapshots)
+    top = snap.top(rank, limit)
     condensed = [{
         "brand": it.brand,
         "model": it.model,
@@ -738,8 +1118,8 @@ async def picker_subwoofers(limit: int = Query(30, ge=1, le=500)):
         "price_usd": it.price_usd,
         "source": it.source,
         "url": it.url,
-    } for it in items[:limit]]
-    return {"total": len(items), "returned": len(condensed), "items": condensed}
+    } for it in top]
+    return validator.apply(JSONResponse({"total": len(snap), "returned": len(condensed), "items": condensed}))
 
 __all__ = ["router"]
 
@@ -0,0 +1,13 @@
+"""Subwoofer catalog storage and indexing.
+
+Keeps the shared `data/subwoofers.json` catalog resident in memory so read
+endpoints do not re-parse it per request, behind a small store interface with
+JSON (default) and SQLite backends.
+"""
+from .catalog import Catalog, CatalogSnapshot, SearchFilters, coerce_subwoofer, get_catalog
+from .store import JsonStore, SubwooferStore, get_store
+
+__all__ = [
+    "Catalog", "CatalogSnapshot", "SearchFilters", "coerce_subwoofer", "get_catalog",
+    "JsonStore", "SubwooferStore", "get_store",
+]
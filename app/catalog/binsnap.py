@@ -0,0 +1,223 @@
+"""Memory-mapped binary snapshot of the JSON catalog.
+
+Loading `data/subwoofers.json` costs a full `json.loads` plus one record per
+entry before the first request can be served. `JsonStore` therefore also
+writes `subwoofers.snap` whenever it rewrites the base file (`save_db`, lite
+merges). Workers `mmap` it and decode records lazily on first access, so a cold
+catalog load is O(1) and the pages are shared across workers through the OS
+page cache.
+
+Layout (native byte order, all sections 8-byte aligned):
+- header `MAGIC, format, byte order, count, nstr, base mtime_ns, base size`;
+  the base file signature lets readers ignore a snapshot the JSON has since
+  outgrown (compaction, external edits);
+- one kind byte per `Subwoofer` field: `s` string id (u32, NONE_ID = None;
+  `offers` is stored as its JSON text),
+  `q` int64 (INT_NONE = None), `d` float64 (NaN = None) or `m` float64 plus a
+  u8 "was int" flag per record (columns mixing `8` and `10.5`);
+- the columns, in field order;
+- a string table: `nstr + 1` u64 offsets into a UTF-8 blob (deduplicated).
+
+The JSON file stays authoritative: records the format cannot represent
+exactly (bools, strings in numeric fields, ...) make `write_snapshot` skip the
+file, and readers fall back to JSON whenever the snapshot is missing or stale.
+"""
+from __future__ import annotations
+import math, mmap, os, struct, sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from app.core.atomic import atomic_write_bytes
+from app.models.subwoofer import FIELD_NAMES, Subwoofer, encode_offers
+
+MAGIC = b"BBSNAP01"
+FORMAT = 2  # 2: + offers column
+HEADER = struct.Struct("=8sHBxIIqq")
+NONE_ID = 0xFFFFFFFF
+INT_NONE = -(1 << 63)
+STRING_FIELDS = frozenset({"source", "url", "brand", "model", "recommended_box", "image", "offers"})
+_BYTEORDER = 1 if sys.byteorder == "little" else 2
+_CAST = {"s": "I", "q": "q", "d": "d", "m": "d"}
+
+
+def snapshot_path_for(base: Path) -> Path:
+    """`data/subwoofers.json` -> `data/subwoofers.snap`."""
+    return base.with_suffix(".snap")
+
+
+def _pad(buf: bytearray) -> None:
+    buf.extend(b"\0" * (-len(buf) % 8))
+
+
+def _column_kind(values: List[Any]) -> Optional[str]:
+    kinds = set()
+    for v in values:
+        if v is None:
+            continue
+        if type(v) is int and INT_NONE < v < (1 << 63):
+            kinds.add("q")
+        elif type(v) is float and not math.isnan(v):
+            kinds.add("d")
+        else:
+            return None
+    if kinds == {"q"}:
+        return "q"
+    return "m" if len(kinds) == 2 else "d"
+
+
+def encode(records: Sequence[Subwoofer], base_sig: Tuple[int, int]) -> Optional[bytes]:
+    """Serialize `records`; None if some value has no exact binary representation."""
+    strings: Dict[str, int] = {}
+    kinds: List[str] = []
+    columns: List[bytes] = []
+    for name in FIELD_NAMES:
+        values = [getattr(r, name) for r in records]
+        if name == "offers":
+            values = [encode_offers(v) for v in values]
+        if name in STRING_FIELDS:
+            if any(v is not None and type(v) is not str for v in values):
+                return None
+            ids = array("I", (NONE_ID if v is None else strings.setdefault(v, len(strings)) for v in values))
+            kind, data = "s", ids.tobytes()
+        else:
+            kind = _column_kind(values)
+            if kind is None:
+                return None
+            if kind == "q":
+                data = array("q", (INT_NONE if v is None else v for v in values)).tobytes()
+            else:
+                data = array("d", (math.nan if v is None else float(v) for v in values)).tobytes()
+                if kind == "m":
+                    data += bytes(1 if type(v) is int else 0 for v in values)
+        kinds.append(kind)
+        columns.append(data)
+    if len(strings) >= NONE_ID:
+        return None
+    buf = bytearray(HEADER.pack(MAGIC, FORMAT, _BYTEORDER, len(records), len(strings), *base_sig))
+    buf.extend("".join(kinds).encode("ascii"))
+    _pad(buf)
+    for data in columns:
+        buf.extend(data)
+        _pad(buf)
+    blobs = [s.encode("utf-8") for s in strings]  # dict order == id order
+    offsets = array("Q", [0])
+    for b in blobs:
+        offsets.append(offsets[-1] + len(b))
+    buf.extend(offsets.tobytes())
+    buf.extend(b"".join(blobs))
+    return bytes(buf)
+
+
+def write_snapshot(base: Path, records: Sequence[Subwoofer]) -> bool:
+    """Write the snapshot for the current `base` file; False (and no file) if not representable."""
+    path = snapshot_path_for(base)
+    try:
+        st = os.stat(base)
+    except OSError:
+        return False
+    data = encode(records, (st.st_mtime_ns, st.st_size))
+    if data is None:
+        path.unlink(missing_ok=True)
+        return False
+    atomic_write_bytes(path, data)
+    return True
+
+
+class SnapshotRecords(Sequence):
+    """Read-only `Sequence[Subwoofer]` over a mapped snapshot; records decode on first access."""
+
+    def __init__(self, buf: Union[mmap.mmap, bytes]):
+        self._buf = buf
+        view = memoryview(buf)
+        magic, fmt, order, count, nstr, *_ = HEADER.unpack_from(view, 0)
+        if magic != MAGIC or fmt != FORMAT or order != _BYTEORDER:
+            raise ValueError("unsupported snapshot")
+        off = HEADER.size
+        kinds = bytes(view[off:off + len(FIELD_NAMES)]).decode("ascii")
+        off += len(FIELD_NAMES) + (-(off + len(FIELD_NAMES)) % 8)
+        self._columns: List[Tuple[str, memoryview, Optional[memoryview]]] = []
+        for kind in kinds:
+            width = 4 if kind == "s" else 8
+            col = view[off:off + count * width].cast(_CAST[kind])
+            off += count * width
+            flags = None
+            if kind == "m":
+                flags = view[off:off + count]
+                off += count
+            off += -off % 8
+            self._columns.append((kind, col, flags))
+        self._offsets = view[off:off + (nstr + 1) * 8].cast("Q")
+        self._blob = view[off + (nstr + 1) * 8:]
+        if len(self._offsets) != nstr + 1 or len(self._blob) < (self._offsets[nstr] if nstr else 0):
+            raise ValueError("truncated snapshot")
+        self._count = count
+        self._strings: Dict[int, str] = {}
+        self._records: List[Optional[Subwoofer]] = [None] * count
+
+    def _string(self, sid: int) -> Optional[str]:
+        if sid == NONE_ID:
+            return None
+        s = self._strings.get(sid)
+        if s is None:
+            s = self._strings[sid] = str(self._blob[self._offsets[sid]:self._offsets[sid + 1]], "utf-8")
+        return s
+
+    def _decode(self, i: int) -> Subwoofer:
+        values: List[Any] = []
+        for kind, col, flags in self._columns:
+            v = col[i]
+            if kind == "s":
+                values.append(self._string(v))
+            elif kind == "q":
+                values.append(None if v == INT_NONE else v)
+            elif math.isnan(v):
+                values.append(None)
+            else:
+                values.append(int(v) if flags is not None and flags[i] else v)
+        return Subwoofer(*values)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        rec = self._records[i]
+        if rec is None:
+            rec = self._records[i] = self._decode(i)
+        return rec
+
+    def __iter__(self) -> Iterator[Subwoofer]:
+        for i in range(self._count):
+            yield self[i]
+
+
+def _header(buf) -> Optional[Tuple[Any, ...]]:
+    if len(buf) < HEADER.size:
+        return None
+    return HEADER.unpack_from(buf, 0)
+
+
+def open_snapshot(base: Path, base_sig: Tuple[int, int]) -> Optional[SnapshotRecords]:
+    """Map the snapshot for `base` if it was written for `base_sig` (mtime_ns, size), else None."""
+    path = snapshot_path_for(base)
+    try:
+        with open(path, "rb") as fh:
+            head = _header(fh.read(HEADER.size))
+            if head is None or head[0] != MAGIC or tuple(head[5:7]) != tuple(base_sig):
+                return None
+            buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        return SnapshotRecords(buf)
+    except (ValueError, TypeError, struct.error):
+        return None
+
+
+__all__ = ["SnapshotRecords", "encode", "open_snapshot", "snapshot_path_for", "write_snapshot"]
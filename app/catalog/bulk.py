@@ -0,0 +1,91 @@
+"""Bulk catalog writes: streamed NDJSON upserts and predicate deletes.
+
+Partner-feed imports post NDJSON (one record per line, any shape `from_any`
+accepts) to `POST /subwoofers/bulk`; the body is parsed while it streams in and
+applied `BATCH_SIZE` records at a time, each batch as a single store write
+(one log append for the JSON backend, one `executemany` for SQLite).
+
+`DeletePredicate` selects records for `POST /subwoofers/bulk/delete` (and
+purge). Its `filters` part goes through the snapshot's range / text indexes;
+the SQLite backend pushes the numeric, source, URL and age conditions down
+into one indexed `SELECT` and re-checks the rest in Python.
+"""
+from __future__ import annotations
+import json
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.models.subwoofer import Subwoofer, from_any
+from .catalog import SearchFilters
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 20
+
+
+@dataclass(frozen=True)
+class DeletePredicate:
+    """Records to delete; every condition given must hold."""
+
+    filters: SearchFilters = field(default_factory=SearchFilters)
+    sources: Tuple[str, ...] = ()  # case-insensitive
+    url_contains: Optional[str] = None  # case-insensitive substring
+    scraped_before: Optional[float] = None  # POSIX time
+
+    def is_empty(self) -> bool:
+        return (self.filters == SearchFilters() and not self.sources and not self.url_contains
+                and self.scraped_before is None)
+
+    def matches(self, it: Subwoofer, check_filters: bool = True) -> bool:
+        if self.sources and (it.source or "").lower() not in {s.lower() for s in self.sources}:
+            return False
+        if self.url_contains and self.url_contains.lower() not in it.url.lower():
+            return False
+        if self.scraped_before is not None and it.scraped_at >= self.scraped_before:
+            return False
+        return not check_filters or self.filters.matches(it)
+
+
+def _parse_line(line: bytes) -> Subwoofer:
+    data = json.loads(line)
+    if not isinstance(data, dict):
+        raise TypeError("expected a JSON object")
+    return from_any(data)
+
+
+async def ndjson_batches(chunks: AsyncIterable[bytes], batch_size: int = BATCH_SIZE
+                         ) -> AsyncIterator[Tuple[List[Subwoofer], List[Dict[str, Any]]]]:
+    """Yield (records, errors) per `batch_size` parsed lines of a streamed NDJSON body.
+
+    Blank lines are ignored; a malformed line becomes `{"line": n, "error": ...}`
+    instead of failing the import.
+    """
+    buf = b""
+    line_no = 0
+    batch: List[Subwoofer] = []
+    errors: List[Dict[str, Any]] = []
+
+    def take(line: bytes) -> None:
+        if not line.strip():
+            return
+        try:
+            batch.append(_parse_line(line))
+        except (ValueError, TypeError) as exc:
+            errors.append({"line": line_no, "error": f"{type(exc).__name__}: {exc}"[:200]})
+
+    async for chunk in chunks:
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            line_no += 1
+            take(line)
+            if len(batch) >= batch_size:
+                yield batch, errors
+                batch, errors = [], []
+    if buf:
+        line_no += 1
+        take(buf)
+    if batch or errors:
+        yield batch, errors
+
+
+__all__ = ["BATCH_SIZE", "DeletePredicate", "MAX_REPORTED_ERRORS", "ndjson_batches"]
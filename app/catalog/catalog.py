@@ -0,0 +1,611 @@
+"""Process-wide in-memory subwoofer catalog.
+
+Read endpoints used to re-read and re-parse `data/subwoofers.json` (and rebuild
+every `Subwoofer`) on each request, then sort the full list. The catalog loads
+the file once per process and keeps an immutable `CatalogSnapshot` resident,
+together with sorted views that are built on first use and reused until the
+data changes.
+
+Freshness:
+- Every access stats the backing files (base JSON + upsert log, see `wal.py`)
+  and reads the write version counter (`app/core/write_coordinator.py`); a
+  changed signature triggers a reload, or just a replay of the new log tail
+  when only the log grew; a log stamped for an earlier base file is ignored
+  (see `wal.py`). This covers writers that bypass
+  `save_db` (other routers, other worker processes, tests seeding the file).
+- `save_db` installs the items it just wrote through `Catalog.replace()` so the
+  next read does not pay for a re-parse of its own write.
+"""
+from __future__ import annotations
+import bisect, math, os, threading
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.write_coordinator import read_version
+from app.models.subwoofer import Subwoofer, from_any
+from . import binsnap, columnar, dedup, ranking, serialize, wal
+from .facets import FACETS, OWN_FILTERS, FacetIndex
+from .text_index import TextIndex
+
+Signature = Tuple[int, ...]  # cheap change token, e.g. (st_mtime_ns, st_size) per backing file
+COLUMNAR_MIN_ITEMS = 2000  # below this the pure-Python filter is already fast enough
+FACET_CACHE_SIZE = 256  # distinct filter sets whose facet counts a snapshot keeps
+
+# ---------- Sort views ----------
+# Keys mirror the historical per-request sorts; the search orderings break ties
+# by URL (unique per record), so a cursor key is a total-order position that
+# paging can resume strictly after even when that record is gone.
+VIEW_KEYS: Dict[str, Callable[[Subwoofer], Any]] = {
+    "brand": lambda it: (it.brand or "", it.model or "", it.url),
+    "price": lambda it: (it.price_usd is None, it.price_usd or math.inf, it.url),
+    "rms": lambda it: (it.rms_w is None, -(it.rms_w or -1), it.url),
+    "size": lambda it: (it.size_in is None, -(it.size_in or -1), it.url),
+    "picker": ranking.picker_key,  # same order as the "picker" scorer; not a cursor ordering
+}
+
+
+@dataclass(frozen=True)
+class SearchFilters:
+    """Filter set accepted by `/subwoofers` search.
+
+    `matches()` is the reference semantics: missing numeric values count as 0
+    for min/max bounds, while missing impedance/recommended_box never exclude.
+    """
+    brand: Optional[str] = None
+    size_min: Optional[float] = None
+    size_max: Optional[float] = None
+    rms_min: Optional[int] = None
+    rms_max: Optional[int] = None
+    impedance_ohm: Optional[float] = None
+    box_type: Optional[str] = None
+    text: Optional[str] = None
+
+    def matches(self, q: Subwoofer, check_text: bool = True) -> bool:
+        """Plain per-record test; `check_text=False` skips `text` (already resolved by the index)."""
+        if self.brand and self.brand.lower() not in (q.brand or "").lower():
+            return False
+        if self.size_min and (q.size_in or 0) < self.size_min:
+            return False
+        if self.size_max and (q.size_in or 0) > self.size_max:
+            return False
+        if self.rms_min and (q.rms_w or 0) < self.rms_min:
+            return False
+        if self.rms_max and (q.rms_w or 0) > self.rms_max:
+            return False
+        imp = self.impedance_ohm
+        if imp and q.impedance_ohm and abs(q.impedance_ohm - imp) > 0.01:
+            return False
+        if self.box_type and q.recommended_box and self.box_type.lower() not in q.recommended_box.lower():
+            return False
+        if check_text and self.text:
+            blob = f"{q.brand} {q.model} {q.recommended_box} {q.url}".lower()
+            if self.text.lower() not in blob:
+                return False
+        return True
+
+    def ranges(self) -> List[Tuple[str, float, float]]:
+        """Return (field, lo, hi) bounds for the active numeric range filters."""
+        out: List[Tuple[str, float, float]] = []
+        for field, lo, hi in (("size_in", self.size_min, self.size_max), ("rms_w", self.rms_min, self.rms_max)):
+            if lo or hi:
+                out.append((field, lo if lo else -math.inf, hi if hi else math.inf))
+        return out
+
+
+_NO_FILTERS = SearchFilters()
+
+
+def coerce_subwoofer(obj: Any) -> Subwoofer:
+    """Return `obj` as a `Subwoofer` (dicts, full/lite dataclasses, `SubwooferSchema`)."""
+    return from_any(obj)
+
+
+class CatalogSnapshot:
+    """Immutable view of the catalog at one file version.
+
+    Readers hold on to a snapshot for the duration of a request; writers swap
+    in a new one, so no locking is needed on the read path.
+    """
+
+    def __init__(self, items: Iterable[Subwoofer], signature: Optional[Signature], version: int):
+        # A mapped binary snapshot stays lazy; anything else is frozen into a tuple
+        self.items: Sequence[Subwoofer] = items if isinstance(items, binsnap.SnapshotRecords) else tuple(items)
+        self.signature = signature
+        self.version = version
+        self._orders: Dict[str, List[int]] = {}
+        self._positions: Dict[str, List[int]] = {}
+        self._ranges: Dict[str, Tuple[List[float], List[int]]] = {}
+        self._text_index: Optional[TextIndex] = None
+        self._columnar: Optional[columnar.ColumnarIndex] = None
+        self._view_keys: Dict[str, List[Any]] = {}
+        self._url_index: Optional[Dict[str, int]] = None
+        self._dedup_index: Optional[dedup.DedupIndex] = None
+        self._encoded: Dict[int, bytes] = {}  # item index -> compact JSON bytes
+        self._facet_index: Optional[FacetIndex] = None
+        self._rank: Dict[Tuple[str, str], Any] = {}  # ("rank" | "top", scorer) -> keys / indices
+        self._rank_generation = ranking.generation()
+        self._facet_cache: Dict[SearchFilters, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _order(self, name: str) -> List[int]:
+        order = self._orders.get(name)
+        if order is None:
+            key = VIEW_KEYS[name]
+            items = self.items
+            order = sorted(range(len(items)), key=lambda i: key(items[i]))
+            self._orders[name] = order
+        return order
+
+    def _position(self, name: str) -> List[int]:
+        pos = self._positions.get(name)
+        if pos is None:
+            pos = [0] * len(self.items)
+            for rank, idx in enumerate(self._order(name)):
+                pos[idx] = rank
+            self._positions[name] = pos
+        return pos
+
+    def view(self, name: str, limit: Optional[int] = None) -> List[Subwoofer]:
+        """Return items in the named sort order (optionally only the first `limit`)."""
+        order = self._order(name)
+        if limit is not None:
+            order = order[:limit]
+        items = self.items
+        return [items[i] for i in order]
+
+    # ---------- Ranking ----------
+    # Cached per scorer under ("rank", name) / ("top", name), apart from the VIEW_KEYS orders: a scorer
+    # may share a view's name with a different key. Dropped when scorers are (re-)registered.
+    def _rank_cache(self) -> Dict[Tuple[str, str], Any]:
+        gen = ranking.generation()
+        if self._rank_generation != gen:
+            self._rank, self._rank_generation = {}, gen
+        return self._rank
+
+    def rank_keys(self, name: str) -> List[Tuple[Any, ...]]:
+        """Per-item keys of scorer `name` (see `ranking.py`), computed once per record."""
+        cache = self._rank_cache()
+        keys = cache.get(("rank", name))
+        if keys is None:
+            key = ranking.get_scorer(name)
+            keys = cache[("rank", name)] = [key(it) for it in self.items]
+        return keys
+
+    def top(self, name: str, k: int) -> List[Subwoofer]:
+        """Best `k` items by scorer `name`: heap selection over the cached keys, O(N log K)."""
+        items = self.items
+        cache = self._rank_cache()
+        order = cache.get(("top", name))  # best-first indices for the largest k served so far
+        if order is None or (len(order) < k and len(order) < len(items)):
+            order = cache[("top", name)] = ranking.top_k_indices(self.rank_keys(name), k)
+        return [items[i] for i in order[:k]]
+
+    def inherit_rank_keys(self, prev: "CatalogSnapshot") -> None:
+        """Carry `prev`'s rank keys over for unchanged record objects; only new records are scored."""
+        if isinstance(self.items, binsnap.SnapshotRecords):
+            return
+        prev_cache = prev._rank_cache()
+        cache = self._rank_cache()
+        prev_items = prev.items
+        for (kind, name), prev_keys in list(prev_cache.items()):
+            key = ranking.SCORERS.get(name)
+            if kind != "rank" or key is None:
+                continue
+            by_id = {id(prev_items[i]): k for i, k in enumerate(prev_keys)}
+            cache[("rank", name)] = [by_id[id(it)] if id(it) in by_id else key(it) for it in self.items]
+
+    def range_indices(self, field: str, lo: float, hi: float) -> List[int]:
+        """Return item indices whose `(value or 0)` lies within [lo, hi]."""
+        index = self._ranges.get(field)
+        if index is None:
+            items = self.items
+            pairs = sorted((float(getattr(items[i], field) or 0), i) for i in range(len(items)))
+            index = ([k for k, _ in pairs], [i for _, i in pairs])
+            self._ranges[field] = index
+        keys, idxs = index
+        return idxs[bisect.bisect_left(keys, lo):bisect.bisect_right(keys, hi)]
+
+    @property
+    def text_index(self) -> TextIndex:
+        """Inverted index over brand/model/recommended_box/url, built on first use."""
+        index = self._text_index
+        if index is None:
+            index = self._text_index = TextIndex(self.items)
+        return index
+
+    def columnar_index(self) -> Optional[columnar.ColumnarIndex]:
+        """NumPy column arrays for vectorized filtering (None without numpy or for small snapshots)."""
+        if self._columnar is None and columnar.available() and len(self.items) >= COLUMNAR_MIN_ITEMS:
+            self._columnar = columnar.ColumnarIndex(self.items, self._order("brand"))
+        return self._columnar
+
+    def search(self, filters: SearchFilters, sort: Optional[str] = None) -> List[Subwoofer]:
+        """Return all items matching `filters`, ordered by `sort` (price|rms|size|relevance|None).
+
+        With a text query, `None`/`relevance` orders by relevance (ties in brand
+        order); without one, `relevance` falls back to brand order.
+        """
+        view_name = sort if sort in ("price", "rms", "size") else "brand"
+        items = self.items
+        cols = self.columnar_index()
+        if cols is not None:
+            return self._search_columnar(cols, filters, sort, view_name)
+        scores = self.text_index.search(filters.text) if filters.text else None
+        candidates = self._candidates(filters, scores)
+        if scores is not None and sort in (None, "relevance"):
+            pos = self._position(view_name)
+            ordered = sorted(candidates, key=lambda i: (-scores[i], pos[i]))
+        elif candidates is None:
+            ordered = self._order(view_name)
+        else:
+            ordered = sorted(candidates, key=self._position(view_name).__getitem__)
+        check_text = scores is None
+        return [items[i] for i in ordered if filters.matches(items[i], check_text)]
+
+    def _candidates(self, filters: SearchFilters, scores: Optional[Dict[int, float]]) -> Optional[set]:
+        """Index set narrowed by the range indexes and text hits (None = no narrowing)."""
+        candidates = None
+        for field, lo, hi in filters.ranges():
+            idxs = self.range_indices(field, lo, hi)
+            candidates = set(idxs) if candidates is None else candidates.intersection(idxs)
+        if scores is not None:
+            candidates = set(scores) if candidates is None else candidates.intersection(scores)
+        return candidates
+
+    def match_indices(self, filters: SearchFilters) -> List[int]:
+        """Indices of all items matching `filters`, in no particular order (for aggregation)."""
+        items = self.items
+        scores = self.text_index.search(filters.text) if filters.text else None
+        cols = self.columnar_index()
+        if cols is not None:
+            idxs = cols.search(filters, "brand", scores)
+            if filters.text and scores is None:
+                idxs = [i for i in idxs if filters.matches(items[i])]
+            return idxs
+        candidates = self._candidates(filters, scores)
+        pool = range(len(items)) if candidates is None else candidates
+        check_text = scores is None
+        return [i for i in pool if filters.matches(items[i], check_text)]
+
+    # ---------- Facets ----------
+    @property
+    def facet_index(self) -> FacetIndex:
+        """Per-facet bucket codes, built on first use."""
+        index = self._facet_index
+        if index is None:
+            index = self._facet_index = FacetIndex(self.items)
+        return index
+
+    def facets(self, filters: SearchFilters) -> Dict[str, Any]:
+        """`{"total", "facets"}` for `filters`; each facet ignores its own filter (cached per filter set)."""
+        cached = self._facet_cache.get(filters)
+        if cached is not None:
+            return cached
+        index = self.facet_index
+        selections: Dict[SearchFilters, Optional[List[int]]] = {}
+
+        def select(f: SearchFilters) -> Optional[List[int]]:
+            if f not in selections:
+                selections[f] = None if f == _NO_FILTERS else self.match_indices(f)
+            return selections[f]
+
+        out: Dict[str, Any] = {}
+        for name in FACETS:
+            relaxed = replace(filters, **{f: None for f in OWN_FILTERS[name]})
+            out[name] = index.describe(name, index.counts(name, select(relaxed)))
+        matched = select(filters)
+        cached = {"total": len(self.items) if matched is None else len(matched), "facets": out}
+        if len(self._facet_cache) >= FACET_CACHE_SIZE:
+            self._facet_cache.pop(next(iter(self._facet_cache), None), None)
+        self._facet_cache[filters] = cached
+        return cached
+
+    def iter_search(self, filters: SearchFilters, sort: Optional[str] = None) -> Iterator[Subwoofer]:
+        """Lazily yield `search(filters, sort)` results without building the result list.
+
+        Text queries are resolved through the index first (their hit set is small).
+        """
+        if filters.text:
+            yield from self.search(filters, sort)
+            return
+        items = self.items
+        for i in self._order(sort if sort in ("price", "rms", "size") else "brand"):
+            if filters.matches(items[i]):
+                yield items[i]
+
+    def _search_columnar(self, cols: columnar.ColumnarIndex, filters: SearchFilters,
+                         sort: Optional[str], view_name: str) -> List[Subwoofer]:
+        items = self.items
+        scores = self.text_index.search(filters.text) if filters.text else None
+        ordered = cols.search(filters, view_name, scores)
+        if scores is not None:
+            if sort in (None, "relevance"):
+                # Stable sort over view order = relevance, ties in view order
+                ordered.sort(key=lambda i: -scores[i])
+            return [items[i] for i in ordered]
+        if filters.text:  # no indexable tokens: plain substring test
+            return [items[i] for i in ordered if filters.matches(items[i])]
+        return [items[i] for i in ordered]
+
+    # ---------- Serialization ----------
+    def encoded(self, items: Iterable[Subwoofer], cache: bool = True) -> List[bytes]:
+        """Compact JSON bytes per record, cached for records belonging to this snapshot.
+
+        `cache=False` reuses cached bytes but does not store new ones (full exports).
+        """
+        urls = self.url_index()
+        mine = self.items
+        encoded = self._encoded
+        out: List[bytes] = []
+        for it in items:
+            idx = urls.get(it.url)
+            if idx is None or mine[idx] is not it:
+                out.append(serialize.encode_record(it))  # not ours (e.g. fresh SQL row)
+                continue
+            frag = encoded.get(idx)
+            if frag is None:
+                frag = serialize.encode_record(it)
+                if cache:
+                    encoded[idx] = frag
+            out.append(frag)
+        return out
+
+    def inherit_encodings(self, prev: "CatalogSnapshot") -> None:
+        """Reuse `prev`'s cached bytes for record objects carried over unchanged."""
+        cached = dict(prev._encoded)
+        if not cached or isinstance(self.items, binsnap.SnapshotRecords):
+            return  # mapped records are all fresh objects
+        by_id = {id(prev.items[i]): frag for i, frag in cached.items()}
+        for idx, it in enumerate(self.items):
+            frag = by_id.get(id(it))
+            if frag is not None:
+                self._encoded[idx] = frag
+
+    # ---------- Keyset pagination ----------
+    def url_index(self) -> Dict[str, int]:
+        """url -> item index (last occurrence wins)."""
+        index = self._url_index
+        if index is None:
+            index = self._url_index = {it.url: i for i, it in enumerate(self.items)}
+        return index
+
+    def dedup_index(self) -> dedup.DedupIndex:
+        """Rows by URL / dedup block / offered URL, for folding upserts into stored products."""
+        index = self._dedup_index
+        if index is None:
+            index = self._dedup_index = dedup.DedupIndex(self.items)
+        return index
+
+    def _ordering(self, filters: SearchFilters, sort: Optional[str]) -> str:
+        if filters.text and sort in (None, "relevance") and self.text_index.search(filters.text) is not None:
+            return "relevance"
+        return sort if sort in ("price", "rms", "size") else "brand"
+
+    def _sort_key(self, ordering: str, idx: int, scores: Optional[Dict[int, float]] = None) -> Tuple[Any, ...]:
+        item = self.items[idx]
+        if ordering == "relevance":
+            return (-scores[idx],) + VIEW_KEYS["brand"](item)
+        return tuple(VIEW_KEYS[ordering](item))
+
+    def cursor_key(self, filters: SearchFilters, sort: Optional[str], item: Subwoofer) -> Optional[Tuple[Any, ...]]:
+        """Sort key of `item` in the order `search(filters, sort)` returns (None if not in this snapshot)."""
+        idx = self.url_index().get(item.url)
+        if idx is None:
+            return None
+        ordering = self._ordering(filters, sort)
+        scores = self.text_index.search(filters.text) if ordering == "relevance" else None
+        if scores is not None and idx not in scores:
+            return None
+        return self._sort_key(ordering, idx, scores)
+
+    def page_after(self, filters: SearchFilters, sort: Optional[str], after: Optional[Tuple[Tuple[Any, ...], str]],
+                   limit: int) -> Tuple[List[Subwoofer], Optional[Tuple[Any, ...]]]:
+        """Keyset page: up to `limit` matches following `after` = (sort key, url).
+
+        Resumes right after the `after` record when it is still present with
+        the same key, otherwise strictly after the key, which ends with the
+        record's URL: a deleted or re-keyed boundary row neither repeats nor
+        skips its ties. Without a text query only the
+        rows after the resume point are scanned. Returns (page, key of the last
+        row or None when there is nothing further).
+        """
+        items = self.items
+        ordering = self._ordering(filters, sort)
+        urls = self.url_index()
+        if filters.text:
+            # Text hits are few: materialize them in result order and bisect on their keys.
+            scores = self.text_index.search(filters.text) if ordering == "relevance" else None
+            idxs = [urls[it.url] for it in self.search(filters, sort)]
+            keys = [self._sort_key(ordering, i, scores) for i in idxs]
+            start = 0
+            if after is not None:
+                key, url = after
+                j = urls.get(url)
+                hit = {i: n for n, i in enumerate(idxs)}.get(j) if j is not None else None
+                if hit is not None and keys[hit] == key:
+                    start = hit + 1
+                else:
+                    start = bisect.bisect_right(keys, key)
+            chosen = idxs[start:start + limit + 1]
+        else:
+            scores = None
+            order = self._order(ordering)
+            start = 0
+            if after is not None:
+                key, url = after
+                j = urls.get(url)
+                if j is not None and self._sort_key(ordering, j) == key:
+                    start = self._position(ordering)[j] + 1
+                else:
+                    start = bisect.bisect_right(self._keys(ordering), key)
+            cols = self.columnar_index()
+            if cols is not None:
+                rest = cols.order(ordering)[start:]
+                chosen = rest[cols.mask(filters)[rest]][:limit + 1].tolist()
+            else:
+                chosen = []
+                for i in order[start:]:
+                    if filters.matches(items[i]):
+                        chosen.append(i)
+                        if len(chosen) > limit:
+                            break
+        more = len(chosen) > limit
+        chosen = chosen[:limit]
+        next_key = self._sort_key(ordering, chosen[-1], scores) if more and chosen else None
+        return [items[i] for i in chosen], next_key
+
+    def _keys(self, name: str) -> List[Any]:
+        keys = self._view_keys.get(name)
+        if keys is None:
+            key = VIEW_KEYS[name]
+            items = self.items
+            keys = self._view_keys[name] = [tuple(key(items[i])) for i in self._order(name)]
+        return keys
+
+
+def _to_items(records: List[Dict[str, Any]]) -> List[Subwoofer]:
+    # Full and lite shapes share one record type; only malformed entries are skipped.
+    items: List[Subwoofer] = []
+    for d in records:
+        try:
+            items.append(from_any(d))
+        except (TypeError, ValueError):
+            continue
+    return items
+
+
+def file_sig(path: Path) -> Tuple[int, int]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return (0, 0)
+    return (st.st_mtime_ns, st.st_size)
+
+
+class Catalog:
+    """Loads one JSON catalog (base file + upsert log) lazily and serves cached snapshots.
+
+    The signature covers the base file, the live log and an in-flight
+    compaction file. When only the log grew, just the new tail is replayed onto
+    the previous snapshot instead of re-parsing the base file.
+
+    Subclasses may override `_stat()` (cheap change signature) and `_load()`
+    to cache a different backing store the same way.
+    """
+
+    binary_snapshot = True  # read `binsnap` snapshots when they match the base file
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.log_path = wal.log_path_for(self.path)
+        self.compacting_path = wal.compacting_path_for(self.path)
+        self._lock = threading.RLock()
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._version = 0
+        self._log_offset = 0
+        self._log_current = True  # False: the log read last was stamped for another base file
+
+    def stat(self) -> Optional[Signature]:
+        """Current change signature of the backing store (no data is read)."""
+        return self._stat()
+
+    def _stat(self) -> Optional[Signature]:
+        # base(2) + log(2) + compacting(2) + cross-process write version(1)
+        sig = (file_sig(self.path) + file_sig(self.log_path) + file_sig(self.compacting_path)
+               + (read_version(self.path),))
+        return sig if any(sig) else None
+
+    def _load(self, sig: Optional[Signature]) -> Sequence[Subwoofer]:
+        if sig is None:
+            self._log_offset = 0
+            return []
+        prev = self._snapshot
+        if (prev is not None and prev.signature is not None
+                and prev.signature[:2] == sig[:2]  # base file unchanged
+                and not any(prev.signature[4:6]) and not any(sig[4:6])  # no compaction involved
+                and self._log_current and sig[3] >= self._log_offset):
+            # Log only grew: replay the new tail onto the previous snapshot.
+            ops, offset = wal.read_ops(self.log_path, self._log_offset)
+            if self._log_offset or wal.is_current(self.path, ops):
+                self._log_offset = offset
+                by_url: Dict[Any, Any] = {i.url: i for i in prev.items}
+                wal.apply_ops(by_url, ops, convert=from_any)
+                return list(by_url.values())
+        mapped = binsnap.open_snapshot(self.path, sig[:2]) if self.binary_snapshot else None
+        compacting_ops, _ = wal.read_ops(self.compacting_path)
+        ops, self._log_offset = wal.read_ops(self.log_path)
+        # Logs stamped for an earlier base file (restored / rewritten since) are ignored
+        if not wal.is_current(self.path, compacting_ops):
+            compacting_ops = []
+        self._log_current = wal.is_current(self.path, ops)
+        if not self._log_current:
+            ops = []
+        if mapped is not None and not compacting_ops and not ops:
+            return mapped  # O(1): records decode lazily from the mapped file
+        if mapped is not None:
+            by_url = {i.url: i for i in mapped}
+        else:
+            by_url = {d.get("url"): d for d in wal.read_base(self.path)}
+        wal.apply_ops(by_url, compacting_ops)
+        wal.apply_ops(by_url, ops)
+        return _to_items(list(by_url.values()))
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Return the current snapshot, reloading if the files changed on disk."""
+        sig = self._stat()
+        snap = self._snapshot
+        if snap is not None and snap.signature == sig:
+            return snap
+        with self._lock:
+            sig = self._stat()
+            snap = self._snapshot
+            if snap is not None and snap.signature == sig:
+                return snap
+            return self._install(self._load(sig), sig)
+
+    def replace(self, items: Iterable[Any]) -> CatalogSnapshot:
+        """Install `items` as the complete current state after the caller wrote them to disk."""
+        records = [coerce_subwoofer(i) for i in items]
+        with self._lock:
+            sig = self._stat()
+            self._log_offset = sig[3] if sig else 0
+            self._log_current = True
+            return self._install(records, sig)
+
+    def invalidate(self) -> None:
+        """Drop the cached snapshot; the next access reloads from disk."""
+        with self._lock:
+            self._snapshot = None
+
+    def _install(self, items: Sequence[Subwoofer], sig: Optional[Signature]) -> CatalogSnapshot:
+        self._version += 1
+        snap = CatalogSnapshot(items, sig, self._version)
+        prev = self._snapshot
+        if prev is not None:
+            # Upserted records are new objects, so only unchanged ones keep their bytes and rank keys.
+            snap.inherit_encodings(prev)
+            snap.inherit_rank_keys(prev)
+        self._snapshot = snap
+        return snap
+
+
+_CATALOGS: Dict[str, Catalog] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_catalog(path: Path) -> Catalog:
+    """Return the process-wide catalog for `path` (one instance per absolute path)."""
+    key = os.path.abspath(path)
+    cat = _CATALOGS.get(key)
+    if cat is None:
+        with _REGISTRY_LOCK:
+            cat = _CATALOGS.get(key)
+            if cat is None:
+                cat = _CATALOGS[key] = Catalog(Path(path))
+    return cat
+
+
+__all__ = ["Catalog", "CatalogSnapshot", "SearchFilters", "VIEW_KEYS", "coerce_subwoofer", "file_sig", "get_catalog"]
@@ -0,0 +1,248 @@
+"""Change feed for the subwoofer catalog, shared by all worker processes.
+
+Every store write (`replace_all`, `upsert`, lite `merge`, and therefore
+`save_db` / purge / dedupe) publishes the records it inserted or changed as
+`upsert` events and the URLs it dropped as `delete` events. Events are
+appended to `subwoofers.changes.jsonl` next to the catalog under the store's
+write lock, so sequence numbers are global across `UVICORN_WORKERS`
+processes and survive restarts. Each process tails the file into a bounded
+ring buffer (`collections.deque(maxlen=SUBWOOFER_CHANGES_BUFFER)`); the file
+is rewritten down to the buffer once it holds twice as many events. Clients
+follow `/subwoofers/changes` (SSE, or `?since=<version>` JSON) instead of
+re-polling the picker / size endpoints.
+
+A client whose `since` fell out of the buffer (or is ahead of the file, e.g.
+after it was deleted) gets `reset`, meaning: refetch the catalog, then follow
+from the returned version. Waiting streams are woken at once by writes in
+their own process and within `POLL_INTERVAL` seconds by other workers.
+"""
+from __future__ import annotations
+import asyncio, json, os, threading, time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from app.core.atomic import atomic_write_text
+from app.models.subwoofer import Subwoofer, from_any
+from . import wal
+
+OP_UPSERT = "upsert"
+OP_DELETE = "delete"
+DEFAULT_CAPACITY = 1024
+POLL_INTERVAL = 1.0  # seconds between checks for events written by other processes
+
+
+def changes_path_for(base: Path) -> Path:
+    """`data/subwoofers.json` -> `data/subwoofers.changes.jsonl`."""
+    return base.with_suffix(".changes.jsonl")
+
+
+@dataclass(frozen=True, slots=True)
+class Change:
+    seq: int
+    op: str
+    url: str
+    record: Optional[Subwoofer]  # None for deletes
+    at: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "seq": self.seq,
+            "op": self.op,
+            "url": self.url,
+            "at": self.at,
+            "item": self.record.to_dict() if self.record is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Change":
+        item = data.get("item")
+        return cls(int(data["seq"]), data["op"], data["url"], from_any(item) if item else None, float(data["at"]))
+
+
+Diff = Tuple[str, str, Optional[Subwoofer], Optional[Subwoofer]]  # op, url, record, previous record
+
+
+def diff(before: Sequence[Subwoofer], after: Sequence[Subwoofer], urls: Optional[Iterable[str]] = None) -> List[Diff]:
+    """(op, url, record, previous) for records that differ between two catalog states.
+
+    With `urls`, only those records are compared (upserts and bulk deletes);
+    otherwise the whole catalog is, in `after` order followed by deletes.
+    """
+    old = {r.url: r for r in before}
+    out: List[Diff] = []
+    if urls is not None:
+        new = {r.url: r for r in after}
+        for u in dict.fromkeys(urls):
+            if u in new:
+                if old.get(u) != new[u]:
+                    out.append((OP_UPSERT, u, new[u], old.get(u)))
+            elif u in old:
+                out.append((OP_DELETE, u, None, old[u]))
+        return out
+    seen: Set[str] = set()
+    for r in after:
+        seen.add(r.url)
+        prev = old.get(r.url)
+        if prev is not r and prev != r:
+            out.append((OP_UPSERT, r.url, r, prev))
+    out.extend((OP_DELETE, u, None, prev) for u, prev in old.items() if u not in seen)
+    return out
+
+
+class ChangeFeed:
+    """Bounded ring buffer of catalog changes; thread-safe, awaitable from any event loop.
+
+    With `path` the events are persisted to that JSON-lines file and events
+    appended by other processes are read back from it, so `publish` must run
+    under the store's write lock. Without, the feed is process-local.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, path: Optional[Path] = None):
+        self.path = Path(path) if path is not None else None
+        self._events: Deque[Change] = deque(maxlen=max(0, capacity))
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+        self._file = (0, 0)  # (inode, offset) of the events file read so far
+        self._lines = 0  # events in the file
+
+    @property
+    def version(self) -> int:
+        """Sequence number of the newest event (0 before the first write)."""
+        with self._lock:
+            self._refresh()
+            return self._seq
+
+    @property
+    def capacity(self) -> int:
+        return self._events.maxlen or 0
+
+    def resize(self, capacity: int) -> None:
+        capacity = max(0, capacity)
+        with self._lock:
+            if capacity != self._events.maxlen:
+                self._events = deque(self._events, maxlen=capacity)
+
+    def _refresh(self) -> None:
+        """Tail events appended to the file since the last read (call with `_lock` held)."""
+        if self.path is None:
+            return
+        try:
+            st = self.path.stat()
+            inode, size = st.st_ino, st.st_size
+        except OSError:
+            inode, size = 0, 0
+        known, offset = self._file
+        if inode != known or size < offset:  # trimmed, replaced or removed: reread
+            self._events.clear()
+            self._seq = self._lines = offset = 0
+        if size > offset:
+            ops, offset = wal.read_ops(self.path, offset)
+            for op in ops:
+                try:
+                    change = Change.from_dict(op)
+                except (KeyError, TypeError, ValueError):
+                    continue
+                self._events.append(change)
+                self._seq = max(self._seq, change.seq)
+            self._lines += len(ops)
+        self._file = (inode, offset)
+
+    def _persist(self, changes: List[Change]) -> None:
+        """Append own events to the file; trim it to the buffer once it holds twice as many."""
+        wal.append_ops(self.path, [c.to_dict() for c in changes])
+        self._lines += len(changes)
+        if self._lines > 2 * max(self.capacity, 1):
+            atomic_write_text(self.path, "".join(json.dumps(e.to_dict(), separators=(",", ":")) + "\n"
+                                                 for e in self._events))
+            self._lines = len(self._events)
+        st = self.path.stat()  # the write lock keeps other processes from appending meanwhile
+        self._file = (st.st_ino, st.st_size)
+
+    def publish(self, changes: Iterable[Tuple[Any, ...]]) -> int:
+        """Append (op, url, record, ...) events and wake waiting streams; returns the new version."""
+        now = time.time()
+        with self._lock:
+            self._refresh()
+            new: List[Change] = []
+            for op, url, record, *_ in changes:
+                self._seq += 1
+                new.append(Change(self._seq, op, url, record, now))
+            self._events.extend(new)
+            if new and self.path is not None:
+                self._persist(new)
+            seq, waiters = self._seq, list(self._waiters)
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:  # loop already closed
+                pass
+        return seq
+
+    def since(self, seq: int) -> Tuple[List[Change], bool]:
+        """Events after `seq` and whether they are complete (False: client must reset)."""
+        with self._lock:
+            self._refresh()
+            events = list(self._events)
+            current = self._seq
+        if seq > current:
+            return [], False  # version the feed no longer knows (events file removed)
+        if seq == current:
+            return [], True
+        oldest = events[0].seq if events else current + 1
+        if seq < oldest - 1:
+            return [], False  # fell out of the buffer
+        return [e for e in events if e.seq > seq], True
+
+    async def wait(self, seq: int, timeout: float) -> bool:
+        """Wait until an event newer than `seq` exists; False on timeout.
+
+        Own-process writes wake the waiter directly; other processes' writes
+        are picked up by re-reading the file every `POLL_INTERVAL` seconds.
+        """
+        if self.version > seq:
+            return True
+        loop = asyncio.get_running_loop()
+        entry = (loop, asyncio.Event())
+        with self._lock:
+            self._waiters.add(entry)
+        deadline = loop.time() + timeout
+        try:
+            while self.version <= seq:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return False
+                interval = remaining if self.path is None else min(remaining, POLL_INTERVAL)
+                try:
+                    await asyncio.wait_for(entry[1].wait(), interval)
+                except asyncio.TimeoutError:
+                    pass
+                entry[1].clear()
+            return True
+        finally:
+            with self._lock:
+                self._waiters.discard(entry)
+
+
+_FEEDS: Dict[str, ChangeFeed] = {}
+_FEEDS_LOCK = threading.Lock()
+
+
+def get_feed(path: Path) -> ChangeFeed:
+    """Process-wide feed for the store backed by `path` (events persisted next to it)."""
+    key = os.path.abspath(path)
+    feed = _FEEDS.get(key)
+    if feed is None:
+        with _FEEDS_LOCK:
+            feed = _FEEDS.get(key)
+            if feed is None:
+                feed = _FEEDS[key] = ChangeFeed(path=changes_path_for(Path(path)))
+    return feed
+
+
+__all__ = [
+    "Change", "ChangeFeed", "DEFAULT_CAPACITY", "Diff", "OP_DELETE", "OP_UPSERT", "POLL_INTERVAL", "changes_path_for",
+    "diff", "get_feed",
+]
@@ -0,0 +1,120 @@
+"""Optional NumPy columnar mode for catalog search.
+
+`SearchFilters.matches()` runs up to seven Python conditionals per record per
+request. When NumPy is installed, large snapshots also keep their numeric
+fields as float64 columns (NaN = missing) and evaluate a filter set as a few
+boolean masks; view orders are computed once per snapshot with `np.lexsort`. Low-cardinality string filters (`brand`,
+`box_type`) are resolved against the distinct values first and applied as an
+integer-code mask, and the result is read off a cached view-order array as
+`order[mask[order]]`, so no per-record Python and no per-request sort run on
+the hot path.
+
+Semantics are exactly those of `matches()` (missing numbers count as 0 for
+min/max, missing impedance/recommended_box never exclude); the free-text
+filter stays with `TextIndex`. Without NumPy, `available()` is False and the
+catalog uses its pure-Python path.
+
+    pip install numpy   # enables columnar mode
+    python scripts/bench_catalog_search.py
+"""
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore
+
+NUMERIC_FIELDS = (
+    "size_in", "rms_w", "peak_w", "impedance_ohm", "sensitivity_db",
+    "price_usd", "displacement_cuft", "mounting_depth_in",
+)
+_IMPEDANCE_TOLERANCE = 0.01  # same as SearchFilters.matches
+
+
+def available() -> bool:
+    return np is not None
+
+
+def _codes(values: Iterable[Optional[str]]):
+    """Map lowercased strings to (int codes array, distinct values list)."""
+    lookup: Dict[str, int] = {}
+    codes = [lookup.setdefault((v or "").lower(), len(lookup)) for v in values]
+    return np.asarray(codes, dtype=np.int32), list(lookup)
+
+
+class ColumnarIndex:
+    """Column arrays + sort ranks for one immutable snapshot."""
+
+    def __init__(self, items: Sequence[Any], brand_order: Sequence[int]):
+        if np is None:
+            raise RuntimeError("numpy is required for the columnar catalog mode")
+        n = len(items)
+        self.size = n
+        self.columns: Dict[str, Any] = {
+            f: np.array([getattr(it, f) for it in items], dtype=np.float64) for f in NUMERIC_FIELDS
+        }
+        # `(value or 0)` as used by the min/max filters
+        self._zero_filled = {f: np.nan_to_num(self.columns[f], nan=0.0) for f in ("size_in", "rms_w")}
+        self._brand_codes, self._brands = _codes(it.brand for it in items)
+        self._box_codes, self._boxes = _codes(it.recommended_box for it in items)
+        self._orders: Dict[str, Any] = {"brand": np.asarray(brand_order, dtype=np.int64)}
+        self._urls = [it.url for it in items]
+        self._url_rank = None
+
+    def order(self, view: str):
+        """Record indices in `view` order (brand order comes from the snapshot)."""
+        order = self._orders.get(view)
+        if order is None:
+            # Mirrors catalog.VIEW_KEYS, URL rank last as the tie-breaker.
+            col = self.columns[{"price": "price_usd", "rms": "rms_w", "size": "size_in"}[view]]
+            missing = np.isnan(col)
+            unset = missing | (col == 0)
+            if view == "price":
+                secondary = np.where(unset, np.inf, col)  # price_usd or inf
+            else:
+                secondary = -np.where(unset, -1.0, col)  # -(value or -1), descending
+            order = self._orders[view] = np.lexsort((self._url_ranks(), secondary, missing))
+        return order
+
+    def _url_ranks(self):
+        if self._url_rank is None:
+            rank = np.empty(self.size, dtype=np.int64)
+            rank[np.argsort(np.asarray(self._urls, dtype=str), kind="stable")] = np.arange(self.size)
+            self._url_rank = rank
+        return self._url_rank
+
+    def mask(self, filters: Any):
+        """Boolean mask of records passing every non-text filter."""
+        m = np.ones(self.size, dtype=bool)
+        for field, lo, hi in filters.ranges():
+            col = self._zero_filled[field]
+            if lo != -np.inf:
+                m &= col >= lo
+            if hi != np.inf:
+                m &= col <= hi
+        if filters.impedance_ohm:
+            col = self.columns["impedance_ohm"]
+            with np.errstate(invalid="ignore"):
+                m &= np.isnan(col) | (col == 0) | (np.abs(col - filters.impedance_ohm) <= _IMPEDANCE_TOLERANCE)
+        if filters.brand:
+            token = filters.brand.lower()
+            m &= np.isin(self._brand_codes, [c for c, b in enumerate(self._brands) if token in b])
+        if filters.box_type:
+            token = filters.box_type.lower()
+            # Missing/empty recommended_box never excludes.
+            m &= np.isin(self._box_codes, [c for c, b in enumerate(self._boxes) if not b or token in b])
+        return m
+
+    def search(self, filters: Any, view: str, candidates: Optional[Iterable[int]] = None) -> List[int]:
+        """Return indices passing `filters` (restricted to `candidates`), in `view` order."""
+        m = self.mask(filters)
+        if candidates is not None:
+            keep = np.zeros(self.size, dtype=bool)
+            keep[np.fromiter(candidates, dtype=np.int64)] = True
+            m &= keep
+        order = self.order(view)
+        return order[m[order]].tolist()
+
+
+__all__ = ["ColumnarIndex", "NUMERIC_FIELDS", "available"]
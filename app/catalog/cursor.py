@@ -0,0 +1,46 @@
+"""Opaque keyset-pagination cursors for `/subwoofers` search.
+
+A cursor is URL-safe base64 of a small JSON object:
+- `k`: sort key of the last returned record, ending with its URL (see `CatalogSnapshot.cursor_key`)
+- `u`: URL of that record (exact resume point when it is still present)
+- `v`: catalog snapshot version the page was served from (informational;
+  resuming never depends on it, so cursors survive `save_db` and other workers)
+- `f`: fingerprint of the filters + sort the cursor was issued for
+
+Clients must treat the token as opaque and send it back unchanged.
+"""
+from __future__ import annotations
+import base64, hashlib, json
+from dataclasses import astuple
+from typing import Any, Dict, Optional, Tuple
+
+
+class InvalidCursor(ValueError):
+    """Raised for tokens that are malformed or were issued for other filters."""
+
+
+def filters_fingerprint(filters: Any, sort: Optional[str]) -> str:
+    raw = json.dumps([list(astuple(filters)), sort or ""], default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def encode_cursor(key: Tuple[Any, ...], url: str, version: int, fingerprint: str) -> str:
+    payload = json.dumps({"k": list(key), "u": url, "v": version, "f": fingerprint}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, fingerprint: str) -> Dict[str, Any]:
+    """Return `{"key", "url", "version"}`; raises `InvalidCursor`."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        data = json.loads(raw)
+        key, url = tuple(data["k"]), str(data["u"])
+        version, fp = int(data.get("v", 0)), data.get("f")
+    except Exception as exc:
+        raise InvalidCursor("malformed cursor") from exc
+    if fp != fingerprint:
+        raise InvalidCursor("cursor was issued for different filters or sort")
+    return {"key": key, "url": url, "version": version}
+
+
+__all__ = ["InvalidCursor", "decode_cursor", "encode_cursor", "filters_fingerprint"]
@@ -0,0 +1,251 @@
+"""Cross-retailer near-duplicate detection for the catalog.
+
+The same driver scraped from several retailers used to land as one row per
+URL. `dedupe()` clusters such rows and keeps one canonical record per
+product, with every retailer listing kept as an `Offer` (source, url, price,
+scraped_at) on it.
+
+1. Normalize: brand -> alias-folded alnum key (`text_index.BRAND_ALIASES`);
+   model -> lowercase alnum tokens with trademark marks, the brand, nominal
+   size (`12"`, `12-inch`) and filler words ("subwoofer", "dual voice coil")
+   removed, e.g. `Rockford Fosgate P3D4-12 12" Subwoofer` -> `p3d412`.
+2. Block on (brand key, first 3 model-key characters) so only plausible pairs
+   are compared.
+3. Within a block, two records are the same product when they come from
+   different sources, their model keys are near-identical
+   (`difflib` ratio >= MODEL_SIMILARITY) and their size / impedance / RMS
+   specs do not contradict each other.
+4. The canonical record is the cluster's richest member (most fields set);
+   gaps are filled from the others and `offers` lists every member's listing
+   (newest per URL, cheapest first).
+
+Single listings pass through unchanged, so running it over a deduplicated
+catalog is a no-op apart from refreshing the canonical record's own offer.
+
+The stores apply it on every write (`SUBWOOFER_DEDUPE=0` disables): full
+rewrites run `dedupe()`; upserts run `fold()` over just the stored rows the new
+records could duplicate (same block, same URL, or listing them as an offer,
+see `DedupIndex`). Both keep an already stored canonical row's URL, so a
+product's URL does not move when a richer listing from another retailer
+arrives; that listing becomes one of its offers.
+"""
+from __future__ import annotations
+import re
+from dataclasses import replace
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Collection, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.models.subwoofer import FIELD_NAMES, Offer, Subwoofer, from_any
+from .text_index import BRAND_ALIASES
+
+MODEL_SIMILARITY = 0.9
+RMS_TOLERANCE = 0.2  # relative; retailers round or quote different ratings
+_MARKS = re.compile(r"[®™©]")
+_SIZE = re.compile(r"\b\d+(?:\.\d+)?\s*(?:\"|''|-?\s*inch(?:es)?\b|-?\s*in\b)")
+_TOKEN = re.compile(r"[^\W_]+")
+_FILLER = frozenset({
+    "subwoofer", "subwoofers", "sub", "woofer", "car", "single", "dual", "voice", "coil", "svc", "dvc",
+    "ohm", "ohms", "series", "speaker", "driver", "component",
+})
+# Fields copied from other members only where the canonical record has none
+_FILL_FIELDS = tuple(f for f in FIELD_NAMES if f not in ("source", "url", "price_usd", "scraped_at", "offers"))
+
+
+def brand_key(brand: Optional[str]) -> str:
+    joined = "".join(_TOKEN.findall(_MARKS.sub(" ", brand or "").lower()))
+    alias = BRAND_ALIASES.get(joined)
+    return "".join(alias) if alias else joined
+
+
+def model_key(model: Optional[str], brand: Optional[str] = None) -> str:
+    text = _SIZE.sub(" ", _MARKS.sub(" ", model or "").lower())
+    skip = set(_TOKEN.findall((brand or "").lower())) | _FILLER
+    return "".join(t for t in _TOKEN.findall(text) if t not in skip)
+
+
+@lru_cache(maxsize=1 << 16)
+def _block(brand: Optional[str], model: Optional[str]) -> Optional[str]:
+    key = model_key(model, brand)
+    return f"{brand_key(brand)}:{key[:3]}" if key else None
+
+
+def block_key(r: Subwoofer) -> Optional[str]:
+    """Blocking key (brand key, first 3 model-key characters); None when the model has no key."""
+    return _block(r.brand, r.model)
+
+
+def _close(a: Optional[float], b: Optional[float], rel: float) -> bool:
+    if not a or not b:
+        return True  # missing values never contradict
+    return abs(a - b) <= rel * max(abs(a), abs(b))
+
+
+def same_product(a: Subwoofer, b: Subwoofer, key_a: str, key_b: str) -> bool:
+    """Similarity check for two records of one block."""
+    if a.source == b.source or not key_a or not key_b:
+        return False
+    if a.size_in and b.size_in and round(a.size_in) != round(b.size_in):
+        return False
+    if not _close(a.impedance_ohm, b.impedance_ohm, 0.01) or not _close(a.rms_w, b.rms_w, RMS_TOLERANCE):
+        return False
+    return key_a == key_b or SequenceMatcher(None, key_a, key_b).ratio() >= MODEL_SIMILARITY
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def clusters(records: Sequence[Subwoofer]) -> List[List[int]]:
+    """Index groups of records judged to be the same product (singletons included), in first-seen order."""
+    keys = [model_key(r.model, r.brand) for r in records]
+    blocks: Dict[str, List[int]] = {}
+    for i, r in enumerate(records):
+        block = block_key(r)
+        if block:
+            blocks.setdefault(block, []).append(i)
+    parent = list(range(len(records)))
+    # Cluster-level constraints, so records with missing specs cannot bridge
+    # two listings from one retailer or two different sizes into one product.
+    sources = [{r.source} for r in records]
+    sizes = [{round(r.size_in)} if r.size_in else set() for r in records]
+    # A re-crawled listing already folded into a canonical record's offers rejoins it by URL.
+    offered = {o.url: i for i, r in enumerate(records) for o in (r.offers or ()) if o.url != r.url}
+    for j, r in enumerate(records):
+        i = offered.get(r.url)
+        if i is not None and _find(parent, i) != _find(parent, j):
+            ri, rj = _find(parent, i), _find(parent, j)
+            parent[rj] = ri
+            sources[ri] |= sources[rj]
+            sizes[ri] |= sizes[rj]
+    for members in blocks.values():
+        for n, i in enumerate(members):
+            for j in members[n + 1:]:
+                ri, rj = _find(parent, i), _find(parent, j)
+                if ri == rj or sources[ri] & sources[rj] or len(sizes[ri] | sizes[rj]) > 1:
+                    continue
+                if same_product(records[i], records[j], keys[i], keys[j]):
+                    parent[rj] = ri
+                    sources[ri] |= sources[rj]
+                    sizes[ri] |= sizes[rj]
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(records)):
+        groups.setdefault(_find(parent, i), []).append(i)
+    return sorted(groups.values(), key=lambda g: g[0])
+
+
+def _own_offer(r: Subwoofer) -> Offer:
+    return Offer(r.source, r.url, r.price_usd, r.scraped_at)
+
+
+def _offers(members: Iterable[Subwoofer]) -> Tuple[Offer, ...]:
+    by_url: Dict[str, Offer] = {}
+    for r in members:
+        for offer in (r.offers or ()) + (_own_offer(r),):
+            known = by_url.get(offer.url)
+            if known is None or offer.scraped_at >= known.scraped_at:
+                by_url[offer.url] = offer
+    return tuple(sorted(by_url.values(), key=lambda o: (o.price_usd is None, o.price_usd or 0.0, o.source)))
+
+
+def _richness(r: Subwoofer) -> int:
+    return sum(getattr(r, f) is not None for f in _FILL_FIELDS) + len(r.offers or ())
+
+
+def canonical(members: Sequence[Subwoofer], prefer: Collection[str] = ()) -> Subwoofer:
+    """One record for a cluster: richest member, gaps filled, all listings as offers.
+
+    Members whose URL is in `prefer` (already stored canonical rows) win over
+    richer new listings, so a product keeps its URL.
+    """
+    if len(members) == 1:
+        only = members[0]
+        if not only.offers:
+            return only
+        return replace(only, offers=_offers(members))  # refresh its own listing
+    best = max([m for m in members if m.url in prefer] or members, key=_richness)  # first of equals wins
+    fill = {}
+    for f in _FILL_FIELDS:
+        if getattr(best, f) is None:
+            value = next((getattr(m, f) for m in members if getattr(m, f) is not None), None)
+            if value is not None:
+                fill[f] = value
+    return replace(best, offers=_offers(members), **fill)
+
+
+def dedupe(items: Iterable[object], prefer: Collection[str] = ()) -> List[Subwoofer]:
+    """Collapse cross-retailer duplicates; order follows each product's first listing.
+
+    `prefer`: URLs of stored canonical rows, kept as the canonical URL of their product.
+    """
+    records = [from_any(i) for i in items]
+    return [canonical([records[i] for i in group], prefer) for group in clusters(records)]
+
+
+def fold(incoming: Sequence[Subwoofer], stored: Sequence[Subwoofer]) -> Tuple[List[Subwoofer], List[str]]:
+    """Fold upserted records into the stored canonical rows they duplicate.
+
+    `stored` must hold every stored row the records may join (see
+    `DedupIndex.candidates`). Returns (rows to write, stored URLs to drop):
+    one row per product touched by `incoming`, under its stored canonical URL
+    when it has one, with the other members as offers. A record replacing its
+    own stored row keeps the offers folded into that row.
+    """
+    rows = {r.url: r for r in stored}
+    by_url: Dict[str, Subwoofer] = dict(rows)
+    for r in incoming:
+        prev = rows.get(r.url)
+        if prev is not None and prev.offers and not r.offers:
+            r = replace(r, offers=prev.offers)
+        by_url[r.url] = r
+    records = list(by_url.values())
+    touched = {r.url for r in incoming}
+    out: List[Subwoofer] = []
+    drop: List[str] = []
+    for group in clusters(records):
+        members = [records[i] for i in group]
+        if not any(m.url in touched for m in members):
+            continue  # stored product the write does not affect
+        canon = canonical(members, rows)
+        out.append(canon)
+        drop.extend(m.url for m in members if m.url != canon.url and m.url in rows)
+    return out, drop
+
+
+class DedupIndex:
+    """Stored rows by URL, by block and by the listing URLs in their offers."""
+
+    def __init__(self, records: Sequence[Subwoofer]):
+        self.records = records
+        self.by_url: Dict[str, int] = {}
+        self.blocks: Dict[str, List[int]] = {}
+        self.offered: Dict[str, int] = {}
+        for i, r in enumerate(records):
+            self.by_url[r.url] = i
+            block = block_key(r)
+            if block:
+                self.blocks.setdefault(block, []).append(i)
+            for o in r.offers or ():
+                if o.url != r.url:
+                    self.offered[o.url] = i
+
+    def candidates(self, incoming: Iterable[Subwoofer]) -> List[Subwoofer]:
+        """Stored rows `incoming` could join (see `fold`), in stored order."""
+        found = set()
+        for r in incoming:
+            for index in (self.by_url, self.offered):
+                if r.url in index:
+                    found.add(index[r.url])
+            block = block_key(r)
+            if block:
+                found.update(self.blocks.get(block, ()))
+        return [self.records[i] for i in sorted(found)]
+
+
+__all__ = [
+    "DedupIndex", "MODEL_SIMILARITY", "block_key", "brand_key", "canonical", "clusters", "dedupe", "fold", "model_key",
+    "same_product",
+]
@@ -0,0 +1,116 @@
+"""Facet counts for `/subwoofers/facets`.
+
+The picker UI used to download raw records to build its size / brand /
+impedance / RMS / price filters. `FacetIndex` precomputes, once per snapshot,
+an integer bucket code per record and facet, so a request only counts codes
+over the matching record indices (`np.bincount` when NumPy is installed).
+
+Counts are disjunctive: each facet is counted with the filters on *other*
+fields applied but its own filter dropped (see `OWN_FILTERS`), so the UI can
+show how many records every alternative value would give.
+"""
+from __future__ import annotations
+import bisect
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore
+
+FACETS = ("size", "brand", "impedance", "rms", "price")
+# Histogram lower edges; the last bucket is open-ended.
+RMS_EDGES = (0, 150, 300, 500, 750, 1000, 1500, 2000, 3000)
+PRICE_EDGES = (0, 50, 100, 150, 200, 300, 500, 750, 1000)
+# SearchFilters fields that constrain each facet
+OWN_FILTERS: Dict[str, Tuple[str, ...]] = {
+    "size": ("size_min", "size_max"),
+    "brand": ("brand",),
+    "impedance": ("impedance_ohm",),
+    "rms": ("rms_min", "rms_max"),
+    "price": (),
+}
+_HISTOGRAMS = {"rms": ("rms_w", RMS_EDGES), "price": ("price_usd", PRICE_EDGES)}
+
+
+def _histogram_bucket(value: Optional[float], edges: Sequence[float]) -> Optional[int]:
+    if value is None or value <= 0:  # matches the picker's "missing" semantics for 0 values
+        return None
+    return max(bisect.bisect_right(edges, value) - 1, 0)
+
+
+class FacetIndex:
+    """Per-facet bucket codes for one immutable snapshot (code `len(labels)` = missing)."""
+
+    def __init__(self, items: Sequence[Any]):
+        self.size = len(items)
+        self.labels: Dict[str, List[Any]] = {}
+        self.codes: Dict[str, Any] = {}
+        self._full: Dict[str, List[int]] = {}
+        self._encode("size", (int(round(it.size_in)) if it.size_in else None for it in items))
+        self._encode("impedance", (round(it.impedance_ohm, 2) if it.impedance_ohm else None for it in items))
+        # Brand buckets are case-insensitive; the label is the first spelling seen
+        spelling: Dict[str, str] = {}
+        keys = []
+        for it in items:
+            brand = (it.brand or "").strip()
+            key = brand.lower() or None
+            if key is not None:
+                spelling.setdefault(key, brand)
+            keys.append(key)
+        self._encode("brand", keys)
+        self.labels["brand"] = [spelling[k] for k in self.labels["brand"]]
+        for facet, (field, edges) in _HISTOGRAMS.items():
+            codes = [_histogram_bucket(getattr(it, field), edges) for it in items]
+            missing = len(edges)
+            self.labels[facet] = [(lo, edges[n + 1] if n + 1 < len(edges) else None) for n, lo in enumerate(edges)]
+            self._store(facet, [missing if c is None else c for c in codes])
+
+    def _encode(self, facet: str, values) -> None:
+        lookup: Dict[Any, int] = {}
+        raw = [None if v is None else lookup.setdefault(v, len(lookup)) for v in values]
+        self.labels[facet] = list(lookup)
+        missing = len(lookup)
+        self._store(facet, [missing if c is None else c for c in raw])
+
+    def _store(self, facet: str, codes: List[int]) -> None:
+        self.codes[facet] = np.asarray(codes, dtype=np.int64) if np is not None else codes
+
+    def counts(self, facet: str, indices: Optional[Sequence[int]] = None) -> List[int]:
+        """Records per bucket (last slot = missing) among `indices` (None = all records)."""
+        if indices is None and facet in self._full:
+            return self._full[facet]
+        codes = self.codes[facet]
+        width = len(self.labels[facet]) + 1
+        if np is not None:
+            picked = codes if indices is None else codes[np.asarray(indices, dtype=np.int64)]
+            out = np.bincount(picked, minlength=width).tolist()
+        else:
+            out = [0] * width
+            for i in (range(self.size) if indices is None else indices):
+                out[codes[i]] += 1
+        if indices is None:
+            self._full[facet] = out
+        return out
+
+    def describe(self, facet: str, counts: List[int]) -> List[Dict[str, Any]]:
+        """JSON-ready buckets; value facets list non-empty values, histograms every bucket."""
+        labels = self.labels[facet]
+        missing = counts[-1]
+        if facet in _HISTOGRAMS:
+            out = [{"min": lo, "max": hi, "count": c} for (lo, hi), c in zip(labels, counts)]
+            if missing:
+                out.append({"min": None, "max": None, "count": missing})
+            return out
+        pairs = [(v, c) for v, c in zip(labels, counts) if c]
+        if facet == "brand":
+            pairs.sort(key=lambda p: (-p[1], p[0].lower()))
+        else:
+            pairs.sort(key=lambda p: p[0])
+        out = [{"value": v, "count": c} for v, c in pairs]
+        if missing:
+            out.append({"value": None, "count": missing})
+        return out
+
+
+__all__ = ["FACETS", "FacetIndex", "OWN_FILTERS", "PRICE_EDGES", "RMS_EDGES"]
@@ -0,0 +1,127 @@
+"""Per-record price / spec history as timestamped deltas.
+
+Crawls overwrite `price_usd` and `scraped_at` in place, so the catalog only
+knows the latest observation. Every store write now also appends one line per
+changed record to `subwoofers.history.jsonl` next to the catalog, holding only
+the tracked fields that changed:
+
+    {"url": "...", "at": 1717000000.0, "changes": {"price_usd": 199.0}}
+    {"url": "...", "at": 1717100000.0, "removed": true}
+
+The first entry of a record carries all of its non-null tracked fields; `at`
+is the record's `scraped_at` (write time when unset). A re-crawl that only
+bumps `scraped_at` writes nothing, so the file grows with actual changes, not
+with crawls. Entries are written by `SubwooferStore.publishing()` under the
+store's write lock; `HistoryLog` tails the file (same JSON-lines helpers as
+`wal.py`) and keeps a url -> entries index for `/subwoofers/history` and
+`/subwoofers/price-drops`.
+"""
+from __future__ import annotations
+import os, threading, time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from . import wal
+from .changes import OP_DELETE, Diff
+
+TRACKED_FIELDS: Tuple[str, ...] = (
+    "price_usd", "rms_w", "peak_w", "size_in", "impedance_ohm", "sensitivity_db", "mounting_depth_in",
+    "cutout_diameter_in", "displacement_cuft", "recommended_box", "brand", "model",
+)
+
+
+def history_path_for(base: Path) -> Path:
+    """`data/subwoofers.json` -> `data/subwoofers.history.jsonl`."""
+    return base.with_suffix(".history.jsonl")
+
+
+def deltas(changes: Iterable[Diff], now: Optional[float] = None) -> List[Dict[str, Any]]:
+    """History entries for the (op, url, record, previous) tuples of one write."""
+    now = time.time() if now is None else now
+    out: List[Dict[str, Any]] = []
+    for op, url, record, previous in changes:
+        if op == OP_DELETE:
+            out.append({"url": url, "at": now, "removed": True})
+            continue
+        if previous is None:
+            changed = {f: getattr(record, f) for f in TRACKED_FIELDS if getattr(record, f) is not None}
+        else:
+            changed = {f: getattr(record, f) for f in TRACKED_FIELDS if getattr(record, f) != getattr(previous, f)}
+        if changed:
+            out.append({"url": url, "at": record.scraped_at or now, "changes": changed})
+    return out
+
+
+class HistoryLog:
+    """Append-only history file plus an in-memory url -> entries index (tailed on read)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._offset = 0
+        self._by_url: Dict[str, List[Dict[str, Any]]] = {}
+
+    def append(self, entries: List[Dict[str, Any]]) -> int:
+        return wal.append_ops(self.path, entries)
+
+    def _refresh(self) -> Dict[str, List[Dict[str, Any]]]:
+        with self._lock:
+            try:
+                size = self.path.stat().st_size
+            except OSError:
+                size = 0
+            if size < self._offset:  # replaced or truncated: rebuild
+                self._offset, self._by_url = 0, {}
+            if size > self._offset:
+                entries, self._offset = wal.read_ops(self.path, self._offset)
+                for e in entries:
+                    if isinstance(e.get("url"), str):
+                        self._by_url.setdefault(e["url"], []).append(e)
+            return self._by_url
+
+    def for_url(self, url: str) -> List[Dict[str, Any]]:
+        """Entries for one record, oldest first."""
+        return list(self._refresh().get(url, ()))
+
+    def price_drops(self, since: float) -> Dict[str, Tuple[float, float]]:
+        """url -> (price at `since`, current price) for records now cheaper than they were at `since`.
+
+        Records first seen (or re-added) after `since` have no earlier price and are skipped.
+        """
+        drops: Dict[str, Tuple[float, float]] = {}
+        for url, entries in self._refresh().items():
+            then = now = None
+            for e in entries:
+                if e.get("removed"):
+                    now = None
+                    if e["at"] <= since:
+                        then = None
+                    continue
+                changes = e.get("changes") or {}
+                if "price_usd" in changes:
+                    now = changes["price_usd"]
+                    if e["at"] <= since:
+                        then = now
+            if then is not None and now is not None and now < then:
+                drops[url] = (then, now)
+        return drops
+
+
+_LOGS: Dict[str, HistoryLog] = {}
+_LOGS_LOCK = threading.Lock()
+
+
+def get_history(base: Path) -> HistoryLog:
+    """Process-wide history log for the catalog whose base file is `base`."""
+    path = history_path_for(Path(base))
+    key = os.path.abspath(path)
+    log = _LOGS.get(key)
+    if log is None:
+        with _LOGS_LOCK:
+            log = _LOGS.get(key)
+            if log is None:
+                log = _LOGS[key] = HistoryLog(path)
+    return log
+
+
+__all__ = ["HistoryLog", "TRACKED_FIELDS", "deltas", "get_history", "history_path_for"]
@@ -0,0 +1,89 @@
+"""Rank keys and top-K selection for picker / collect responses.
+
+A scorer maps a record to a sort key (ascending = better). Keys are computed
+once per record: `CatalogSnapshot.rank_keys(name)` caches them per snapshot
+and the next snapshot after an upsert reuses the keys of every record object
+it carries over, so only new or changed records are scored again. Responses
+that need the best `k` records use `heapq.nsmallest` over the cached keys
+(O(N log K)) instead of sorting the whole catalog.
+
+Register additional scorers with:
+
+    @register_scorer("loudest_per_inch")
+    def _loudest(it):
+        return (it.rms_w is None, -((it.rms_w or 0) / (it.size_in or 1)))
+
+They become selectable as `/subwoofers/picker?rank=<name>`. Registering bumps
+`generation()`, so snapshots drop rank keys computed by a replaced scorer.
+"""
+from __future__ import annotations
+import heapq
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+RankKey = Callable[[Any], Tuple[Any, ...]]
+SCORERS: Dict[str, RankKey] = {}
+_generation = 0  # bumped by every registration
+
+
+def register_scorer(name: str) -> Callable[[RankKey], RankKey]:
+    """Decorator adding a rank key function under `name` (replaces an existing one)."""
+    def deco(fn: RankKey) -> RankKey:
+        global _generation
+        SCORERS[name] = fn
+        _generation += 1
+        return fn
+    return deco
+
+
+def generation() -> int:
+    """Registration counter; rank keys cached under an older value may come from a replaced scorer."""
+    return _generation
+
+
+def get_scorer(name: str) -> RankKey:
+    try:
+        return SCORERS[name]
+    except KeyError:
+        raise ValueError(f"unknown ranking '{name}' (expected one of {sorted(SCORERS)})") from None
+
+
+@register_scorer("picker")
+def picker_key(it: Any) -> Tuple[Any, ...]:
+    """Size desc, RMS desc, price desc, then brand/model (missing values last)."""
+    return (
+        -(it.size_in if it.size_in is not None else -9999),
+        -(it.rms_w if it.rms_w is not None else -9999),
+        -(it.price_usd if it.price_usd is not None else -9999),
+        it.brand or "",
+        it.model or "",
+    )
+
+
+@register_scorer("collect")
+def collect_key(it: Any) -> Tuple[Any, ...]:
+    """Higher RMS, then higher price, then newest scrape (collect endpoints)."""
+    return (-(it.rms_w or -1), -(it.price_usd or -1), -it.scraped_at, it.brand or "", it.model or "")
+
+
+@register_scorer("rms_per_dollar")
+def rms_per_dollar_key(it: Any) -> Tuple[Any, ...]:
+    """Most RMS watts per dollar first; records without RMS or price last."""
+    value = it.rms_w / it.price_usd if it.rms_w and it.price_usd else None
+    return (value is None, -(value or 0.0), it.brand or "", it.model or "")
+
+
+def top_k(items: Sequence[Any], k: int, key: RankKey) -> List[Any]:
+    """The best `k` of `items` by `key`; same result as `sorted(items, key=key)[:k]`."""
+    if k >= len(items):
+        return sorted(items, key=key)
+    return heapq.nsmallest(k, items, key=key)
+
+
+def top_k_indices(keys: Sequence[Tuple[Any, ...]], k: int) -> List[int]:
+    """Indices of the `k` smallest keys, best first (ties keep index order)."""
+    if k >= len(keys):
+        return sorted(range(len(keys)), key=keys.__getitem__)
+    return heapq.nsmallest(k, range(len(keys)), key=keys.__getitem__)
+
+
+__all__ = ["SCORERS", "generation", "get_scorer", "register_scorer", "top_k", "top_k_indices"]
@@ -0,0 +1,272 @@
+"""Retention and compaction for `subwoofers/<size>/snapshot_<ts>.json` files.
+
+`aggressive_collect` (with `snapshot=true`) drops a full JSON copy per call
+into the size directory. `compact_dir()` applies a retention policy:
+
+- the newest `keep_last` snapshots stay as plain JSON;
+- older ones survive only as the newest snapshot of each of the last
+  `keep_daily` days and `keep_weekly` ISO weeks, and those are rewritten as
+  gzipped deltas against `latest.json` (`snapshot_<ts>.delta.json.gz`);
+- everything else is deleted.
+
+Deltas reference a gzipped copy of the `latest.json` they were computed
+against (`base_<sha1>.json.gz`, shared by all deltas of one compaction run and
+removed once no delta refers to it), so they stay decodable after
+`latest.json` moves on. Each rewrite is verified by decoding it before the
+plain file is removed. `load_snapshot()` reads either form.
+
+Runs in a background thread after each snapshot write (`schedule()`) and
+offline:
+
+    python -m app.catalog.retention [subwoofers] [--keep-last 5] [--daily 7] [--weekly 4] [--dry-run]
+"""
+from __future__ import annotations
+import argparse, gzip, hashlib, json, re, threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from app.core.atomic import atomic_write_bytes
+
+DELTA_FORMAT = 1
+KEEP_LAST = 5
+KEEP_DAILY = 7
+KEEP_WEEKLY = 4
+_SNAPSHOT = re.compile(r"^snapshot_(\d{8}-\d{6})-(\d{6})(\.json|\.delta\.json\.gz)$")
+_BASE = re.compile(r"^base_[0-9a-f]{12}\.json\.gz$")
+
+
+@dataclass
+class RetentionReport:
+    directory: str
+    kept: List[str] = field(default_factory=list)
+    compacted: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+
+def snapshot_time(path: Path) -> Optional[datetime]:
+    """Local timestamp encoded in a snapshot file name (None for other files)."""
+    m = _SNAPSHOT.match(path.name)
+    if not m:
+        return None
+    return datetime.strptime(m.group(1), "%Y%m%d-%H%M%S").replace(microsecond=int(m.group(2)))
+
+
+def plan(times: Iterable[datetime], now: datetime, keep_last: int = KEEP_LAST,
+         keep_daily: int = KEEP_DAILY, keep_weekly: int = KEEP_WEEKLY) -> Dict[datetime, str]:
+    """Map each snapshot time to "full", "delta" or "drop"."""
+    ordered = sorted(set(times), reverse=True)
+    decision = {t: "drop" for t in ordered}
+    for t in ordered[:max(0, keep_last)]:
+        decision[t] = "full"
+    days: Set[Any] = set()
+    weeks: Set[Any] = set()
+    day_cutoff = (now - timedelta(days=keep_daily)).date()
+    week_cutoff = (now - timedelta(weeks=keep_weekly)).date()
+    for t in ordered:  # newest first: the first snapshot seen per day / week is kept
+        day, week = t.date(), t.isocalendar()[:2]
+        keep = False
+        if keep_daily > 0 and day > day_cutoff and day not in days:
+            days.add(day)
+            keep = True
+        if keep_weekly > 0 and day > week_cutoff and week not in weeks:
+            weeks.add(week)
+            keep = True
+        if keep and decision[t] == "drop":
+            decision[t] = "delta"
+    return decision
+
+
+def _read_json(path: Path) -> Any:
+    if path.name.endswith(".gz"):
+        return json.loads(gzip.decompress(path.read_bytes()))
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _by_url(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    return {r.get("url"): r for r in records if isinstance(r, dict)}
+
+
+def encode_delta(records: List[Dict[str, Any]], base: List[Dict[str, Any]], base_name: str) -> Dict[str, Any]:
+    """Delta document reproducing `records` (order included) from `base`."""
+    base_map = _by_url(base)
+    patch: Dict[str, Dict[str, Any]] = {}
+    dropped: Dict[str, List[str]] = {}
+    added: Dict[str, Dict[str, Any]] = {}
+    for r in records:
+        url = r.get("url")
+        old = base_map.get(url)
+        if old is None:
+            added[url] = r
+            continue
+        changed = {k: v for k, v in r.items() if k not in old or old[k] != v}
+        if changed:
+            patch[url] = changed
+        missing = [k for k in old if k not in r]
+        if missing:
+            dropped[url] = missing
+    return {"format": DELTA_FORMAT, "base": base_name, "urls": [r.get("url") for r in records],
+            "patch": patch, "dropped": dropped, "added": added}
+
+
+def decode_delta(doc: Dict[str, Any], base: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    base_map = _by_url(base)
+    out: List[Dict[str, Any]] = []
+    for url in doc["urls"]:
+        if url in doc["added"]:
+            out.append(doc["added"][url])
+            continue
+        rec = dict(base_map[url])
+        rec.update(doc["patch"].get(url, {}))
+        for k in doc["dropped"].get(url, ()):
+            rec.pop(k, None)
+        out.append(rec)
+    return out
+
+
+def load_snapshot(path: Path) -> List[Dict[str, Any]]:
+    """Records of a plain or delta-compacted snapshot file."""
+    path = Path(path)
+    if not path.name.endswith(".delta.json.gz"):
+        return _read_json(path)
+    doc = _read_json(path)
+    return decode_delta(doc, _read_json(path.parent / doc["base"]))
+
+
+def _canonical(records: Any) -> bytes:
+    return json.dumps(records, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def _size(paths: Iterable[Path]) -> int:
+    total = 0
+    for p in paths:
+        try:
+            total += p.stat().st_size
+        except OSError:
+            pass
+    return total
+
+
+def compact_dir(directory: Path, keep_last: int = KEEP_LAST, keep_daily: int = KEEP_DAILY,
+                keep_weekly: int = KEEP_WEEKLY, now: Optional[datetime] = None,
+                dry_run: bool = False) -> RetentionReport:
+    """Apply the retention policy to one size directory (see module docstring)."""
+    directory = Path(directory)
+    report = RetentionReport(str(directory))
+    snaps = {p: snapshot_time(p) for p in directory.glob("snapshot_*")}
+    snaps = {p: t for p, t in snaps.items() if t is not None}
+    files = list(snaps) + list(p for p in directory.glob("base_*.json.gz") if _BASE.match(p.name))
+    report.bytes_before = _size(files)
+    decision = plan(snaps.values(), now or datetime.now(), keep_last, keep_daily, keep_weekly)
+    latest_path = directory / "latest.json"
+    base: Optional[List[Dict[str, Any]]] = None
+    base_name = ""
+    for path, t in sorted(snaps.items(), key=lambda kv: kv[1], reverse=True):
+        action = decision[t]
+        if action == "drop":
+            report.deleted.append(path.name)
+            if not dry_run:
+                path.unlink(missing_ok=True)
+            continue
+        if action == "full" or path.name.endswith(".delta.json.gz") or not latest_path.exists():
+            report.kept.append(path.name)
+            continue
+        report.compacted.append(path.name)
+        if dry_run:
+            continue
+        if base is None:
+            raw = _canonical(_read_json(latest_path))
+            base = json.loads(raw)
+            base_name = f"base_{hashlib.sha1(raw).hexdigest()[:12]}.json.gz"
+            base_path = directory / base_name
+            if not base_path.exists():
+                atomic_write_bytes(base_path, gzip.compress(raw, 9))
+        try:
+            records = _read_json(path)
+        except (OSError, ValueError):
+            report.compacted.pop()
+            report.kept.append(path.name)
+            continue
+        doc = encode_delta(records, base, base_name)
+        target = path.with_name(path.name[:-len(".json")] + ".delta.json.gz")
+        atomic_write_bytes(target, gzip.compress(_canonical(doc), 9))
+        if _canonical(load_snapshot(target)) != _canonical(records):  # pragma: no cover - defensive
+            target.unlink(missing_ok=True)
+            report.compacted.pop()
+            report.kept.append(path.name)
+            continue
+        path.unlink(missing_ok=True)
+    if not dry_run:
+        referenced = set()
+        for p in directory.glob("snapshot_*.delta.json.gz"):
+            try:
+                referenced.add(_read_json(p)["base"])
+            except (OSError, ValueError, KeyError):
+                continue
+        for p in directory.glob("base_*.json.gz"):
+            if _BASE.match(p.name) and p.name not in referenced:
+                p.unlink(missing_ok=True)
+        files = [p for p in directory.iterdir() if _SNAPSHOT.match(p.name) or _BASE.match(p.name)]
+        report.bytes_after = _size(files)
+    else:
+        report.bytes_after = report.bytes_before
+    return report
+
+
+def compact_root(root: Path, **policy: Any) -> List[RetentionReport]:
+    """`compact_dir` for every `<root>/<size>/` directory."""
+    root = Path(root)
+    if not root.is_dir():
+        return []
+    return [compact_dir(d, **policy) for d in sorted(root.iterdir()) if d.is_dir() and d.name.isdigit()]
+
+
+_RUNNING: Dict[str, threading.Thread] = {}
+_RUNNING_LOCK = threading.Lock()
+
+
+def schedule(directory: Path, **policy: Any) -> threading.Thread:
+    """Compact `directory` in a background thread unless a compaction of it is already running."""
+    key = str(Path(directory).resolve())
+    with _RUNNING_LOCK:
+        running = _RUNNING.get(key)
+        if running is not None and running.is_alive():
+            return running
+
+        def run() -> None:
+            try:
+                compact_dir(Path(directory), **policy)
+            except Exception:  # pragma: no cover - next snapshot write retries
+                pass
+
+        thread = _RUNNING[key] = threading.Thread(target=run, name=f"retention:{Path(directory).name}", daemon=True)
+        thread.start()
+        return thread
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Apply snapshot retention to subwoofers/<size>/ directories.")
+    parser.add_argument("root", nargs="?", default="subwoofers")
+    parser.add_argument("--keep-last", type=int, default=KEEP_LAST)
+    parser.add_argument("--daily", type=int, default=KEEP_DAILY)
+    parser.add_argument("--weekly", type=int, default=KEEP_WEEKLY)
+    parser.add_argument("--dry-run", action="store_true", help="report only, change nothing")
+    args = parser.parse_args(argv)
+    reports = compact_root(Path(args.root), keep_last=args.keep_last, keep_daily=args.daily,
+                           keep_weekly=args.weekly, dry_run=args.dry_run)
+    for r in reports:
+        print(f"{r.directory}: kept {len(r.kept)}, compacted {len(r.compacted)}, deleted {len(r.deleted)}, "
+              f"{r.bytes_before} -> {r.bytes_after} bytes")
+    return 0
+
+
+__all__ = [
+    "KEEP_DAILY", "KEEP_LAST", "KEEP_WEEKLY", "RetentionReport", "compact_dir", "compact_root", "decode_delta",
+    "encode_delta", "load_snapshot", "plan", "schedule", "snapshot_time",
+]
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,55 @@
+"""Fast JSON encoding for catalog responses.
+
+List endpoints used to run `asdict()` on every record and push the result
+through stdlib `json` on each request. Here each record is encoded once per
+snapshot (`CatalogSnapshot.encoded`) and carried over to later snapshots while
+the record object is unchanged; an upsert replaces the object, so its bytes are
+re-encoded. List responses are assembled by joining the cached fragments into
+a prebuilt body (`list_response`) instead of re-serializing a dict tree.
+
+`orjson` is used when installed (optional; same output for catalog records),
+otherwise stdlib `json` with the separators Starlette's `JSONResponse` uses.
+"""
+from __future__ import annotations
+import json
+from dataclasses import asdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from fastapi import Response
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def encode_record(item: Any) -> bytes:
+    return dumps(asdict(item))
+
+
+def join_array(fragments: Iterable[bytes]) -> bytes:
+    return b"[" + b",".join(fragments) + b"]"
+
+
+def object_response(envelope: Dict[str, Any], key: str, value: bytes,
+                    status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """JSON object response `envelope + {key: <pre-encoded value>}` built by concatenation."""
+    head = dumps(envelope)
+    body = head[:-1] + (b"," if len(head) > 2 else b"") + dumps(key) + b":" + value + b"}"
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
+
+
+def list_response(envelope: Dict[str, Any], fragments: List[bytes], key: str = "items",
+                  status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """JSON object response `envelope + {key: [fragments...]}`."""
+    return object_response(envelope, key, join_array(fragments), status_code, headers)
+
+
+__all__ = ["dumps", "encode_record", "join_array", "list_response", "object_response"]
@@ -0,0 +1,329 @@
+"""SQLite-backed subwoofer store (stdlib sqlite3, WAL mode).
+
+Schema: one `subwoofers` row per product URL with the `Subwoofer` fields as
+columns (`offers` as JSON text) and secondary indexes on `size_in`, `rms_w`, `price_usd`,
+`impedance_ohm` and `source`. Search range filters and bulk-delete predicates
+are pushed down as indexed SQL predicates (a superset of the Python
+semantics, which are re-applied for exact parity), and upserts are single-row
+`INSERT ... ON CONFLICT(url) DO UPDATE` statements that keep the row's
+original position.
+
+One-shot import from the JSON catalog:
+
+    python -m app.catalog.sqlite_store data/subwoofers.json data/subwoofers.sqlite3
+"""
+from __future__ import annotations
+import argparse, json, math, os, sqlite3, threading
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from app.models.subwoofer import Subwoofer, encode_offers, from_any
+from . import dedup, serialize
+from .bulk import DeletePredicate
+from .catalog import Catalog, CatalogSnapshot, SearchFilters, Signature, file_sig
+from .store import SubwooferStore
+
+COLUMNS: Tuple[str, ...] = tuple(f.name for f in fields(Subwoofer))
+INDEXED = ("size_in", "rms_w", "price_usd", "impedance_ohm", "source")
+_COLS = ", ".join(COLUMNS)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS subwoofers (
+    source TEXT,
+    url TEXT PRIMARY KEY,
+    brand TEXT,
+    model TEXT,
+    size_in REAL,
+    rms_w INTEGER,
+    peak_w INTEGER,
+    impedance_ohm REAL,
+    sensitivity_db REAL,
+    mounting_depth_in REAL,
+    cutout_diameter_in REAL,
+    displacement_cuft REAL,
+    recommended_box TEXT,
+    price_usd REAL,
+    image TEXT,
+    scraped_at REAL,
+    offers TEXT,
+    dedup_block TEXT
+)
+"""
+
+# Rows also carry `dedup.block_key` ('' when the model has no key) so upserts find duplicate candidates by index
+_ROW_COLUMNS = COLUMNS + ("dedup_block",)
+_UPSERT = (
+    f"INSERT INTO subwoofers ({', '.join(_ROW_COLUMNS)}) VALUES ({', '.join('?' for _ in _ROW_COLUMNS)}) "
+    "ON CONFLICT(url) DO UPDATE SET "
+    + ", ".join(f"{c}=excluded.{c}" for c in _ROW_COLUMNS if c != "url")
+)
+
+# ORDER BY clauses reproducing catalog.VIEW_KEYS (URL breaks ties).
+# `x = 0` terms mirror the `x or inf` / `-(x or -1)` quirks of the Python keys.
+_ORDER_BY: Dict[str, str] = {
+    "brand": "IFNULL(brand, ''), IFNULL(model, ''), url",
+    "price": "price_usd IS NULL, price_usd = 0, price_usd, url",
+    "rms": "rms_w IS NULL, rms_w = 0, rms_w DESC, url",
+    "size": "size_in IS NULL, size_in = 0, size_in DESC, url",
+}
+
+_IN_CHUNK = 500  # bound parameters per `url IN (...)` query (SQLite's default limit is 999)
+_IMPEDANCE_SLACK = 0.011  # slightly wider than matches() tolerance; Python re-check is exact
+
+
+def _row(obj: Any) -> Tuple[Any, ...]:
+    """Map a record (any shape `from_any` accepts; lite shapes allowed) to a row tuple."""
+    rec = from_any(obj)
+    return tuple(encode_offers(rec.offers) if c == "offers" else getattr(rec, c) for c in COLUMNS) + (
+        dedup.block_key(rec) or "",)
+
+
+def _range_sql(col: str, lo: float, hi: float, where: List[str], params: List[Any]) -> None:
+    # matches() compares `(value or 0)`, so NULL behaves like 0 on either bound.
+    if lo != -math.inf:
+        where.append(f"{col} >= ?" if lo > 0 else f"({col} IS NULL OR {col} >= ?)")
+        params.append(lo)
+    if hi != math.inf:
+        where.append(f"({col} IS NULL OR {col} <= ?)" if hi >= 0 else f"{col} <= ?")
+        params.append(hi)
+
+
+def _filters_sql(filters: SearchFilters) -> Tuple[List[str], List[Any]]:
+    """WHERE terms selecting a superset of `filters.matches` (numeric ranges, impedance)."""
+    where: List[str] = []
+    params: List[Any] = []
+    for col, lo, hi in filters.ranges():
+        _range_sql(col, lo, hi, where, params)
+    if filters.impedance_ohm:
+        imp = filters.impedance_ohm
+        where.append("(impedance_ohm IS NULL OR impedance_ohm = 0 OR impedance_ohm BETWEEN ? AND ?)")
+        params.extend([imp - _IMPEDANCE_SLACK, imp + _IMPEDANCE_SLACK])
+    return where, params
+
+
+class _SqliteCatalog(Catalog):
+    """Catalog cache whose change signature is sqlite's data_version + own write count."""
+
+    def __init__(self, store: "SqliteStore"):
+        super().__init__(store.path)
+        self._store = store
+
+    def _stat(self) -> Optional[Signature]:
+        return self._store.signature()
+
+    def _load(self, sig: Optional[Signature]) -> List[Subwoofer]:
+        return self._store.select_all()
+
+
+class SqliteStore(SubwooferStore):
+    """SQLite backend; safe to share across threads (single connection behind a lock)."""
+
+    backend = "sqlite"
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(_SCHEMA)
+            present = {row[1] for row in self._conn.execute("PRAGMA table_info(subwoofers)")}
+            for col in _ROW_COLUMNS:
+                if col not in present:  # databases created before the column existed (offers, dedup_block)
+                    self._conn.execute(f"ALTER TABLE subwoofers ADD COLUMN {col} TEXT")
+            for col in INDEXED + ("dedup_block",):
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_subwoofers_{col} ON subwoofers ({col})")
+            missing = self._conn.execute("SELECT url, brand, model FROM subwoofers WHERE dedup_block IS NULL").fetchall()
+            self._conn.executemany("UPDATE subwoofers SET dedup_block = ? WHERE url = ?", [
+                (dedup.block_key(Subwoofer(source="", url=url, brand=brand, model=model)) or "", url)
+                for url, brand, model in missing])
+        self.catalog = _SqliteCatalog(self)
+
+    # ---------- Reads ----------
+    def signature(self) -> Signature:
+        """Cheap change token: bumps on commits by other connections or by this one."""
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            return (data_version, self._conn.total_changes)
+
+    def select_all(self) -> List[Subwoofer]:
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {_COLS} FROM subwoofers ORDER BY rowid").fetchall()
+        return [Subwoofer(*r) for r in rows]
+
+    def _select_in(self, col: str, values: List[Any]) -> List[Tuple[Any, ...]]:
+        """(rowid, *COLUMNS) rows whose `col` is one of `values`, in chunks of `_IN_CHUNK` parameters."""
+        rows: List[Tuple[Any, ...]] = []
+        with self._lock:
+            for i in range(0, len(values), _IN_CHUNK):
+                chunk = values[i:i + _IN_CHUNK]
+                sql = f"SELECT rowid, {_COLS} FROM subwoofers WHERE {col} IN ({', '.join('?' for _ in chunk)})"
+                rows.extend(self._conn.execute(sql, chunk).fetchall())
+        return rows
+
+    def rows_for(self, urls: Iterable[str]) -> Dict[str, Subwoofer]:
+        # Primary-key lookups for just these URLs; writes must not reload the whole table.
+        return {s.url: s for s in (Subwoofer(*r[1:]) for r in self._select_in("url", list(dict.fromkeys(urls))))}
+
+    def stored_urls(self) -> Set[str]:
+        with self._lock:
+            return {r[0] for r in self._conn.execute("SELECT url FROM subwoofers")}
+
+    def dedup_candidates(self, records: Sequence[Subwoofer]) -> List[Subwoofer]:
+        # Indexed lookups by URL and dedup block; rows listing a record's URL as an offer via INSTR.
+        urls = list(dict.fromkeys(r.url for r in records))
+        blocks = sorted({b for b in map(dedup.block_key, records) if b})
+        rows = self._select_in("url", urls) + self._select_in("dedup_block", blocks)
+        with self._lock:
+            for i in range(0, len(urls), _IN_CHUNK):
+                needles = ['"url":' + json.dumps(u) for u in urls[i:i + _IN_CHUNK]]
+                sql = (f"SELECT rowid, {_COLS} FROM subwoofers WHERE offers IS NOT NULL AND ("
+                       + " OR ".join("INSTR(offers, ?) > 0" for _ in needles) + ")")
+                rows.extend(self._conn.execute(sql, needles).fetchall())
+        by_rowid = {r[0]: r for r in rows}
+        return [Subwoofer(*by_rowid[k][1:]) for k in sorted(by_rowid)]
+
+    def snapshot(self) -> CatalogSnapshot:
+        return self.catalog.snapshot()
+
+    def search(self, filters: SearchFilters, sort: Optional[str] = None) -> List[Subwoofer]:
+        if filters.text or sort == "relevance":
+            # Free text goes through the cached snapshot's inverted index.
+            return self.snapshot().search(filters, sort)
+        where, params = _filters_sql(filters)
+        sql = f"SELECT {_COLS} FROM subwoofers"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY " + _ORDER_BY.get(sort or "", _ORDER_BY["brand"])
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        # Text filters (brand/box) and exact float tolerances are applied in Python.
+        return [s for s in (Subwoofer(*r) for r in rows) if filters.matches(s)]
+
+    def select_urls(self, predicate: DeletePredicate) -> List[str]:
+        # Pushed down: range/impedance filters, source, URL substring and age; the rest is re-checked below.
+        where, params = _filters_sql(predicate.filters)
+        if predicate.sources:
+            where.append(f"LOWER(source) IN ({', '.join('?' for _ in predicate.sources)})")
+            params.extend(s.lower() for s in predicate.sources)
+        if predicate.url_contains:
+            where.append("INSTR(LOWER(url), ?) > 0")
+            params.append(predicate.url_contains.lower())
+        if predicate.scraped_before is not None:
+            where.append("scraped_at < ?")
+            params.append(predicate.scraped_before)
+        sql = f"SELECT {_COLS} FROM subwoofers"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY rowid", params).fetchall()
+        return [s.url for s in (Subwoofer(*r) for r in rows) if predicate.matches(s)]
+
+    def encode(self, items: Iterable[Subwoofer]) -> List[bytes]:
+        # SQL search rows are fresh objects; don't reload the snapshot just to encode them.
+        return [serialize.encode_record(i) for i in items]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM subwoofers").fetchone()[0]
+
+    # ---------- Writes ----------
+    def replace_all(self, items: Iterable[Any]) -> None:
+        records = [from_any(i) for i in items]
+        with self.write_lock(), self.publishing():
+            if self.dedupe:
+                records = dedup.dedupe(records, self.stored_urls())
+            rows = [_row(r) for r in records]
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM subwoofers")
+                self._conn.executemany(_UPSERT, rows)
+            self.catalog.invalidate()
+
+    def upsert(self, items: Iterable[Any]) -> None:
+        records = [from_any(i) for i in items]
+        if not records:
+            return
+        with self.write_lock():
+            written, dropped = self._folded(records)
+            rows = [_row(r) for r in written]
+            with self.publishing([r.url for r in written] + dropped, written):
+                with self._lock, self._conn:
+                    self._conn.executemany(_UPSERT, rows)
+                    self._conn.executemany("DELETE FROM subwoofers WHERE url = ?", [(u,) for u in dropped])
+                self.catalog.invalidate()
+
+    def delete(self, urls: Iterable[str]) -> int:
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return 0
+        with self.write_lock(), self.publishing(urls):
+            with self._lock, self._conn:
+                before = self._conn.total_changes
+                self._conn.executemany("DELETE FROM subwoofers WHERE url = ?", [(u,) for u in urls])
+                deleted = self._conn.total_changes - before
+            self.catalog.invalidate()
+        return deleted
+
+    def invalidate(self) -> None:
+        self.catalog.invalidate()
+
+    def change_token(self) -> Optional[Signature]:
+        # data_version is connection-local, so validators use the files (WAL commits touch -wal).
+        sig = tuple(x for p in self.backing_files() for x in file_sig(p))
+        return sig if any(sig) else None
+
+    def backing_files(self) -> List[Path]:
+        return [self.path, self.path.with_name(self.path.name + "-wal")]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_STORES: Dict[str, SqliteStore] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_sqlite_store(path: Path) -> SqliteStore:
+    """Return the process-wide store for `path` (one connection per database file)."""
+    key = os.path.abspath(path)
+    store = _STORES.get(key)
+    if store is None:
+        with _REGISTRY_LOCK:
+            store = _STORES.get(key)
+            if store is None:
+                store = _STORES[key] = SqliteStore(Path(path))
+    return store
+
+
+def import_json(json_path: Path, sqlite_path: Path) -> int:
+    """Replace the SQLite catalog with the records in `json_path`; return the row count.
+
+    Accepts the mixed full/lite record shapes found in `data/subwoofers.json`
+    (missing fields become NULL). Later duplicates of a URL win, as with the
+    JSON merge-by-URL writers.
+    """
+    data = json.loads(Path(json_path).read_text(encoding="utf-8"))
+    records = [d for d in data if isinstance(d, dict) and d.get("url")]
+    store = get_sqlite_store(sqlite_path)
+    store.replace_all(records)
+    return store.count()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import data/subwoofers.json into the SQLite store.")
+    parser.add_argument("json_path", nargs="?", default="data/subwoofers.json")
+    parser.add_argument("sqlite_path", nargs="?", default="data/subwoofers.sqlite3")
+    args = parser.parse_args(argv)
+    n = import_json(Path(args.json_path), Path(args.sqlite_path))
+    print(f"imported {n} subwoofers into {args.sqlite_path}")
+    return 0
+
+
+__all__ = ["COLUMNS", "INDEXED", "SqliteStore", "get_sqlite_store", "import_json"]
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,367 @@
+"""Storage backends for the subwoofer catalog.
+
+`SubwooferStore` is the small repository interface the routers use for reads
+(`snapshot`, `search`) and writes (`replace_all`, `upsert`, `delete`). Backends:
+- `JsonStore` (default): the historical `data/subwoofers.json` file plus an
+  append-only upsert log, cached in memory by `Catalog`.
+- `SqliteStore` (`sqlite_store.py`): stdlib sqlite3 in WAL mode with indexed
+  numeric columns, so range filters become SQL range scans and upserts touch
+  single rows.
+
+Selected per call via `Settings.subwoofer_store` (env `SUBWOOFER_STORE`).
+"""
+from __future__ import annotations
+import json, os, threading
+from contextlib import AbstractContextManager, contextmanager
+from pathlib import Path
+from typing import Any, Collection, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.config import get_settings
+from app.core.atomic import atomic_write_text
+from app.core.write_coordinator import get_coordinator
+from app.models.subwoofer import Subwoofer, from_any, merge_records
+from . import binsnap, dedup, wal
+from .changes import ChangeFeed, diff, get_feed
+from .history import HistoryLog, deltas, get_history
+from .bulk import DeletePredicate
+from .catalog import CatalogSnapshot, SearchFilters, get_catalog
+
+BACKENDS = ("json", "sqlite")
+DEFAULT_COMPACT_BYTES = 1 << 20  # fold the upsert log once it passes ~1 MiB
+
+
+class SubwooferStore:
+    """Repository interface shared by the JSON and SQLite backends."""
+
+    backend = "abstract"
+    path: Path
+    dedupe = True  # fold cross-retailer duplicates into one canonical row on every write (see dedup.py)
+    record_history = True  # append price / spec deltas per write (see history.py)
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Return a cached, read-only snapshot of all records."""
+        raise NotImplementedError
+
+    def search(self, filters: SearchFilters, sort: Optional[str] = None) -> List[Subwoofer]:
+        """Return records matching `filters` in `sort` order (see `CatalogSnapshot.search`)."""
+        return self.snapshot().search(filters, sort)
+
+    def replace_all(self, items: Iterable[Any]) -> None:
+        """Replace the stored catalog with `items`."""
+        raise NotImplementedError
+
+    def upsert(self, items: Iterable[Any]) -> None:
+        """Insert or update `items` keyed by URL, keeping other records untouched."""
+        raise NotImplementedError
+
+    def delete(self, urls: Iterable[str]) -> int:
+        """Remove the records with these URLs in one write; returns how many existed."""
+        raise NotImplementedError
+
+    def stored_urls(self) -> Collection[str]:
+        """URLs of the stored rows."""
+        return self.snapshot().url_index()
+
+    def dedup_candidates(self, records: Sequence[Subwoofer]) -> List[Subwoofer]:
+        """Stored rows `records` may duplicate (same URL, dedup block or offered URL; see `dedup.fold`)."""
+        return self.snapshot().dedup_index().candidates(records)
+
+    def _folded(self, records: List[Subwoofer]) -> Tuple[List[Subwoofer], List[str]]:
+        """Rows to write and stored URLs to drop when upserting `records` (use inside `write_lock()`)."""
+        if not self.dedupe:
+            return records, []
+        return dedup.fold(records, self.dedup_candidates(records))
+
+    def select_urls(self, predicate: DeletePredicate) -> List[str]:
+        """URLs of the records matching `predicate`, in catalog order."""
+        snap = self.snapshot()
+        items = snap.items
+        return [items[i].url for i in sorted(snap.match_indices(predicate.filters))
+                if predicate.matches(items[i], check_filters=False)]
+
+    def merge(self, items: Iterable[Any], only: Optional[Iterable[str]] = None, rewrite: bool = True) -> None:
+        """Fold partial records into the stored ones by URL (see `merge_records`).
+
+        Fields outside `only` (default: whatever each item's shape carries) and
+        `None` values keep their stored value; unknown URLs are inserted. With
+        `rewrite=False` backends that keep a base file (JSON) only append the
+        merged records, for incremental writes such as per-batch crawl merges.
+        """
+        with self.write_lock():
+            self.upsert(_merged(self.snapshot(), items, only).values())
+
+    def invalidate(self) -> None:
+        """Drop any cached state so the next read goes to storage."""
+        raise NotImplementedError
+
+    def write_lock(self) -> AbstractContextManager:
+        """Exclusive, re-entrant write section across threads and worker processes.
+
+        Wrap read-modify-write sequences (catalog + derived files) in it; the
+        store's own write methods take it as well.
+        """
+        return get_coordinator(self.path).write()
+
+    @property
+    def changes(self) -> ChangeFeed:
+        """Upsert/delete event feed for this catalog, shared by every worker through its events file."""
+        return get_feed(self.path)
+
+    @property
+    def history(self) -> HistoryLog:
+        """Per-record price / spec deltas recorded by this store's writes (see history.py)."""
+        return get_history(self.path)
+
+    def rows_for(self, urls: Iterable[str]) -> Dict[str, Subwoofer]:
+        """url -> stored record for those of `urls` that exist."""
+        snap = self.snapshot()
+        index = snap.url_index()
+        return {u: snap.items[index[u]] for u in urls if u in index}
+
+    @contextmanager
+    def publishing(self, urls: Optional[Iterable[str]] = None,
+                   written: Iterable[Subwoofer] = ()) -> Iterator[None]:
+        """Publish the difference made by the enclosed write to `changes` and `history`.
+
+        Use inside `write_lock()`. With `urls` (upsert / delete) only the
+        pre-write rows of those URLs are read and compared with `written`, the
+        records the write stores for them (URLs not in `written` were deleted).
+        Without, the whole catalog is compared before and after (full rewrites).
+        """
+        feed = self.changes
+        if not feed.capacity and not self.record_history:
+            yield
+            return
+        if urls is None:
+            before = self.snapshot().items
+            yield
+            changed = diff(before, self.snapshot().items)
+        else:
+            urls = list(dict.fromkeys(urls))
+            before = self.rows_for(urls)
+            yield
+            changed = diff(list(before.values()), list(written), urls)
+        if feed.capacity:
+            feed.publish(changed)
+        if self.record_history:
+            entries = deltas(changed)
+            if entries:
+                self.history.append(entries)
+
+    def encode(self, items: Iterable[Subwoofer]) -> List[bytes]:
+        """Compact JSON bytes per record (cached per snapshot record)."""
+        return self.snapshot().encoded(items)
+
+    def change_token(self) -> Optional[Tuple[int, ...]]:
+        """Cheap token that changes whenever stored data changes (no data is loaded).
+
+        Must be comparable across processes; used for HTTP validators (ETag).
+        """
+        raise NotImplementedError
+
+    def last_modified(self) -> Optional[float]:
+        """POSIX time of the last write to the backing files, if known."""
+        return _latest_mtime(self.backing_files())
+
+    def backing_files(self) -> List[Path]:
+        return []
+
+
+class JsonStore(SubwooferStore):
+    """JSON backend: `data/subwoofers.json` base file plus an append-only upsert log.
+
+    `upsert` and `delete` append to the log (see `wal.py`) instead of rewriting the file;
+    once the log exceeds `compact_threshold` bytes a background thread folds it
+    back into the base file. `replace_all` rewrites the base atomically and
+    drops the log, since a full replacement supersedes it. All writes run
+    under the cross-process `write_lock()`.
+    """
+
+    backend = "json"
+
+    def __init__(self, path: Path, compact_threshold: int = DEFAULT_COMPACT_BYTES):
+        self.path = Path(path)
+        self.log_path = wal.log_path_for(self.path)
+        self.catalog = get_catalog(self.path)
+        self.compact_threshold = compact_threshold
+        self._compactor_lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+
+    def snapshot(self) -> CatalogSnapshot:
+        return self.catalog.snapshot()
+
+    def replace_all(self, items: Iterable[Any]) -> None:
+        records = [from_any(i) for i in items]
+        with self.write_lock(), self.publishing():
+            if self.dedupe:
+                records = dedup.dedupe(records, self.stored_urls())
+            atomic_write_text(self.path, json.dumps([r.to_dict() for r in records], indent=2))
+            # Drop the log only after the new base is in place. A crash before the replace keeps the old base
+            # and log; a crash after it leaves a log stamped for the old base, which readers ignore (wal.py).
+            self.log_path.unlink(missing_ok=True)
+            wal.compacting_path_for(self.path).unlink(missing_ok=True)
+            self._write_snapshot(records)
+            self.catalog.replace(records)
+
+    def upsert(self, items: Iterable[Any]) -> None:
+        records = [from_any(i) for i in items]
+        if not records:
+            return
+        with self.write_lock():
+            rows, dropped = self._folded(records)
+            ops = ([{"op": wal.OP_UPSERT, "record": r.to_dict()} for r in rows]
+                   + [{"op": wal.OP_DELETE, "url": u} for u in dropped])
+            with self.publishing([r.url for r in rows] + dropped, rows):
+                wal.append_log(self.path, ops)
+        if self.log_size() > self.compact_threshold:
+            self.schedule_compaction()
+
+    def delete(self, urls: Iterable[str]) -> int:
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return 0
+        with self.write_lock(), self.publishing(urls):
+            index = self.snapshot().url_index()
+            present = [u for u in urls if u in index]
+            wal.append_log(self.path, [{"op": wal.OP_DELETE, "url": u} for u in present])
+        if self.log_size() > self.compact_threshold:
+            self.schedule_compaction()
+        return len(present)
+
+    def merge(self, items: Iterable[Any], only: Optional[Iterable[str]] = None, rewrite: bool = True) -> None:
+        # Full merges rewrite the whole base file (log folded in first), as the
+        # lite routers always did, so `data/subwoofers.json` stays authoritative.
+        if not rewrite:
+            super().merge(items, only)  # log append; compaction folds it in later
+            return
+        with self.write_lock():
+            self.compact()
+            with self.publishing():
+                snap = self.snapshot()
+                by_url: Dict[Any, Subwoofer] = {i.url: i for i in snap.items}
+                by_url.update(_merged(snap, items, only))
+                records = list(by_url.values())
+                if self.dedupe:
+                    records = dedup.dedupe(records, snap.url_index())
+                atomic_write_text(self.path, json.dumps([r.to_dict() for r in records], indent=2))
+                self._write_snapshot(records)
+                self.catalog.replace(records)
+
+    def _write_snapshot(self, records: List[Subwoofer]) -> None:
+        # Binary twin of the base file just written (see binsnap.py); stale ones are ignored by readers.
+        if not self.catalog.binary_snapshot:
+            return
+        try:
+            binsnap.write_snapshot(self.path, records)
+        except OSError:
+            binsnap.snapshot_path_for(self.path).unlink(missing_ok=True)
+
+    def log_size(self) -> int:
+        try:
+            return self.log_path.stat().st_size
+        except OSError:
+            return 0
+
+    def compact(self) -> bool:
+        """Fold the upsert log into the base file now (blocking)."""
+        with self.write_lock():
+            if not wal.compact(self.path):
+                return False
+            self._write_snapshot(list(self.snapshot().items))
+            return True
+
+    def schedule_compaction(self) -> Optional[threading.Thread]:
+        """Start a background compaction unless one is already running."""
+        with self._compactor_lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return self._compactor
+            self._compactor = threading.Thread(
+                target=self._compact_quietly, name=f"compact:{self.path.name}", daemon=True
+            )
+            self._compactor.start()
+            return self._compactor
+
+    def _compact_quietly(self) -> None:
+        try:
+            self.compact()
+        except Exception:  # pragma: no cover - next upsert retries
+            pass
+
+    def invalidate(self) -> None:
+        self.catalog.invalidate()
+
+    def change_token(self) -> Optional[Tuple[int, ...]]:
+        return self.catalog.stat()
+
+    def backing_files(self) -> List[Path]:
+        return [self.path, self.log_path, wal.compacting_path_for(self.path)]
+
+
+def _merged(snap: CatalogSnapshot, items: Iterable[Any], only: Optional[Iterable[str]]) -> Dict[Any, Subwoofer]:
+    """url -> merged record for `items` against the stored records in `snap`."""
+    only = tuple(only) if only is not None else None
+    index = snap.url_index()
+    out: Dict[Any, Subwoofer] = {}
+    for item in items:
+        rec = from_any(item)
+        pos = index.get(rec.url)
+        existing = out.get(rec.url) or (snap.items[pos] if pos is not None else None)
+        out[rec.url] = merge_records(existing, item, only)
+    return out
+
+
+def _latest_mtime(paths: Iterable[Path]) -> Optional[float]:
+    latest = None
+    for p in paths:
+        try:
+            mtime = p.stat().st_mtime
+        except OSError:
+            continue
+        latest = mtime if latest is None else max(latest, mtime)
+    return latest
+
+
+_JSON_STORES: Dict[str, JsonStore] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_json_store(path: Path) -> JsonStore:
+    """Return the process-wide JSON store for `path` (shares its write lock/compactor)."""
+    key = os.path.abspath(path)
+    store = _JSON_STORES.get(key)
+    if store is None:
+        with _REGISTRY_LOCK:
+            store = _JSON_STORES.get(key)
+            if store is None:
+                store = _JSON_STORES[key] = JsonStore(Path(path))
+    return store
+
+
+def get_store(json_path: Path) -> SubwooferStore:
+    """Return the configured store for the catalog whose JSON file is `json_path`.
+
+    The SQLite database defaults to `json_path` with a `.sqlite3` suffix so a
+    patched DB_PATH (tests) isolates both backends alike.
+    """
+    settings = get_settings()
+    backend = (settings.subwoofer_store or "json").lower()
+    if backend == "sqlite":
+        from .sqlite_store import get_sqlite_store
+        configured = settings.subwoofer_sqlite_path
+        store = get_sqlite_store(Path(configured) if configured else Path(json_path).with_suffix(".sqlite3"))
+        store.dedupe = settings.subwoofer_dedupe
+        store.record_history = settings.subwoofer_history
+        store.changes.resize(settings.subwoofer_changes_buffer)
+        return store
+    if backend != "json":
+        raise ValueError(f"Unknown subwoofer store backend: {backend} (expected one of {BACKENDS})")
+    store = get_json_store(json_path)
+    store.changes.resize(settings.subwoofer_changes_buffer)
+    store.dedupe = settings.subwoofer_dedupe
+    store.record_history = settings.subwoofer_history
+    store.compact_threshold = settings.subwoofer_log_compact_bytes
+    store.catalog.binary_snapshot = settings.subwoofer_binary_snapshot
+    return store
+
+
+__all__ = ["BACKENDS", "JsonStore", "SubwooferStore", "get_json_store", "get_store"]
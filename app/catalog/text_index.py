@@ -0,0 +1,121 @@
+"""Tokenized inverted index for subwoofer free-text search (`q`).
+
+The old `q` filter built a lowercase brand/model/recommended_box/url blob per
+record and substring-tested it on every request. `TextIndex` is built once per
+catalog snapshot and answers a query with a few bisects:
+
+- Records are tokenized per field (`[^\\W_]+`, lowercased) into postings
+  `token -> {doc: field weight}`.
+- Every suffix of every token is kept in one sorted list, so a prefix range
+  scan over it finds tokens that start with the query term (model numbers
+  such as "8W3" -> "8w3v3") *or* contain it ("w3"), without scanning records.
+- A few brand aliases ("jla" -> "jl audio", "rf" -> "rockford fosgate") expand
+  to the tokens of the canonical brand.
+
+Every query term must match (AND). Relevance = sum over terms of the best
+`field weight * match kind` (exact > prefix > infix) for that record.
+"""
+from __future__ import annotations
+import bisect, re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.models.subwoofer import Subwoofer
+
+TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+# (field, weight): brand/model dominate, URLs only break ties
+FIELD_WEIGHTS: Tuple[Tuple[str, float], ...] = (
+    ("brand", 3.0),
+    ("model", 3.0),
+    ("recommended_box", 1.0),
+    ("url", 0.5),
+)
+EXACT, PREFIX, INFIX = 1.0, 0.6, 0.3
+
+BRAND_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "jla": ("jl", "audio"),
+    "jlaudio": ("jl", "audio"),
+    "sa": ("sundown", "audio"),
+    "sundownaudio": ("sundown", "audio"),
+    "skaraudio": ("skar", "audio"),
+    "rf": ("rockford", "fosgate"),
+    "rockfordfosgate": ("rockford", "fosgate"),
+    "dd": ("digital", "designs"),
+    "ddaudio": ("digital", "designs"),
+}
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+class TextIndex:
+    """Immutable inverted index over a sequence of records (doc id = position)."""
+
+    def __init__(self, items: Sequence[Subwoofer]):
+        postings: Dict[str, Dict[int, float]] = {}
+        for doc, it in enumerate(items):
+            for field, weight in FIELD_WEIGHTS:
+                for tok in tokenize(getattr(it, field, None)):
+                    p = postings.setdefault(tok, {})
+                    if p.get(doc, 0.0) < weight:
+                        p[doc] = weight
+        self._postings = postings
+        suffixes = sorted((tok[i:], i, tok) for tok in postings for i in range(len(tok)))
+        self._suffix_keys = [s for s, _, _ in suffixes]
+        self._suffix_meta = [(i, tok) for _, i, tok in suffixes]
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def lookup(self, term: str) -> Dict[int, float]:
+        """Return doc -> best score for records with a token containing `term`."""
+        keys = self._suffix_keys
+        lo = bisect.bisect_left(keys, term)
+        hi = bisect.bisect_left(keys, term + "\U0010ffff", lo)
+        scores: Dict[int, float] = {}
+        for start, tok in self._suffix_meta[lo:hi]:
+            kind = INFIX if start else (EXACT if tok == term else PREFIX)
+            for doc, weight in self._postings[tok].items():
+                s = weight * kind
+                if s > scores.get(doc, 0.0):
+                    scores[doc] = s
+        return scores
+
+    def _term_scores(self, term: str) -> Dict[int, float]:
+        scores = self.lookup(term)
+        alias = BRAND_ALIASES.get(term)
+        if alias:
+            expanded = _intersect([self.lookup(t) for t in alias])
+            for doc, s in expanded.items():
+                if s > scores.get(doc, 0.0):
+                    scores[doc] = s
+        return scores
+
+    def search(self, query: str) -> Optional[Dict[int, float]]:
+        """Return doc -> relevance for records matching every query term.
+
+        Returns None when the query has no indexable tokens (caller falls back
+        to a plain substring test).
+        """
+        terms = tokenize(query)
+        if not terms:
+            return None
+        # Rarest-first keeps intermediate intersections small
+        per_term = sorted((self._term_scores(t) for t in dict.fromkeys(terms)), key=len)
+        return _intersect(per_term)
+
+
+def _intersect(score_maps: Iterable[Dict[int, float]]) -> Dict[int, float]:
+    result: Optional[Dict[int, float]] = None
+    for m in score_maps:
+        if result is None:
+            result = dict(m)
+        else:
+            result = {doc: s + m[doc] for doc, s in result.items() if doc in m}
+        if not result:
+            return {}
+    return result or {}
+
+
+__all__ = ["BRAND_ALIASES", "TextIndex", "tokenize"]
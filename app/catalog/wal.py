@@ -0,0 +1,175 @@
+"""Append-only upsert log for the JSON catalog.
+
+Crawls used to end with load -> merge by URL -> rewrite of the whole
+`data/subwoofers.json`. With the log, upserts append one JSON line per record
+to `subwoofers.log.jsonl` next to the base file, so the write cost of a crawl
+is proportional to what it found. Readers replay base + log; `compact()` folds
+the log back into the base file (run in the background once the log exceeds a
+size threshold).
+
+Line formats: `{"op": "upsert", "record": {...}}` and `{"op": "delete", "url": "..."}`
+(bulk / predicate deletes). `append_log` starts every log with a
+`{"op": "base", "ino": .., "mtime_ns": .., "size": ..}` stamp of the base file
+it extends; once the base is rewritten by anything else (a restore, a test
+seeding the file, a crash between compaction steps) the stamp no longer
+matches, readers ignore the log and the next append starts a fresh one.
+Logs without a stamp (written before stamping) are replayed as before.
+Replay is idempotent, which lets compaction work crash-safely:
+1. rename the live log to `*.compacting` (new appends start a fresh log),
+2. write base + compacting ops to a temp file and atomically replace the base,
+3. delete the `*.compacting` file.
+Readers include the compacting file while it exists, so no state is lost in
+between.
+"""
+from __future__ import annotations
+import json, os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.atomic import atomic_write_text
+
+OP_UPSERT = "upsert"
+OP_DELETE = "delete"
+OP_BASE = "base"
+
+
+def log_path_for(base: Path) -> Path:
+    """`data/subwoofers.json` -> `data/subwoofers.log.jsonl`."""
+    return base.with_suffix(".log.jsonl")
+
+
+def compacting_path_for(base: Path) -> Path:
+    return base.with_suffix(".log.compacting")
+
+
+def _encode(ops: Iterable[Dict[str, Any]]) -> str:
+    return "".join(json.dumps(op, separators=(",", ":")) + "\n" for op in ops)
+
+
+def base_stamp(base: Path) -> Dict[str, Any]:
+    """Generation stamp of the base file (inode, mtime, size; zeros when missing)."""
+    try:
+        st = os.stat(base)
+    except OSError:
+        return {"op": OP_BASE, "ino": 0, "mtime_ns": 0, "size": 0}
+    return {"op": OP_BASE, "ino": st.st_ino, "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def is_current(base: Path, ops: List[Dict[str, Any]]) -> bool:
+    """False when `ops` (a whole log, read from offset 0) are stamped for another generation of `base`."""
+    if ops and ops[0].get("op") == OP_BASE:
+        return ops[0] == base_stamp(base)
+    return True
+
+
+def append_log(base: Path, ops: Iterable[Dict[str, Any]]) -> int:
+    """Append ops to the upsert log of `base`, starting a fresh stamped log when it is missing or stale.
+
+    Callers hold the base file's write lock.
+    """
+    ops = list(ops)
+    if not ops:
+        return 0
+    log = log_path_for(base)
+    head, _ = read_ops(log, limit=1)
+    if head and is_current(base, head):
+        return append_ops(log, ops)
+    payload = _encode([base_stamp(base)] + ops)  # new generation: replaces any stale log
+    atomic_write_text(log, payload)
+    return len(payload.encode("utf-8"))
+
+
+def append_ops(log_path: Path, ops: Iterable[Dict[str, Any]]) -> int:
+    """Append ops as JSON lines in one write; return bytes written."""
+    payload = _encode(ops).encode("utf-8")
+    if not payload:
+        return 0
+    with open(log_path, "ab") as fh:
+        fh.write(payload)
+        fh.flush()
+    return len(payload)
+
+
+def read_ops(log_path: Path, offset: int = 0, limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+    """Return ops appended after `offset` and the offset just past the last complete line.
+
+    A trailing partial line (writer mid-append or crash) is left for the next read;
+    malformed complete lines are skipped. With `limit`, only the first `limit` lines are read.
+    """
+    try:
+        with open(log_path, "rb") as fh:
+            fh.seek(offset)
+            data = b"".join(fh.readline() for _ in range(limit)) if limit is not None else fh.read()
+    except OSError:
+        return [], offset
+    end = data.rfind(b"\n") + 1
+    ops: List[Dict[str, Any]] = []
+    for line in data[:end].splitlines():
+        try:
+            op = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(op, dict):
+            ops.append(op)
+    return ops, offset + end
+
+
+def apply_ops(by_url: Dict[str, Any], ops: Iterable[Dict[str, Any]], convert=lambda rec: rec) -> None:
+    """Replay ops onto a url -> record mapping (insertion order = first-seen position)."""
+    for op in ops:
+        if op.get("op") == OP_UPSERT:
+            rec = op.get("record") or {}
+            url = rec.get("url")
+            if not url:
+                continue
+            try:
+                by_url[url] = convert(rec)
+            except Exception:
+                continue
+        elif op.get("op") == OP_DELETE:
+            by_url.pop(op.get("url"), None)
+
+
+def read_base(base: Path) -> List[Dict[str, Any]]:
+    """Raw record dicts from the base JSON file (any shape; [] when missing/corrupt)."""
+    try:
+        data = json.loads(base.read_text(encoding="utf-8"))
+    except Exception:
+        return []
+    return [d for d in data if isinstance(d, dict)] if isinstance(data, list) else []
+
+
+def write_base_atomic(base: Path, records: List[Dict[str, Any]]) -> None:
+    """Write the base file via temp file + rename so readers never see a torn file."""
+    atomic_write_text(base, json.dumps(records, indent=2))
+
+
+def compact(base: Path) -> bool:
+    """Fold the log into the base file. Returns False when there was nothing to do.
+
+    Callers serialize compaction with other writers of the same base file.
+    Works on raw dicts so records of any shape (full or lite) survive.
+    """
+    log = log_path_for(base)
+    compacting = compacting_path_for(base)
+    if not compacting.exists():
+        if not log.exists():
+            return False
+        os.replace(log, compacting)
+    ops, _ = read_ops(compacting)
+    if not is_current(base, ops):  # base rewritten since (e.g. crash after the replace below)
+        compacting.unlink()
+        return False
+    by_url: Dict[Any, Dict[str, Any]] = {}
+    for d in read_base(base):
+        by_url[d.get("url")] = d
+    apply_ops(by_url, ops)
+    write_base_atomic(base, list(by_url.values()))
+    compacting.unlink()
+    return True
+
+
+__all__ = [
+    "OP_BASE", "OP_DELETE", "OP_UPSERT", "append_log", "append_ops", "apply_ops", "base_stamp", "compact",
+    "compacting_path_for", "is_current", "log_path_for", "read_base", "read_ops", "write_base_atomic",
+]
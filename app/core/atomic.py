@@ -0,0 +1,36 @@
+"""Atomic file replacement helpers.
+
+Writers create a uniquely named temp file next to the target and
+`os.replace()` it into place, so concurrent readers see either the old or the
+new file, never a truncated one.
+"""
+from __future__ import annotations
+import os, threading
+from pathlib import Path
+from typing import Union
+
+PathLike = Union[str, Path]
+
+
+def _temp_path(path: Path) -> Path:
+    # Unique per process/thread so concurrent writers never share a temp file.
+    return path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def atomic_write_bytes(path: PathLike, data: bytes) -> None:
+    path = Path(path)
+    tmp = _temp_path(path)
+    try:
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def atomic_write_text(path: PathLike, text: str, encoding: str = "utf-8") -> None:
+    atomic_write_bytes(path, text.encode(encoding))
+
+
+__all__ = ["atomic_write_bytes", "atomic_write_text"]
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Optional
 try:
     from pydantic_settings import BaseSettings  # type: ignore
 except ImportError:  # Provide clear guidance if dependency missing
@@ -14,6 +15,28 @@ class Settings(BaseSettings):
     environment: str = "dev"
     debug: bool = True
     version: str = "0.1.0"
+    scrape_pool_max_connections: int = 10  # shared scraper HTTP clients: connections per host
+    scrape_pool_max_keepalive: int = 5  # idle keep-alive connections kept per host
+    scrape_pool_keepalive_expiry: float = 30.0  # seconds before an idle connection is dropped
+    scrape_rate_per_host: float = 2.0  # scraper requests/second per host (0 disables the limiter)
+    scrape_burst_per_host: int = 4  # requests a host may receive back to back before throttling
+    scrape_rate_jitter: float = 0.25  # max random extra seconds added to throttled requests
+    scrape_cache_enabled: bool = True  # on-disk response cache for scraper GETs (ETag / Last-Modified revalidation)
+    scrape_cache_dir: str = "data/http_cache"
+    scrape_cache_ttl: float = 3600.0  # seconds a cached page is served without contacting the site
+    scrape_cache_max_bytes: int = 256 << 20  # compressed bodies kept before LRU eviction
+    scrape_cache_offline: bool = False  # serve cached pages regardless of age; misses fail (offline replay)
+    # Subwoofer catalog backend: "json" (data/subwoofers.json) or "sqlite"
+    subwoofer_store: str = "json"
+    subwoofer_sqlite_path: Optional[str] = None  # default: <json db>.sqlite3 alongside it
+    subwoofer_log_compact_bytes: int = 1 << 20  # JSON backend: compact upsert log past this size
+    subwoofer_dedupe: bool = True  # collapse cross-retailer duplicates into one record with offers
+    subwoofer_binary_snapshot: bool = True  # JSON backend: write/mmap data/subwoofers.snap for cold loads
+    subwoofer_history: bool = True  # append per-record price/spec deltas to <db>.history.jsonl
+    subwoofer_snapshot_keep_last: int = 5  # subwoofers/<size>/snapshot_*.json kept as plain JSON
+    subwoofer_snapshot_keep_daily: int = 7  # then newest per day for this many days (gzipped deltas)
+    subwoofer_snapshot_keep_weekly: int = 4  # and newest per ISO week for this many weeks
+    subwoofer_changes_buffer: int = 1024  # change events kept for /subwoofers/changes (0 disables the feed)
 
     class Config:  # type: ignore
         env_file = ".env"
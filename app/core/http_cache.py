@@ -0,0 +1,83 @@
+"""Conditional GET helpers (ETag / Last-Modified / 304).
+
+Read endpoints compute a validator from cheap change tokens (file stats, the
+catalog signature) *before* loading or serializing anything, answer 304 when
+the client already holds that representation, and otherwise attach the
+validator headers to the fresh response.
+
+Usage in a route:
+
+    validator = Validator.from_parts(store.change_token(), request.url.query, mtime=store.last_modified())
+    if (resp := validator.not_modified(request)) is not None:
+        return resp
+    ...
+    return validator.apply(JSONResponse(payload))
+"""
+from __future__ import annotations
+import hashlib
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+from app.core.config import get_settings
+
+# Clients/CDNs may store the payload but must revalidate before reuse.
+CACHE_CONTROL = "no-cache"
+
+
+@dataclass(frozen=True)
+class Validator:
+    etag: str  # quoted entity tag, e.g. '"3f2a..."'
+    last_modified: Optional[float] = None  # POSIX seconds
+
+    @classmethod
+    def from_parts(cls, *parts: Any, mtime: Optional[float] = None) -> "Validator":
+        """Build a strong ETag from `parts` (plus the app version, so deploys revalidate)."""
+        raw = repr((get_settings().version,) + parts).encode("utf-8")
+        return cls('"' + hashlib.sha1(raw).hexdigest()[:20] + '"', mtime)
+
+    def headers(self) -> dict:
+        headers = {"ETag": self.etag, "Cache-Control": CACHE_CONTROL}
+        if self.last_modified:
+            headers["Last-Modified"] = formatdate(self.last_modified, usegmt=True)
+        return headers
+
+    def matches(self, request: Request) -> bool:
+        """True if the request's If-None-Match / If-Modified-Since is still current."""
+        inm = request.headers.get("if-none-match")
+        if inm is not None:
+            # If-None-Match takes precedence; weak comparison per RFC 9110 13.1.2
+            tags = {t.strip().removeprefix("W/") for t in inm.split(",")}
+            return "*" in tags or self.etag in tags
+        ims = request.headers.get("if-modified-since")
+        if ims and self.last_modified:
+            try:
+                since = parsedate_to_datetime(ims).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(self.last_modified) <= since
+        return False
+
+    def not_modified(self, request: Request) -> Optional[Response]:
+        """Return a bodiless 304 response if the client's copy is current, else None."""
+        if self.matches(request):
+            return Response(status_code=304, headers=self.headers())
+        return None
+
+    def apply(self, response: Response) -> Response:
+        response.headers.update(self.headers())
+        return response
+
+
+def file_validator(path, *parts: Any) -> Optional[Validator]:
+    """Validator from a file's (mtime_ns, size); None when the file is missing."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return Validator.from_parts(str(path), st.st_mtime_ns, st.st_size, *parts, mtime=st.st_mtime)
+
+
+__all__ = ["CACHE_CONTROL", "Validator", "file_validator"]
@@ -0,0 +1,171 @@
+"""Cross-process write coordination for shared JSON data files.
+
+With several uvicorn workers (`UVICORN_WORKERS`), every read-modify-write of a
+shared file under `data/` must be serialized across processes, not just
+threads. `WriteCoordinator(path)` provides:
+
+- an advisory exclusive lock on `<file>.lock` (`fcntl.flock`; `msvcrt` on
+  Windows; no-op elsewhere), re-entrant within a process and combined with a
+  thread lock, so nested writers (e.g. a merge that compacts first) are fine;
+- a monotonically increasing version counter in `<file>.version`, bumped
+  atomically when a write section exits. Readers (the in-memory catalog) fold
+  it into their cheap change signature, so other workers notice a write on
+  their next access even when mtime granularity hides it.
+
+Writers combine it with `atomic_write_text` (temp file + `os.replace`):
+
+    with get_coordinator(DB_PATH).write():
+        data = load(); data.update(...); atomic_write_text(DB_PATH, dump(data))
+"""
+from __future__ import annotations
+import os, threading, time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+
+try:
+    import fcntl  # type: ignore
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore
+try:
+    import msvcrt  # type: ignore
+except ImportError:
+    msvcrt = None  # type: ignore
+
+from app.core.atomic import atomic_write_text
+
+PathLike = Union[str, Path]
+
+
+def lock_path_for(path: PathLike) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + ".lock")
+
+
+def version_path_for(path: PathLike) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + ".version")
+
+
+def read_version(path: PathLike) -> int:
+    """Current write version of `path` (0 if it was never written under a coordinator)."""
+    try:
+        with open(version_path_for(path), "rb") as fh:
+            return int(fh.read() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def _lock_fd(fh) -> None:
+    if fcntl is not None:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+    elif msvcrt is not None:  # pragma: no cover - Windows
+        while True:
+            try:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:  # LK_LOCK gives up after ~10s; keep waiting
+                time.sleep(0.05)
+
+
+def _unlock_fd(fh) -> None:
+    if fcntl is not None:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+    elif msvcrt is not None:  # pragma: no cover - Windows
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class FileLock:
+    """Re-entrant exclusive lock held across threads and processes."""
+
+    def __init__(self, path: PathLike):
+        self.path = Path(path)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fh = None
+
+    def acquire(self) -> None:
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fh = open(self.path, "a+b")
+                try:
+                    _lock_fd(fh)
+                except BaseException:
+                    fh.close()
+                    raise
+            except BaseException:
+                self._thread_lock.release()
+                raise
+            self._fh = fh
+        self._depth += 1
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            fh, self._fh = self._fh, None
+            try:
+                _unlock_fd(fh)
+            finally:
+                fh.close()
+        self._thread_lock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+class WriteCoordinator:
+    """Lock + version counter for one shared data file."""
+
+    def __init__(self, path: PathLike):
+        self.path = Path(path)
+        self.lock = FileLock(lock_path_for(self.path))
+        self.version_path = version_path_for(self.path)
+
+    @contextmanager
+    def write(self) -> Iterator["WriteCoordinator"]:
+        """Exclusive write section; bumps the version when the outermost section exits."""
+        with self.lock:
+            outermost = self.lock._depth == 1
+            try:
+                yield self
+            finally:
+                if outermost:
+                    self.bump()
+
+    def version(self) -> int:
+        return read_version(self.path)
+
+    def bump(self) -> int:
+        with self.lock:
+            version = self.version() + 1
+            atomic_write_text(self.version_path, str(version))
+            return version
+
+
+_COORDINATORS: Dict[str, WriteCoordinator] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_coordinator(path: PathLike) -> WriteCoordinator:
+    """Process-wide coordinator for `path` (one lock object per absolute path)."""
+    key = os.path.abspath(path)
+    coord = _COORDINATORS.get(key)
+    if coord is None:
+        with _REGISTRY_LOCK:
+            coord = _COORDINATORS.get(key)
+            if coord is None:
+                coord = _COORDINATORS[key] = WriteCoordinator(Path(path))
+    return coord
+
+
+__all__ = [
+    "FileLock", "WriteCoordinator", "get_coordinator", "lock_path_for", "read_version", "version_path_for",
+]
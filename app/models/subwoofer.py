@@ -0,0 +1,196 @@
+"""Single in-memory record type for subwoofers from every source.
+
+`Subwoofer` is a slotted dataclass (no per-instance `__dict__`), and its
+low-cardinality `source` / `brand` strings are interned so a large catalog
+shares one copy of each. Scrapers that only see a few attributes (Crutchfield,
+Sonic Electronix) build the same type with `LITE_FIELDS` filled and the rest
+left `None`; `from_any()` converts the other shapes found in the tree (dicts
+from `data/subwoofers.json`, legacy dataclasses, `SubwooferSchema`), and
+`merge_records()` is the one place a partial crawl is folded into a stored
+record.
+"""
+from __future__ import annotations
+import json, math, sys
+from dataclasses import asdict, dataclass, fields, is_dataclass, replace
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+@dataclass(slots=True, frozen=True)
+class Offer:
+    """One retailer listing of a product (see `app/catalog/dedup.py`)."""
+    source: str
+    url: str
+    price_usd: Optional[float] = None
+    scraped_at: float = 0.0
+
+
+@dataclass(slots=True)
+class Subwoofer:
+    """Full subwoofer record as persisted in `data/subwoofers.json`.
+
+    Field order is the storage column order (`sqlite_store` builds records
+    positionally from rows).
+    """
+    source: str
+    url: str
+    brand: str
+    model: str
+    size_in: Optional[float] = None
+    rms_w: Optional[int] = None
+    peak_w: Optional[int] = None
+    impedance_ohm: Optional[float] = None
+    sensitivity_db: Optional[float] = None
+    mounting_depth_in: Optional[float] = None
+    cutout_diameter_in: Optional[float] = None
+    displacement_cuft: Optional[float] = None
+    recommended_box: Optional[str] = None
+    price_usd: Optional[float] = None
+    image: Optional[str] = None
+    scraped_at: float = 0.0
+    # Per-retailer listings merged into this canonical record (None = single listing)
+    offers: Optional[Tuple[Offer, ...]] = None
+
+    def __post_init__(self) -> None:
+        if type(self.source) is str:
+            self.source = sys.intern(self.source)
+        if type(self.brand) is str:
+            self.brand = sys.intern(self.brand)
+        if self.offers is not None:
+            self.offers = decode_offers(self.offers)
+
+    def to_dict(self, only: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Plain dict of all fields, or just `only` (e.g. `LITE_FIELDS` for lite responses)."""
+        if only is None:
+            return asdict(self)
+        return {f: getattr(self, f) for f in only}
+
+
+def decode_offers(value: Any) -> Optional[Tuple[Offer, ...]]:
+    """Offers from a JSON string, a list of dicts or Offer objects (None stays None)."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = json.loads(value)
+    return tuple(o if isinstance(o, Offer) else Offer(**o) for o in value)
+
+
+def encode_offers(offers: Optional[Tuple[Offer, ...]]) -> Optional[str]:
+    """Compact JSON text for storage columns (SQLite, binary snapshot)."""
+    if offers is None:
+        return None
+    return json.dumps([asdict(o) for o in offers], separators=(",", ":"))
+
+
+FIELD_NAMES: Tuple[str, ...] = tuple(f.name for f in fields(Subwoofer))
+
+# Attributes the lightweight scrapers (crutchfield, sonic) extract
+LITE_FIELDS: Tuple[str, ...] = (
+    "source", "url", "brand", "model", "size_in", "rms_w", "price_usd", "scraped_at",
+)
+
+# `SubwooferSchema` attribute -> record field
+SCHEMA_ALIASES: Dict[str, str] = {
+    "name": "model",
+    "size_in_inches": "size_in",
+    "rms_watts": "rms_w",
+    "max_watts": "peak_w",
+    "impedance_ohms": "impedance_ohm",
+    "price": "price_usd",
+    "product_url": "url",
+}
+
+_FIELD_SET = frozenset(FIELD_NAMES)
+
+# Numeric fields and the type they are stored as (sorting, facets and dedup compare them as numbers)
+_INT_FIELDS = frozenset({"rms_w", "peak_w"})
+_NUMERIC_FIELDS = frozenset({
+    "size_in", "rms_w", "peak_w", "impedance_ohm", "sensitivity_db", "mounting_depth_in",
+    "cutout_diameter_in", "displacement_cuft", "price_usd", "scraped_at",
+})
+_TEXT_FIELDS = frozenset({"source", "brand", "model", "recommended_box", "image"})
+
+
+def _number(name: str, value: Any) -> Any:
+    """`value` as the field's numeric type; numeric strings are converted, anything else raises."""
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise TypeError(f"{name}: expected a number, got {type(value).__name__}")
+    number = float(value)  # ValueError for non-numeric strings
+    if not math.isfinite(number):
+        raise ValueError(f"{name}: {value!r} is not a finite number")
+    if name in _INT_FIELDS:
+        if not number.is_integer():
+            raise ValueError(f"{name}: {value!r} is not a whole number")
+        return int(number)
+    return number
+
+
+def _as_mapping(obj: Any) -> Dict[str, Any]:
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    if hasattr(obj, "model_dump"):  # pydantic (SubwooferSchema)
+        return obj.model_dump()
+    return dict(obj)
+
+
+def provided_fields(obj: Any) -> Tuple[str, ...]:
+    """Record fields that `obj`'s shape carries (e.g. only `LITE_FIELDS` for a lite dict)."""
+    if isinstance(obj, Subwoofer):
+        return FIELD_NAMES
+    keys = {SCHEMA_ALIASES.get(k, k) for k in _as_mapping(obj)}
+    return tuple(f for f in FIELD_NAMES if f in keys)
+
+
+def from_any(obj: Any) -> Subwoofer:
+    """Convert a dict, dataclass (full or lite) or `SubwooferSchema` to a `Subwoofer`.
+
+    Missing optional fields become `None` (missing source/brand/model: `""`); keys that are not record fields are
+    ignored (e.g. the schema's `frequency_range_hz`, Crutchfield's cutout
+    annotations). Numeric strings in numeric fields are converted; raises
+    `TypeError` when the record has no `url` or a field has the wrong type, and
+    `ValueError` for a non-numeric / non-finite value in a numeric field.
+    """
+    if isinstance(obj, Subwoofer):
+        return obj
+    data = _as_mapping(obj)
+    kwargs: Dict[str, Any] = {}
+    for key, value in data.items():
+        name = SCHEMA_ALIASES.get(key, key)
+        if name in _FIELD_SET and (name not in kwargs or value is not None):
+            kwargs[name] = value
+    if "url" not in kwargs:
+        raise TypeError("subwoofer record without url")
+    if kwargs["url"] is not None and not isinstance(kwargs["url"], str):
+        kwargs["url"] = str(kwargs["url"])  # pydantic HttpUrl
+    for name in ("source", "brand", "model"):
+        kwargs.setdefault(name, "")
+    for name, value in kwargs.items():
+        if value is None:
+            continue
+        if name in _NUMERIC_FIELDS:
+            if type(value) is not (int if name in _INT_FIELDS else float):
+                kwargs[name] = _number(name, value)
+        elif name in _TEXT_FIELDS and not isinstance(value, str):
+            raise TypeError(f"{name}: expected a string, got {type(value).__name__}")
+    return Subwoofer(**kwargs)
+
+
+def merge_records(existing: Optional[Subwoofer], incoming: Any,
+                  only: Optional[Iterable[str]] = None) -> Subwoofer:
+    """Fold `incoming` into `existing` (same URL).
+
+    Only fields in `only` (default: the fields `incoming`'s shape carries) are
+    taken from `incoming`, and a `None` never erases a known value, so a lite
+    crawl refreshes price/RMS without wiping specs a richer source stored.
+    """
+    names = tuple(only) if only is not None else provided_fields(incoming)
+    record = from_any(incoming)
+    if existing is None:
+        return record
+    changes = {f: getattr(record, f) for f in names if getattr(record, f) is not None}
+    return replace(existing, **changes) if changes else existing
+
+
+__all__ = [
+    "FIELD_NAMES", "LITE_FIELDS", "Offer", "SCHEMA_ALIASES", "Subwoofer", "decode_offers", "encode_offers",
+    "from_any", "merge_records", "provided_fields",
+]
@@ -0,0 +1,182 @@
+"""Shared, lifespan-managed `httpx.AsyncClient` registry for all scrapers.
+
+Scrapers used to open a client per request (collect endpoints) or even per
+URL and retry (`fetcher.fetch_html`, JL Audio / Sundown helpers), throwing
+away TCP/TLS sessions and HTTP/2 connections every time. They now borrow a
+long-lived client from this registry instead:
+
+    client = await get_client(url)
+    resp = await client.get(url, headers=..., timeout=...)
+
+- One client per origin (scheme://host:port) and event loop, so pool limits
+  (`SCRAPE_POOL_MAX_CONNECTIONS`, `SCRAPE_POOL_MAX_KEEPALIVE`,
+  `SCRAPE_POOL_KEEPALIVE_EXPIRY`) apply per host and keep-alive connections
+  are reused across requests. HTTP/2 is enabled when `h2` is installed.
+- Borrowed clients must not be closed by callers; the app lifespan
+  (`lifespan()` in `main.get_application`) closes them on shutdown.
+- A request hook counts requests and new TCP connections / TLS handshakes per
+  origin (httpcore trace events), reported as `http_pool` in
+  `/subwoofers/metrics`; `reused` = requests served on an existing connection.
+
+Clients are created through `ensure_async_client`, so tests that monkeypatch
+`httpx.AsyncClient` keep working. With `SCRAPE_CACHE_ENABLED` (default) their
+transport is wrapped in the on-disk response cache (`response_cache.py`).
+"""
+from __future__ import annotations
+import asyncio, threading, weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, MutableMapping, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import get_settings
+from .http_utils import DEFAULT_TIMEOUT, aclose_safely, ensure_async_client
+from .response_cache import CachingTransport, get_cache
+
+try:
+    import h2  # type: ignore  # noqa: F401
+    HTTP2 = True
+except ImportError:  # pragma: no cover - optional dependency
+    HTTP2 = False
+
+
+def origin_of(url: str) -> str:
+    """`https://Example.com/a?b` -> `https://example.com` (default ports dropped)."""
+    parts = urlsplit(url)
+    scheme = (parts.scheme or "http").lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port is None or (scheme, port) in (("http", 80), ("https", 443)):
+        return f"{scheme}://{host}"
+    return f"{scheme}://{host}:{port}"
+
+
+class ClientRegistry:
+    """Per-(event loop, origin) `httpx.AsyncClient` instances plus reuse counters."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._clients: MutableMapping[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self.clients_created = 0
+        self.clients_closed = 0
+
+    def _stats_for(self, origin: str) -> Dict[str, int]:
+        with self._lock:
+            return self._stats.setdefault(origin, {"requests": 0, "connections": 0, "tls_handshakes": 0})
+
+    def _request_hook(self, origin: str):
+        stats = self._stats_for(origin)
+
+        async def trace(event: str, info: Dict[str, Any]) -> None:
+            if event == "connection.connect_tcp.complete":
+                stats["connections"] += 1
+            elif event == "connection.start_tls.complete":
+                stats["tls_handshakes"] += 1
+
+        async def hook(request: httpx.Request) -> None:
+            stats["requests"] += 1
+            request.extensions.setdefault("trace", trace)
+
+        return hook
+
+    async def _create(self, origin: str) -> httpx.AsyncClient:
+        settings = get_settings()
+        limits = httpx.Limits(
+            max_connections=settings.scrape_pool_max_connections,
+            max_keepalive_connections=settings.scrape_pool_max_keepalive,
+            keepalive_expiry=settings.scrape_pool_keepalive_expiry,
+        )
+        extra: Dict[str, Any] = {}
+        if settings.scrape_cache_enabled:
+            # GETs go through the on-disk response cache (response_cache.py) before the pooled transport
+            extra["transport"] = CachingTransport(httpx.AsyncHTTPTransport(http2=HTTP2, limits=limits), get_cache())
+        client = await ensure_async_client(
+            follow_redirects=True, http2=HTTP2, timeout=DEFAULT_TIMEOUT, limits=limits,
+            event_hooks={"request": [self._request_hook(origin)]}, **extra,
+        )
+        with self._lock:
+            self.clients_created += 1
+        return client
+
+    async def get(self, url: str) -> httpx.AsyncClient:
+        """Borrow the shared client for `url`'s origin on the running event loop (do not close it)."""
+        loop = asyncio.get_running_loop()
+        origin = origin_of(url)
+        with self._lock:
+            for stale in [lp for lp in self._clients if lp.is_closed()]:
+                del self._clients[stale]  # their connections died with the loop
+            clients = self._clients.setdefault(loop, {})
+            client = clients.get(origin)
+        if client is not None and not getattr(client, "is_closed", False):
+            return client
+        created = await self._create(origin)
+        with self._lock:
+            current = clients.get(origin)
+            if current is None or getattr(current, "is_closed", False):
+                clients[origin] = created
+                return created
+        await aclose_safely(created)  # another task won the race
+        return current
+
+    async def aclose(self) -> None:
+        """Close the clients owned by the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._clients.pop(loop, {})
+        for client in clients.values():
+            await aclose_safely(client)
+        with self._lock:
+            self.clients_closed += len(clients)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            hosts = {}
+            for origin, s in sorted(self._stats.items()):
+                reused = max(0, s["requests"] - s["connections"])
+                hosts[origin] = dict(s, reused=reused,
+                                     reuse_ratio=round(reused / s["requests"], 3) if s["requests"] else None)
+            open_clients = sum(len(c) for loop, c in self._clients.items() if not loop.is_closed())
+            created, closed = self.clients_created, self.clients_closed
+        settings = get_settings()
+        return {
+            "http2": HTTP2,
+            "limits_per_host": {
+                "max_connections": settings.scrape_pool_max_connections,
+                "max_keepalive_connections": settings.scrape_pool_max_keepalive,
+                "keepalive_expiry": settings.scrape_pool_keepalive_expiry,
+            },
+            "clients_open": open_clients,
+            "clients_created": created,
+            "clients_closed": closed,
+            "hosts": hosts,
+        }
+
+
+_REGISTRY = ClientRegistry()
+
+
+def get_registry() -> ClientRegistry:
+    return _REGISTRY
+
+
+async def get_client(url: str) -> httpx.AsyncClient:
+    """Shorthand for `get_registry().get(url)`."""
+    return await _REGISTRY.get(url)
+
+
+@asynccontextmanager
+async def lifespan(app: Optional[Any] = None) -> AsyncIterator[None]:
+    """App lifespan hook: exposes the registry as `app.state.http_clients` and closes its clients on shutdown."""
+    if app is not None:
+        app.state.http_clients = _REGISTRY
+    try:
+        yield None  # no lifespan state; the registry lives on app.state
+    finally:
+        await _REGISTRY.aclose()
+
+
+__all__ = ["ClientRegistry", "HTTP2", "get_client", "get_registry", "lifespan", "origin_of"]
@@ -2,6 +2,9 @@
 from typing import Optional
 import httpx
 
+from app.scraping.client_pool import get_client
+from app.scraping.rate_limit import get_limiter
+
 DEFAULT_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0 Safari/537.36",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
@@ -11,13 +14,16 @@ DEFAULT_HEADERS = {
 async def fetch_html(url: str, timeout: float = 10.0) -> Optional[str]:
     """Fetch raw HTML from a URL.
 
-    Returns None on network errors or non-200 status.
+    Returns None on network errors or non-200 status. Uses the shared
+    per-host client (`client_pool.py`), so connections are reused across calls,
+    and waits for the host's request budget (`rate_limit.py`) first.
     """
     try:
-        async with httpx.AsyncClient(timeout=timeout, headers=DEFAULT_HEADERS) as client:
-            resp = await client.get(url)
-            if resp.status_code != 200:
-                return None
-            return resp.text
+        await get_limiter().acquire(url)
+        client = await get_client(url)
+        resp = await client.get(url, headers=DEFAULT_HEADERS, timeout=timeout)
+        if resp.status_code != 200:
+            return None
+        return resp.text
     except httpx.HTTPError:
         return None
@@ -11,6 +11,9 @@ from typing import List, Dict, Any, Optional
 import httpx
 from bs4 import BeautifulSoup
 
+from app.scraping.client_pool import get_client
+from app.scraping.rate_limit import get_limiter
+
 JLAUDIO_PAGE = "https://www.jlaudio.com/collections/car-subwoofers"  # collection page
 UA_POOL = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36",
@@ -32,10 +35,12 @@ async def _fetch_html(url: str, retries: int = 3, timeout: float = 25.0) -> Opti
             "Referer": url,
         }
         try:
-            async with httpx.AsyncClient(follow_redirects=True, timeout=timeout) as client:
-                resp = await client.get(url, headers=headers)
-                resp.raise_for_status()
-                return resp.text
+            # Shared per-host client: retries reuse the pooled connection / TLS session
+            await get_limiter().acquire(url)  # per-host budget, retries included
+            client = await get_client(url)
+            resp = await client.get(url, headers=headers, timeout=timeout)
+            resp.raise_for_status()
+            return resp.text
         except Exception as exc:  # noqa: BLE001
             last_exc = exc
             attempt += 1
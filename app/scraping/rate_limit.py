@@ -0,0 +1,152 @@
+"""Per-host async token-bucket rate limiting for scrapers.
+
+Politeness used to be a fixed `sleep()` after every request, which made
+crawls serial, while the collect endpoints ran product fetches concurrently
+with no per-host cap at all. Fetch helpers now ask the limiter for a slot
+before each request instead:
+
+    await get_limiter().acquire(url)
+    resp = await client.get(url, ...)
+
+- Each host has a bucket refilled at `rate` tokens/second holding at most
+  `burst` tokens (`SCRAPE_RATE_PER_HOST`, `SCRAPE_BURST_PER_HOST`). Concurrent
+  fetches run freely while tokens last and queue behind each other once
+  the budget is spent, so the per-host requests-per-second limit holds
+  however many tasks are crawling.
+- Throttled requests also wait an extra `uniform(0, jitter)` seconds
+  (`SCRAPE_RATE_JITTER`) so the steady-state pace is not perfectly regular.
+- `configure(host, ...)` overrides the defaults for one site (scrapers with
+  their own politeness settings register them at import / call time).
+  `rate <= 0` disables limiting.
+
+Reservations are taken under a thread lock and only the wait happens on the
+event loop, so one limiter serves every loop and thread in the process.
+Per-host counters are reported as `rate_limits` in `/subwoofers/metrics`.
+"""
+from __future__ import annotations
+import asyncio, random, threading, time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from app.core.config import get_settings
+
+
+def host_of(url: str) -> str:
+    """`https://WWW.Example.com/a` -> `www.example.com` (bare host names pass through)."""
+    if "://" not in url:
+        return url.strip().lower()
+    return (urlsplit(url).hostname or "").lower()
+
+
+class TokenBucket:
+    """Token bucket with reservation semantics: `reserve()` always takes a token, possibly on credit."""
+
+    def __init__(self, rate: float, burst: int = 1, jitter: float = 0.0):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.jitter = max(0.0, float(jitter))
+        self._tokens = float(self.burst)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.throttled = 0
+        self.waited = 0.0
+
+    def reserve(self, now: Optional[float] = None) -> float:
+        """Take one token; returns the seconds to wait before using it (0 when one was available)."""
+        if self.rate <= 0:
+            with self._lock:
+                self.acquired += 1
+            return 0.0
+        with self._lock:
+            now = time.monotonic() if now is None else now
+            self._tokens = min(float(self.burst), self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= 1.0
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.acquired += 1
+            if wait > 0:
+                self.throttled += 1
+                self.waited += wait
+            return wait
+
+    async def acquire(self) -> float:
+        wait = self.reserve()
+        if wait > 0 and self.jitter:
+            extra = random.uniform(0.0, self.jitter)
+            with self._lock:
+                self.waited += extra
+            wait += extra
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"rate": self.rate, "burst": self.burst, "jitter": self.jitter, "acquired": self.acquired,
+                    "throttled": self.throttled, "waited_sec": round(self.waited, 3)}
+
+
+class HostRateLimiter:
+    """One `TokenBucket` per host, created on first use from the defaults or a `configure()` override."""
+
+    def __init__(self, rate: float, burst: int = 1, jitter: float = 0.0):
+        self.rate, self.burst, self.jitter = rate, burst, jitter
+        self._lock = threading.Lock()
+        self._overrides: Dict[str, Tuple[float, int, float]] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def configure(self, host: str, rate: Optional[float] = None, burst: Optional[int] = None,
+                  jitter: Optional[float] = None) -> TokenBucket:
+        """Set per-host limits (unset values keep the defaults); replaces the host's bucket when they change."""
+        host = host_of(host)
+        spec = (float(self.rate if rate is None else rate), max(1, int(self.burst if burst is None else burst)),
+                max(0.0, float(self.jitter if jitter is None else jitter)))
+        with self._lock:
+            self._overrides[host] = spec
+            bucket = self._buckets.get(host)
+            if bucket is None or (bucket.rate, bucket.burst, bucket.jitter) != spec:
+                bucket = self._buckets[host] = TokenBucket(*spec)
+            return bucket
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = host_of(url)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                spec = self._overrides.get(host, (self.rate, self.burst, self.jitter))
+                bucket = self._buckets[host] = TokenBucket(*spec)
+            return bucket
+
+    async def acquire(self, url: str) -> float:
+        """Wait for `url`'s host budget; returns the seconds waited."""
+        return await self.bucket(url).acquire()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            buckets = sorted(self._buckets.items())
+        return {
+            "defaults": {"rate": self.rate, "burst": self.burst, "jitter": self.jitter},
+            "hosts": {host: b.stats() for host, b in buckets},
+        }
+
+
+_LIMITER: Optional[HostRateLimiter] = None
+_LIMITER_LOCK = threading.Lock()
+
+
+def get_limiter() -> HostRateLimiter:
+    """Process-wide limiter built from `SCRAPE_RATE_PER_HOST` / `SCRAPE_BURST_PER_HOST` / `SCRAPE_RATE_JITTER`."""
+    global _LIMITER
+    limiter = _LIMITER
+    if limiter is None:
+        with _LIMITER_LOCK:
+            limiter = _LIMITER
+            if limiter is None:
+                settings = get_settings()
+                limiter = _LIMITER = HostRateLimiter(settings.scrape_rate_per_host, settings.scrape_burst_per_host,
+                                                     settings.scrape_rate_jitter)
+    return limiter
+
+
+__all__ = ["HostRateLimiter", "TokenBucket", "get_limiter", "host_of"]
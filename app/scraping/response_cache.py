@@ -0,0 +1,282 @@
+"""On-disk HTTP response cache with conditional revalidation for scraper fetches.
+
+Repeat crawls used to download every listing and product page again. The
+shared clients (`client_pool.py`) now send GETs through `CachingTransport`,
+which consults a `ResponseCache` under `SCRAPE_CACHE_DIR`:
+
+- entry younger than `SCRAPE_CACHE_TTL` -> served from disk, no request;
+- older entry -> refetched with `If-None-Match` / `If-Modified-Since`; a 304
+  reuses the cached body and restarts the TTL;
+- 200 responses (without `Cache-Control: no-store`) are stored.
+
+Layout: `meta/<sha1(url)>.json` per URL (stored headers incl. validators,
+timestamps, body hash) and content-addressed bodies
+`bodies/<sha256[:2]>/<sha256>.z` (zlib), so identical pages share one file.
+Total body bytes are bounded by `SCRAPE_CACHE_MAX_BYTES`; the least recently
+used URLs are evicted first and orphaned bodies removed.
+
+`SCRAPE_CACHE_OFFLINE=1` serves any cached entry regardless of age and
+fails misses with `httpx.ConnectError`, which lets tests and local runs
+replay previously crawled pages without network. Requests that already
+carry their own conditional headers bypass the cache. Responses carry an
+`X-Cache: HIT | REVALIDATED | MISS` header; counters appear as `http_cache`
+in `/subwoofers/metrics`.
+"""
+from __future__ import annotations
+import asyncio, hashlib, json, os, threading, time, zlib
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.atomic import atomic_write_bytes, atomic_write_text
+from app.core.config import get_settings
+
+# Response headers kept with a cached body (enough to decode and revalidate it). Bodies are
+# stored decoded (`aread()` undoes Content-Encoding), so encoding/length headers are not kept.
+STORED_HEADERS = ("content-type", "etag", "last-modified")
+_DROPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    body: str  # sha256 of the decoded body
+    size: int  # compressed bytes on disk
+    headers: Dict[str, str] = field(default_factory=dict)
+    stored_at: float = 0.0  # last 200 / 304 from the origin
+    accessed_at: float = 0.0
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get("etag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get("last-modified")
+
+
+def _url_key(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """URL -> `CacheEntry` index over a content-addressed body store with LRU eviction."""
+
+    def __init__(self, root: Path, ttl: float = 3600.0, max_bytes: int = 256 << 20, offline: bool = False):
+        self.root = Path(root)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, CacheEntry]] = None
+        self._refs: Dict[str, int] = {}  # body hash -> referencing URLs
+        self._sizes: Dict[str, int] = {}  # body hash -> compressed bytes
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    # ---- paths ----
+    def _meta_path(self, url: str) -> Path:
+        return self.root / "meta" / f"{_url_key(url)}.json"
+
+    def _body_path(self, digest: str) -> Path:
+        return self.root / "bodies" / digest[:2] / f"{digest}.z"
+
+    # ---- index ----
+    def _index(self) -> Dict[str, CacheEntry]:
+        if self._entries is None:
+            entries: Dict[str, CacheEntry] = {}
+            meta_dir = self.root / "meta"
+            if meta_dir.is_dir():
+                for p in meta_dir.glob("*.json"):
+                    try:
+                        entry = CacheEntry(**json.loads(p.read_text(encoding="utf-8")))
+                    except (OSError, ValueError, TypeError):
+                        continue
+                    entries[entry.url] = entry
+            self._entries = entries
+            for entry in entries.values():
+                self._ref(entry)
+        return self._entries
+
+    def _ref(self, entry: CacheEntry) -> None:
+        self._refs[entry.body] = self._refs.get(entry.body, 0) + 1
+        self._sizes[entry.body] = entry.size
+
+    def _unref(self, entry: CacheEntry) -> None:
+        left = self._refs.get(entry.body, 0) - 1
+        if left > 0:
+            self._refs[entry.body] = left
+            return
+        self._refs.pop(entry.body, None)
+        self._sizes.pop(entry.body, None)
+        self._body_path(entry.body).unlink(missing_ok=True)
+
+    def _write_meta(self, entry: CacheEntry) -> None:
+        self._meta_path(entry.url).parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(self._meta_path(entry.url), json.dumps(asdict(entry)))
+
+    def _drop(self, entry: CacheEntry) -> None:
+        self._index().pop(entry.url, None)
+        self._meta_path(entry.url).unlink(missing_ok=True)
+        self._unref(entry)
+
+    # ---- public API ----
+    def get(self, url: str) -> Optional[CacheEntry]:
+        with self._lock:
+            return self._index().get(url)
+
+    def is_fresh(self, entry: CacheEntry, now: Optional[float] = None) -> bool:
+        return self.offline or ((time.time() if now is None else now) - entry.stored_at) < self.ttl
+
+    def read_body(self, entry: CacheEntry) -> Optional[bytes]:
+        """Cached body, or None (and the entry is dropped) when the body file is gone or corrupt."""
+        try:
+            return zlib.decompress(self._body_path(entry.body).read_bytes())
+        except (OSError, zlib.error):
+            with self._lock:
+                if self._index().get(entry.url) is entry:
+                    self._drop(entry)
+            return None
+
+    def touch(self, entry: CacheEntry, revalidated: bool = False, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        with self._lock:
+            entry.accessed_at = now
+            if revalidated:
+                entry.stored_at = now
+            if self._index().get(entry.url) is entry:
+                self._write_meta(entry)
+
+    def store(self, url: str, headers: httpx.Headers, body: bytes, now: Optional[float] = None) -> CacheEntry:
+        now = time.time() if now is None else now
+        digest = hashlib.sha256(body).hexdigest()
+        kept = {k: headers[k] for k in STORED_HEADERS if k in headers}
+        with self._lock:
+            index = self._index()
+            path = self._body_path(digest)
+            if digest in self._sizes and path.exists():
+                size = self._sizes[digest]
+            else:
+                blob = zlib.compress(body, 6)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                atomic_write_bytes(path, blob)
+                size = len(blob)
+            entry = CacheEntry(url, digest, size, kept, now, now)
+            previous = index.get(url)
+            index[url] = entry
+            self._ref(entry)
+            if previous is not None:
+                self._unref(previous)
+            self._write_meta(entry)
+            self.stats["stores"] += 1
+            self._evict(keep=url)
+        return entry
+
+    def _evict(self, keep: str) -> None:
+        total = sum(self._sizes.values())
+        if total <= self.max_bytes:
+            return
+        for entry in sorted(self._index().values(), key=lambda e: e.accessed_at):
+            if total <= self.max_bytes:
+                break
+            if entry.url == keep:
+                continue
+            freed = self._sizes.get(entry.body, 0) if self._refs.get(entry.body, 0) == 1 else 0
+            self._drop(entry)
+            self.stats["evictions"] += 1
+            total -= freed
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry in list(self._index().values()):
+                self._drop(entry)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            index = self._index()
+            return dict(self.stats, entries=len(index), bodies=len(self._sizes), bytes=sum(self._sizes.values()),
+                        max_bytes=self.max_bytes, ttl=self.ttl, offline=self.offline, dir=str(self.root))
+
+
+def _cached_response(entry: CacheEntry, body: bytes, request: httpx.Request, status: str) -> httpx.Response:
+    headers = {k: v for k, v in entry.headers.items() if k in STORED_HEADERS}
+    headers["x-cache"] = status
+    return httpx.Response(200, headers=headers, content=body, request=request)
+
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """Wraps a transport with `ResponseCache` lookups, conditional refetches and stores (GET only)."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, cache: ResponseCache):
+        self.transport = transport
+        self.cache = cache
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        conditional = "if-none-match" in request.headers or "if-modified-since" in request.headers
+        if request.method != "GET" or conditional:
+            return await self.transport.handle_async_request(request)
+        cache, url = self.cache, str(request.url)
+        # Index load, zlib and file writes are blocking: keep them off the event loop
+        entry = await asyncio.to_thread(cache.get, url)
+        if entry is not None and cache.is_fresh(entry):
+            body = await asyncio.to_thread(cache.read_body, entry)
+            if body is not None:
+                await asyncio.to_thread(cache.touch, entry)
+                cache.stats["hits"] += 1
+                return _cached_response(entry, body, request, "HIT")
+            entry = None
+        if cache.offline:
+            raise httpx.ConnectError(f"offline cache miss: {url}", request=request)
+        if entry is not None:
+            if entry.etag:
+                request.headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request.headers["If-Modified-Since"] = entry.last_modified
+        response = await self.transport.handle_async_request(request)
+        if response.status_code == 304 and entry is not None:
+            await response.aclose()
+            body = await asyncio.to_thread(cache.read_body, entry)
+            if body is not None:
+                await asyncio.to_thread(cache.touch, entry, True)
+                cache.stats["revalidated"] += 1
+                return _cached_response(entry, body, request, "REVALIDATED")
+            # Body vanished after the conditional request went out: fetch it plainly
+            request.headers.pop("If-None-Match", None)
+            request.headers.pop("If-Modified-Since", None)
+            response = await self.transport.handle_async_request(request)
+        cache.stats["misses"] += 1
+        if response.status_code != 200 or "no-store" in response.headers.get("cache-control", "").lower():
+            return response
+        body = await response.aread()
+        await response.aclose()
+        await asyncio.to_thread(cache.store, url, response.headers, body)
+        headers = httpx.Headers(response.headers)
+        for name in _DROPPED_HEADERS:  # body is decoded and held in memory now
+            headers.pop(name, None)
+        headers["x-cache"] = "MISS"
+        return httpx.Response(200, headers=headers, content=body, request=request, extensions=response.extensions)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+_CACHES: Dict[str, ResponseCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_cache(root: Optional[Path] = None) -> ResponseCache:
+    """Process-wide cache for `root` (default `SCRAPE_CACHE_DIR`), configured from settings."""
+    settings = get_settings()
+    key = os.path.abspath(root if root is not None else settings.scrape_cache_dir)
+    cache = _CACHES.get(key)
+    if cache is None:
+        with _CACHES_LOCK:
+            cache = _CACHES.get(key)
+            if cache is None:
+                cache = _CACHES[key] = ResponseCache(Path(key), settings.scrape_cache_ttl,
+                                                     settings.scrape_cache_max_bytes, settings.scrape_cache_offline)
+    return cache
+
+
+__all__ = ["CacheEntry", "CachingTransport", "ResponseCache", "get_cache"]
@@ -2,7 +2,8 @@
 from typing import List
 from bs4 import BeautifulSoup
 import httpx
-from app.scraping.http_utils import ensure_async_client, aclose_safely
+from app.scraping.client_pool import get_client
+from app.scraping.rate_limit import get_limiter
 from app.schemas.subwoofer import SubwooferSchema
 
 BASE_URL = "https://www.crutchfield.com"
@@ -12,40 +13,38 @@ HEADERS = {"User-Agent": "Mozilla/5.0"}
 async def scrape_crutchfield_subwoofers(pages: int = 5) -> List[SubwooferSchema]:
     """Scrape simplified listing cards from Crutchfield.
 
-    Uses HTTP/2 when available for improved connection reuse and header compression.
-    Falls back transparently if the remote server does not negotiate h2.
+    Borrows the shared per-host client (HTTP/2 when `h2` is installed, pooled
+    keep-alive connections); falls back transparently if the server does not negotiate h2.
     """
     results: List[SubwooferSchema] = []
-    client = await ensure_async_client(headers=HEADERS, timeout=15.0, http2=True)
-    try:
-        for page in range(1, pages + 1):
-            url = f"{BASE_URL}/shopsearch/subwoofers.html?pg={page}"
-            try:
-                resp = await client.get(url)
-            except Exception:
-                continue
-            if getattr(resp, 'status_code', 200) != 200:
-                continue
-            soup = BeautifulSoup(getattr(resp, 'text', ''), "html.parser")
-            for item in soup.select(".cf-productcard"):
-                name_tag = item.select_one(".cf-productcard-title")
-                price_tag = item.select_one(".cf-price")
-                link_tag = name_tag.get("href") if name_tag else None
-                if name_tag and link_tag:
-                    name = name_tag.get_text(strip=True)
-                    price_text = price_tag.get_text(strip=True) if price_tag else None
-                    price = _parse_price(price_text) if price_text else None
-                    full_url = BASE_URL + link_tag
-                    results.append(
-                        SubwooferSchema(
-                            name=name,
-                            price=price,
-                            product_url=full_url,
-                            source="crutchfield",
-                        )
+    client = await get_client(BASE_URL)
+    for page in range(1, pages + 1):
+        url = f"{BASE_URL}/shopsearch/subwoofers.html?pg={page}"
+        try:
+            await get_limiter().acquire(url)
+            resp = await client.get(url, headers=HEADERS, timeout=15.0)
+        except Exception:
+            continue
+        if getattr(resp, 'status_code', 200) != 200:
+            continue
+        soup = BeautifulSoup(getattr(resp, 'text', ''), "html.parser")
+        for item in soup.select(".cf-productcard"):
+            name_tag = item.select_one(".cf-productcard-title")
+            price_tag = item.select_one(".cf-price")
+            link_tag = name_tag.get("href") if name_tag else None
+            if name_tag and link_tag:
+                name = name_tag.get_text(strip=True)
+                price_text = price_tag.get_text(strip=True) if price_tag else None
+                price = _parse_price(price_text) if price_text else None
+                full_url = BASE_URL + link_tag
+                results.append(
+                    SubwooferSchema(
+                        name=name,
+                        price=price,
+                        product_url=full_url,
+                        source="crutchfield",
                     )
-    finally:
-        await aclose_safely(client)
+                )
     return results
 
 
@@ -11,6 +11,9 @@ from typing import List, Dict, Any, Optional
 import httpx
 from bs4 import BeautifulSoup
 
+from app.scraping.client_pool import get_client
+from app.scraping.rate_limit import get_limiter
+
 SUNDOWN_PAGE = "https://sundownaudio.com/pages/sundown-subwoofer-page"
 UA_POOL = [
     # Reuse generic pool; kept minimal to avoid duplication. Calling code may extend.
@@ -31,10 +34,12 @@ async def _fetch_html(url: str, retries: int = 3, timeout: float = 25.0) -> Opti
             "Referer": url,
         }
         try:
-            async with httpx.AsyncClient(follow_redirects=True, timeout=timeout) as client:
-                resp = await client.get(url, headers=headers)
-                resp.raise_for_status()
-                return resp.text
+            # Shared per-host client: retries reuse the pooled connection / TLS session
+            await get_limiter().acquire(url)  # per-host budget, retries included
+            client = await get_client(url)
+            resp = await client.get(url, headers=headers, timeout=timeout)
+            resp.raise_for_status()
+            return resp.text
         except Exception as exc:  # noqa: BLE001
             last_exc = exc
             attempt += 1
@@ -151,8 +156,8 @@ async def scrape_sundown_eight_full(max_models: int = 12, base_delay: float = 1.
 
     Args:
         max_models: cap number of models to avoid excessive requests.
-        base_delay: base seconds between product page fetches.
-        jitter: random +/- added to delay for variability.
+        base_delay: target seconds between product page fetches (per-host rate 1/base_delay).
+        jitter: max random seconds added to each throttled fetch.
 
     Returns list of model dicts (same shape as fast scrape plus optional enrichment fields).
     Falls back to synthetic list if catalog page unreachable.
@@ -164,15 +169,10 @@ async def scrape_sundown_eight_full(max_models: int = 12, base_delay: float = 1.
     if not models:
         return _synthetic_fallback()
     limited = models[:max_models]
-    enriched: List[Dict[str, Any]] = []
-    for m in limited:
-        # Polite delay before each product detail fetch
-        delay = base_delay + random.uniform(-jitter, jitter)
-        await asyncio.sleep(max(delay, 0.2))  # clamp to minimum 0.2
-        detail = await _enrich_product(m["url"])
-        merged = {**m, **detail}
-        enriched.append(merged)
-    return enriched
+    # Product fetches run concurrently; the host's token bucket spaces them out
+    get_limiter().configure(SUNDOWN_PAGE, rate=1.0 / max(base_delay, 0.2), burst=1, jitter=jitter)
+    details = await asyncio.gather(*[_enrich_product(m["url"]) for m in limited])
+    return [{**m, **detail} for m, detail in zip(limited, details)]
 
 __all__ = ["scrape_sundown_eight", "SUNDOWN_PAGE", "scrape_sundown_eight_full"]
 
@@ -14,6 +14,7 @@ from app.api.routes import api_router
 from app.core.config import get_settings
 from app.core.paths import ensure_output_dirs
 from app.core.paths import get_export_path, ExportType
+from app.scraping.client_pool import lifespan as http_clients_lifespan
 
 # -----------------------
 # Helpers (local lightweight utilities to reduce duplication)
@@ -137,7 +138,9 @@ def pack_on_sheet(rects: List[Rect], sheet_w: float = 96.0, sheet_h: float = 48.
 # -----------------------
 def get_application() -> FastAPI:
     settings = get_settings()
-    app = FastAPI(title=settings.app_name, version=settings.version, debug=settings.debug)
+    # Shared scraper HTTP clients are closed on shutdown (app/scraping/client_pool.py)
+    app = FastAPI(title=settings.app_name, version=settings.version, debug=settings.debug,
+                  lifespan=http_clients_lifespan)
 
     # Ensure export/output directory structure exists early.
     try:
@@ -0,0 +1,80 @@
+"""Benchmark catalog search: pure-Python `matches()` vs the NumPy columnar mode.
+
+Generates a synthetic catalog, checks that both paths return identical results
+for a set of filter combinations and sorts, then prints per-query timings.
+
+    python scripts/bench_catalog_search.py [--items 100000] [--repeat 20]
+"""
+from __future__ import annotations
+import argparse, random, sys, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.catalog import CatalogSnapshot, SearchFilters  # noqa: E402
+from app.catalog import catalog as catalog_mod, columnar  # noqa: E402
+from app.models.subwoofer import Subwoofer  # noqa: E402
+
+CASES = [
+    SearchFilters(),
+    SearchFilters(size_min=10.0, size_max=12.0),
+    SearchFilters(rms_min=500),
+    SearchFilters(brand="sun", impedance_ohm=2.0),
+    SearchFilters(size_min=12.0, rms_max=1500, box_type="ported"),
+]
+SORTS = (None, "price", "rms", "size")
+
+
+def synthetic(n: int, seed: int = 7):
+    rnd = random.Random(seed)
+    brands = ["JL Audio", "Sundown Audio", "Skar Audio", "Kicker", "Rockford Fosgate", "Alpine", ""]
+    return [Subwoofer(
+        source="synthetic", url=f"https://example.com/p/{i}", brand=rnd.choice(brands), model=f"X{i}",
+        size_in=rnd.choice([None, 8.0, 10.0, 12.0, 15.0, 18.0]), rms_w=rnd.choice([None, 0, 300, 600, 1200, 2000]),
+        peak_w=None, impedance_ohm=rnd.choice([None, 0.0, 1.0, 2.0, 4.0]), sensitivity_db=None,
+        mounting_depth_in=None, cutout_diameter_in=None, displacement_cuft=None,
+        recommended_box=rnd.choice([None, "sealed", "ported"]), price_usd=rnd.choice([None, 0.0, 99.0, 249.0, 499.0]),
+        image=None, scraped_at=0.0,
+    ) for i in range(n)]
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+    if not columnar.available():
+        print("numpy is not installed; columnar mode unavailable")
+        return 1
+    items = synthetic(args.items)
+    snap = CatalogSnapshot(items, None, 1)
+    cols = snap.columnar_index()  # build outside the timed region
+    threshold = catalog_mod.COLUMNAR_MIN_ITEMS
+    for f in CASES:
+        for sort in SORTS:
+            fast = snap.search(f, sort)
+            catalog_mod.COLUMNAR_MIN_ITEMS, snap._columnar = sys.maxsize, None
+            try:
+                slow = snap.search(f, sort)
+                t_py = timed(lambda: snap.search(f, sort), args.repeat)
+            finally:
+                catalog_mod.COLUMNAR_MIN_ITEMS, snap._columnar = threshold, cols
+            if [i.url for i in fast] != [i.url for i in slow]:
+                print(f"MISMATCH {f} sort={sort}")
+                return 2
+            t_np = timed(lambda: snap.search(f, sort), args.repeat)
+            active = {k: v for k, v in vars(f).items() if v is not None}
+            print(f"{len(fast):>7} hits  sort={str(sort):5}  python {t_py:8.2f} ms  numpy {t_np:6.2f} ms  {active}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
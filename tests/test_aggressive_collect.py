@@ -6,7 +6,7 @@ from main import get_application
 app = get_application()
 client = TestClient(app)
 
-def test_aggressive_collect_smoke(monkeypatch):
+def test_aggressive_collect_smoke(monkeypatch, tmp_path):
     # Monkeypatch fetch to return static HTML with a single product of desired size repeatedly.
     sample_listing = '<html><a href="/p_1234/Test-Sub.html">Test Sub</a></html>'
     sample_product = '<html><h1>BrandX ModelY 8" Subwoofer</h1><div class="price">$199.99</div><table><tr><th>RMS Power</th><td>300 watts</td></tr></table></html>'
@@ -24,6 +24,8 @@ def test_aggressive_collect_smoke(monkeypatch):
         return DummyResp(sample_listing)
 
     monkeypatch.setattr(mod, 'fetch', fake_fetch)
+    monkeypatch.setattr(mod, 'DB_PATH', tmp_path / 'subwoofers.json')
+    monkeypatch.setattr(mod, 'SIZE_ROOT', tmp_path / 'subwoofers')
 
     r = client.get('/subwoofers/collect/aggressive/8?target=12&batch_pages=2&max_cycles=2')
     assert r.status_code == 200, r.text
@@ -31,8 +31,10 @@ async def fake_fetch(client, url):
     CALL_COUNTS['listing'] += 1
     return DummyResp(LISTING_HTML)
 
-def test_aggressive_collect_concurrency(monkeypatch):
+def test_aggressive_collect_concurrency(monkeypatch, tmp_path):
     monkeypatch.setattr(mod, 'fetch', fake_fetch)
+    monkeypatch.setattr(mod, 'DB_PATH', tmp_path / 'subwoofers.json')
+    monkeypatch.setattr(mod, 'SIZE_ROOT', tmp_path / 'subwoofers')
     start = time.time()
     r = client.get('/subwoofers/collect/aggressive/8?target=10&batch_pages=1&max_cycles=1&product_concurrency=6')
     elapsed = time.time() - start
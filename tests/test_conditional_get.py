@@ -0,0 +1,53 @@
+import time
+
+from app.api.routes import presets as presets_mod
+from app.api.routes import subwoofers as mod
+from app.api.routes.subwoofers import Subwoofer
+
+
+def _mk(i, size=10.0):
+    return Subwoofer(source="synthetic", url=f"http://example.com/{i}", brand="Brand", model=f"M{i}", size_in=size,
+                     rms_w=300, peak_w=None, impedance_ohm=None, sensitivity_db=None, mounting_depth_in=None,
+                     cutout_diameter_in=None, displacement_cuft=None, recommended_box=None, price_usd=100.0,
+                     image=None, scraped_at=time.time())
+
+
+def _revalidates(client, url):
+    r = client.get(url)
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+    assert r.headers["last-modified"]
+    r2 = client.get(url, headers={"If-None-Match": etag})
+    assert r2.status_code == 304
+    assert r2.content == b""
+    assert r2.headers["etag"] == etag
+    r3 = client.get(url, headers={"If-Modified-Since": r.headers["last-modified"]})
+    assert r3.status_code == 304
+    return etag
+
+
+def test_catalog_endpoints_answer_304_until_data_changes(monkeypatch, tmp_path, client):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    mod.save_db([_mk(1), _mk(2)])
+    urls = ["/subwoofers?sort=price", "/subwoofers/picker?limit=5", "/subwoofers/size/10"]
+    etags = {u: _revalidates(client, u) for u in urls}
+    # Different query -> different representation -> different ETag
+    assert client.get("/subwoofers?sort=rms").headers["etag"] != etags[urls[0]]
+    time.sleep(0.01)
+    mod.save_db([_mk(1), _mk(2), _mk(3)])
+    for u in urls:
+        r = client.get(u, headers={"If-None-Match": etags[u]})
+        assert r.status_code == 200, u
+        assert r.headers["etag"] != etags[u]
+
+
+def test_presets_list_revalidates(monkeypatch, tmp_path, client):
+    monkeypatch.setattr(presets_mod, "PRESETS_PATH", tmp_path / "presets.json")
+    etag = client.get("/presets").headers["etag"]  # no presets file yet
+    assert client.get("/presets", headers={"If-None-Match": etag}).status_code == 304
+    r = client.post("/presets", json={"name": "A", "config": {"width": 10, "height": 10, "depth": 10, "wallThickness": 0.75}})
+    assert r.status_code == 200
+    r = client.get("/presets", headers={"If-None-Match": etag})
+    assert r.status_code == 200 and r.json()["total"] == 1
+    _revalidates(client, "/presets")
@@ -0,0 +1,98 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.api.routes import crutchfield as mod
+from app.models.subwoofer import Subwoofer
+
+PAGES = 3
+PER_PAGE = 8
+
+
+def _listing(page):
+    links = ''.join(f'<a href="/p_{page}{j:02d}/Sub.html">x</a>' for j in range(PER_PAGE))
+    nxt = f'<a rel="next" href="/g_512/Subwoofers.html?pg={page + 1}">Next</a>' if page + 1 < PAGES else ''
+    return f'<html>{links}{nxt}</html>'
+
+
+class FakeClient:
+    def __init__(self, latency=0.05):
+        self.latency = latency
+        self.in_flight = self.peak = 0
+
+    async def get(self, url, headers=None, timeout=None):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.latency)
+        self.in_flight -= 1
+        if '/p_' in url:
+            n = url.split('/p_')[1].split('/')[0]
+            title = 'Generic Subwoofer' if n.endswith('7') else f'BrandX Model{n} 12" Subwoofer'
+            text = f'<html><h1>{title}</h1><div class="price">$99.00</div></html>'
+        else:
+            text = _listing(int(url.split('pg=')[1]) if 'pg=' in url else 0)
+        return SimpleNamespace(text=text, http_version='HTTP/1.1', raise_for_status=lambda: None)
+
+
+@pytest.fixture
+def crawl_env(monkeypatch, tmp_path):
+    client = FakeClient()
+
+    async def fake_get_client(url):
+        return client
+
+    monkeypatch.setattr(mod, 'get_client', fake_get_client)
+    monkeypatch.setattr(mod, 'DB_PATH', tmp_path / 'subwoofers.json')
+    monkeypatch.setattr(mod, 'REQUEST_DELAY', 0.005)
+    monkeypatch.setattr(mod, 'MERGE_BATCH', 5)
+    monkeypatch.setenv('SCRAPER_JITTER_OFF', '1')
+    saves = []
+    real_save = mod._save
+    monkeypatch.setattr(mod, '_save', lambda items: (saves.append(len(items)), real_save(items)))
+    return client, saves
+
+
+def test_crawl_fetches_products_concurrently(crawl_env):
+    client, saves = crawl_env
+    rich = Subwoofer(source='crutchfield', url='https://www.crutchfield.com/p_000/Sub.html', brand='BrandX',
+                     model='Model000', size_in=12.0, impedance_ohm=4.0, price_usd=150.0)
+    mod.get_store(mod.DB_PATH).upsert([rich])
+    start = time.perf_counter()
+    items = asyncio.run(mod._crawl(pages=PAGES, workers=6))
+    elapsed = time.perf_counter() - start
+    # 3 pages x 8 products, one per page rejected by the quality gate
+    assert len(items) == PAGES * (PER_PAGE - 1)
+    assert [i['url'] for i in items] == sorted(i['url'] for i in items)
+    assert client.peak > 1
+    assert elapsed < (PAGES + PAGES * PER_PAGE) * client.latency  # well under the serial cost
+    # Merged in batches while the crawl ran, not once at the end
+    assert len(saves) > 1 and sum(saves) == len(items)
+    # Batches go to the upsert log; the base file is never rewritten during the crawl
+    assert not mod.DB_PATH.exists()
+    stored = {r.url: r for r in mod.get_store(mod.DB_PATH).snapshot().items}
+    assert len(stored) == len(items)
+    # Lite merge: price refreshed, specs the crawl does not extract kept
+    assert (stored[rich.url].price_usd, stored[rich.url].impedance_ohm) == (99.0, 4.0)
+
+
+def test_route_refreshes_buckets_from_whole_catalog(crawl_env, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    other = Subwoofer(source='sonic', url='http://sonic.example/12', brand='Other', model='S12', size_in=12.0)
+    mod.get_store(mod.DB_PATH).upsert([other])
+    out = asyncio.run(mod.list_crutchfield_subwoofers(pages=1, workers=2))
+    latest = json.loads((tmp_path / 'subwoofers' / '12' / 'latest.json').read_text(encoding='utf-8'))
+    # Other retailers' records in the bucket survive the crawl
+    assert {r['url'] for r in latest} == {other.url} | {i['url'] for i in out['items']}
+    assert json.loads((tmp_path / 'subwoofers' / 'index.json').read_text())['counts'] == {'12': len(latest)}
+
+
+def test_crawl_raises_when_first_listing_fails(crawl_env, monkeypatch):
+    async def boom(client, url):
+        raise RuntimeError('blocked')
+
+    monkeypatch.setattr(mod, '_fetch', boom)
+    with pytest.raises(RuntimeError):
+        asyncio.run(mod._crawl(pages=2, workers=2))
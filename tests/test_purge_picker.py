@@ -29,7 +29,8 @@ def seed_test_db():
     DB_PATH.write_text(json.dumps(items, indent=2), encoding='utf-8')
 
 
-def test_purge_endpoint_removes_deprecated_and_test_entries():
+def test_purge_endpoint_removes_deprecated_and_test_entries(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
     seed_test_db()
     r = client.post('/subwoofers/purge')
     assert r.status_code == 200
@@ -42,7 +43,8 @@ def test_purge_endpoint_removes_deprecated_and_test_entries():
     # Deprecated entries may be auto-removed; no assertion required.
 
 
-def test_picker_endpoint_returns_condensed_sorted():
+def test_picker_endpoint_returns_condensed_sorted(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
     seed_test_db()
     # Purge with explicit source removal
     client.post('/subwoofers/purge?remove_sources=deprecated')
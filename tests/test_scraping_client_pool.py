@@ -0,0 +1,67 @@
+import asyncio
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.scraping import client_pool
+from app.scraping.client_pool import ClientRegistry, origin_of
+from main import app
+
+
+def _mock_factory(monkeypatch, created):
+    def handler(request):
+        return httpx.Response(200, text=request.url.path)
+
+    async def factory(**kwargs):
+        kwargs["transport"] = httpx.MockTransport(handler)
+        client = httpx.AsyncClient(**kwargs)
+        created.append(client)
+        return client
+
+    monkeypatch.setattr(client_pool, "ensure_async_client", factory)
+
+
+def test_origin_normalization():
+    assert origin_of("https://Example.com:443/a?b=1") == "https://example.com"
+    assert origin_of("http://example.com:8080/x") == "http://example.com:8080"
+
+
+def test_clients_shared_per_origin_and_counted(monkeypatch):
+    created = []
+    _mock_factory(monkeypatch, created)
+    registry = ClientRegistry()
+
+    async def run():
+        a = await registry.get("https://a.example.com/listing")
+        assert await registry.get("https://a.example.com/product/1") is a
+        b = await registry.get("https://b.example.com/")
+        assert b is not a
+        results = await asyncio.gather(*[registry.get("https://c.example.com/") for _ in range(5)])
+        assert len({id(c) for c in results}) == 1  # concurrent first use still yields one client
+        for i in range(3):
+            assert (await a.get(f"https://a.example.com/p/{i}")).text == f"/p/{i}"
+        m = registry.metrics()
+        assert m["clients_open"] == 3
+        assert m["hosts"]["https://a.example.com"]["requests"] == 3
+        await registry.aclose()
+        assert all(c.is_closed for c in created)
+
+    asyncio.run(run())
+    m = registry.metrics()
+    assert (m["clients_open"], m["clients_closed"]) == (0, 3)
+
+
+def test_new_event_loop_gets_fresh_client(monkeypatch):
+    _mock_factory(monkeypatch, [])
+    registry = ClientRegistry()
+    first = asyncio.run(registry.get("https://a.example.com/"))
+    second = asyncio.run(registry.get("https://a.example.com/"))
+    assert first is not second
+
+
+def test_lifespan_exposes_registry_and_metrics(monkeypatch):
+    _mock_factory(monkeypatch, [])
+    with TestClient(app) as client:
+        assert app.state.http_clients is client_pool.get_registry()
+        pool = client.get("/subwoofers/metrics").json()["http_pool"]
+        assert set(pool) >= {"http2", "limits_per_host", "clients_open", "hosts"}
@@ -0,0 +1,44 @@
+import asyncio
+import time
+
+from app.scraping.rate_limit import HostRateLimiter, TokenBucket, host_of
+
+
+def test_bucket_allows_burst_then_spaces_reservations():
+    bucket = TokenBucket(rate=10.0, burst=3)
+    now = time.monotonic()
+    waits = [bucket.reserve(now) for _ in range(5)]
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert [round(w, 3) for w in waits[3:]] == [0.1, 0.2]  # queued behind each other
+    assert bucket.reserve(now + 1.0) == 0.0  # refilled (capped at burst)
+    assert bucket.stats()["throttled"] == 2
+
+
+def test_concurrent_fetches_honor_per_host_budget():
+    limiter = HostRateLimiter(rate=20.0, burst=2)
+    limiter.configure("https://slow.example.com", rate=5.0, burst=1)
+    stamps = {"fast": [], "slow": []}
+
+    async def fetch(kind, url):
+        await limiter.acquire(url)
+        stamps[kind].append(time.monotonic())
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(*[fetch("fast", f"https://fast.example.com/p/{i}") for i in range(6)],
+                             *[fetch("slow", f"https://SLOW.example.com/p/{i}") for i in range(3)])
+        return start
+
+    start = asyncio.run(run())
+    # fast: 2 immediately, then 4 more at 20/s -> ~0.2s; slow: 1 immediately, then 2 more at 5/s -> ~0.4s
+    assert 0.17 <= max(stamps["fast"]) - start < 0.35
+    assert 0.37 <= max(stamps["slow"]) - start < 0.6
+    hosts = limiter.metrics()["hosts"]
+    assert hosts["slow.example.com"]["rate"] == 5.0 and hosts["fast.example.com"]["acquired"] == 6
+
+
+def test_zero_rate_disables_limiting_and_host_parsing():
+    limiter = HostRateLimiter(rate=0)
+    assert asyncio.run(limiter.acquire("https://a.example.com/")) == 0.0
+    assert host_of("https://WWW.Example.com:8443/x") == "www.example.com"
+    assert host_of("Example.com") == "example.com"
@@ -0,0 +1,97 @@
+import asyncio
+import gzip
+import os
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.scraping.response_cache import CachingTransport, ResponseCache
+from main import app
+
+ETAG = '"v1"'
+
+
+def _origin(calls, body=b"<html>page</html>"):
+    def handler(request):
+        calls.append((request.url.path, request.headers.get("if-none-match")))
+        if request.url.path.startswith("/nostore"):
+            return httpx.Response(200, content=body, headers={"Cache-Control": "no-store"})
+        if request.headers.get("if-none-match") == ETAG:
+            return httpx.Response(304)
+        return httpx.Response(200, content=body, headers={"ETag": ETAG, "Content-Type": "text/html; charset=utf-8"})
+    return httpx.MockTransport(handler)
+
+
+def _get_all(cache, transport, urls):
+    async def run():
+        async with httpx.AsyncClient(transport=CachingTransport(transport, cache)) as client:
+            return [await client.get(u) for u in urls]
+    return asyncio.run(run())
+
+
+def test_fresh_hits_then_conditional_revalidation(tmp_path):
+    calls = []
+    cache = ResponseCache(tmp_path, ttl=3600)
+    first, second = _get_all(cache, _origin(calls), ["http://shop.test/a", "http://shop.test/a"])
+    assert (first.headers["x-cache"], second.headers["x-cache"]) == ("MISS", "HIT")
+    assert second.text == "<html>page</html>" and len(calls) == 1
+    cache.ttl = 0  # stale: the next fetch revalidates
+    (third,) = _get_all(cache, _origin(calls), ["http://shop.test/a"])
+    assert third.status_code == 200 and third.headers["x-cache"] == "REVALIDATED"
+    assert third.text == "<html>page</html>" and calls[-1] == ("/a", ETAG)
+    m = cache.metrics()
+    assert (m["hits"], m["revalidated"], m["misses"], m["entries"]) == (1, 1, 1, 1)
+
+
+def test_gzip_encoded_responses_round_trip(tmp_path):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        raw = gzip.compress(b"<html>zipped</html>")
+        return httpx.Response(200, content=raw, headers={"Content-Encoding": "gzip", "Content-Length": str(len(raw)),
+                                                        "Content-Type": "text/html", "ETag": ETAG})
+
+    cache = ResponseCache(tmp_path)
+    first, second = _get_all(cache, httpx.MockTransport(handler), ["http://shop.test/z", "http://shop.test/z"])
+    assert (first.text, second.text) == ("<html>zipped</html>", "<html>zipped</html>")
+    assert second.headers["x-cache"] == "HIT" and "content-encoding" not in second.headers
+    assert "content-encoding" not in cache.get("http://shop.test/z").headers and len(calls) == 1
+
+
+def test_bodies_are_content_addressed_and_no_store_skipped(tmp_path):
+    calls = []
+    cache = ResponseCache(tmp_path)
+    _get_all(cache, _origin(calls), ["http://shop.test/a", "http://shop.test/b", "http://shop.test/nostore"])
+    m = cache.metrics()
+    assert (m["entries"], m["bodies"]) == (2, 1)
+    assert cache.get("http://shop.test/nostore") is None
+
+
+def test_lru_eviction_bounds_size(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=2500)
+    for i, url in enumerate(["http://s.test/1", "http://s.test/2", "http://s.test/3"]):
+        cache.store(url, httpx.Headers(), os.urandom(1000), now=float(i))
+        if i == 1:
+            cache.touch(cache.get("http://s.test/1"), now=5.0)  # 1 is now more recent than 2
+    assert cache.get("http://s.test/2") is None
+    assert cache.get("http://s.test/1") is not None and cache.get("http://s.test/3") is not None
+    assert cache.metrics()["bytes"] <= 2500
+    assert sum(1 for _ in (tmp_path / "bodies").rglob("*.z")) == 2
+
+
+def test_offline_replay_from_disk(tmp_path):
+    _get_all(ResponseCache(tmp_path), _origin([]), ["http://shop.test/a"])
+    calls = []
+    replay = ResponseCache(tmp_path, ttl=0, offline=True)  # fresh index loaded from meta files
+    (resp,) = _get_all(replay, _origin(calls), ["http://shop.test/a"])
+    assert resp.headers["x-cache"] == "HIT" and resp.text == "<html>page</html>" and calls == []
+    with pytest.raises(httpx.ConnectError):
+        _get_all(replay, _origin(calls), ["http://shop.test/missing"])
+
+
+def test_metrics_report_cache(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    body = TestClient(app).get("/subwoofers/metrics").json()
+    assert {"hits", "misses", "entries", "max_bytes"} <= set(body["http_cache"])
@@ -43,8 +43,7 @@ def test_sonic_jitter_and_cleanup(monkeypatch, tmp_path):
     # Ensure trademark symbol removed from Beta model
     beta = [i for i in data['items'] if 'Beta' in i['model']][0]
     assert '™' not in beta['model']
-    # Delay should be at least BASE_DELAY * number of calls (listing + 2 products)
+    # The per-host token bucket spaces the 3 requests (listing + 2 products) BASE_DELAY apart
     base = float(mod.BASE_DELAY)
-    # We triggered listing + 2 product delays ~3 * base
-    assert elapsed >= base * 2.5  # allow slight timing variance
+    assert elapsed >= base * 1.9  # allow slight timing variance
 
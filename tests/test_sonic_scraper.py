@@ -50,3 +50,50 @@ def test_sonic_scraper_basic(monkeypatch, tmp_path):
     assert Path(mod.DB_PATH).exists()
     stored = json.loads(Path(mod.DB_PATH).read_text(encoding='utf-8'))
     assert len(stored) == 3
+
+
+class SlowScraper(FakeScraper):
+    def get(self, url):
+        import time
+        time.sleep(0.05)  # blocking, like a real cloudscraper request
+        return super().get(url)
+
+
+def test_sonic_stream_keeps_event_loop_free(monkeypatch, tmp_path):
+    import asyncio
+    from app.api.routes import sonic as mod
+    monkeypatch.setattr(mod, 'DB_PATH', tmp_path / 'subwoofers.json')
+    monkeypatch.setattr(mod, 'BASE_DELAY', 0.01)
+    monkeypatch.setenv('SONIC_JITTER_OFF', '1')
+    mod._configure_rate_limit()
+    scraper = SlowScraper()
+    import threading
+    save_threads = []
+    real_merge_save = mod._merge_save
+    monkeypatch.setattr(mod, '_merge_save', lambda items: (save_threads.append(threading.current_thread()),
+                                                          real_merge_save(items)))
+
+    async def run():
+        ticks = 0
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+        task = asyncio.create_task(ticker())
+        items = [i async for i in mod._crawl(scraper, LISTING_HTML, pages=1)]
+        task.cancel()
+        return items, ticks
+
+    items, ticks = asyncio.run(run())
+    assert len(items) == 3
+    assert ticks >= 10  # the loop kept running while product pages were fetched
+    assert save_threads and threading.main_thread() not in save_threads  # catalog merge ran off the loop
+    assert len(json.loads(Path(mod.DB_PATH).read_text(encoding='utf-8'))) == 3
+
+    import cloudscraper
+    monkeypatch.setattr(cloudscraper, 'create_scraper', lambda: FakeScraper())
+    resp = TestClient(app).get('/sonic/subwoofers?pages=1&stream=true')
+    assert resp.headers['content-type'].startswith('application/x-ndjson')
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert sorted(line['rms_w'] for line in lines) == [300, 310, 320]
@@ -0,0 +1,54 @@
+import json
+
+from app.api.routes import subwoofers as mod
+from app.catalog import Catalog, JsonStore, binsnap, wal
+from app.models.subwoofer import Subwoofer
+
+
+def _sub(i, **kw):
+    base = dict(source="synthetic", url=f"http://example.com/{i}", brand=f"Brand{i % 3}", model=f"M{i} ünï",
+                size_in=[8, 10.5, None][i % 3], rms_w=300 + i, price_usd=None if i % 2 else 99.5 + i,
+                recommended_box="sealed" if i % 2 else None, scraped_at=1.5)
+    base.update(kw)
+    return Subwoofer(**base)
+
+
+def test_encode_roundtrip_is_exact():
+    records = [_sub(i) for i in range(7)]
+    data = binsnap.encode(records, (1, 2))
+    mapped = binsnap.SnapshotRecords(data)
+    assert len(mapped) == 7
+    assert list(mapped) == records
+    assert type(mapped[0].size_in) is int and type(mapped[1].size_in) is float
+    assert mapped[-1] == records[-1] and mapped[2:4] == records[2:4]
+    # bools have no exact binary form: the writer declines
+    assert binsnap.encode([_sub(0, rms_w=True)], (1, 2)) is None
+
+
+def test_save_db_writes_snapshot_and_cold_load_maps_it(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    records = [_sub(i) for i in range(5)]
+    mod.save_db(records)
+    assert binsnap.snapshot_path_for(mod.DB_PATH).exists()
+    cold = Catalog(mod.DB_PATH).snapshot()  # a fresh worker
+    assert isinstance(cold.items, binsnap.SnapshotRecords)
+    assert list(cold.items) == records
+    assert [i.url for i in cold.view("price")][:2] == ["http://example.com/0", "http://example.com/2"]
+
+
+def test_stale_or_partial_snapshot_falls_back_to_json(tmp_path):
+    path = tmp_path / "subwoofers.json"
+    store = JsonStore(path)
+    store.replace_all([_sub(i) for i in range(3)])
+    # Log entries are replayed on top of the mapped base
+    wal.append_ops(wal.log_path_for(path), [{"op": wal.OP_UPSERT, "record": _sub(9).to_dict()}])
+    items = Catalog(path).snapshot().items
+    assert not isinstance(items, binsnap.SnapshotRecords)
+    assert [i.url for i in items][-1] == "http://example.com/9" and len(items) == 4
+    # An external rewrite of the JSON makes the snapshot stale
+    wal.log_path_for(path).unlink()
+    path.write_text(json.dumps([_sub(5).to_dict()]), encoding="utf-8")
+    items = Catalog(path).snapshot().items
+    assert not isinstance(items, binsnap.SnapshotRecords)
+    assert [i.url for i in items] == ["http://example.com/5"]
@@ -0,0 +1,52 @@
+import json, time
+from pathlib import Path
+
+from app.api.routes import subwoofers as mod
+from app.api.routes.subwoofers import Subwoofer
+
+
+def _mk(i, size, price=None):
+    return Subwoofer(source="synthetic", url=f"http://example.com/{i}", brand="Brand", model=f"M{i}", size_in=size,
+                     rms_w=300, peak_w=None, impedance_ohm=None, sensitivity_db=None, mounting_depth_in=None,
+                     cutout_diameter_in=None, displacement_cuft=None, recommended_box=None, price_usd=price,
+                     image=None, scraped_at=1.0)
+
+
+def _mtimes():
+    return {p.parent.name: p.stat().st_mtime_ns for p in Path("subwoofers").glob("*/latest.json")}
+
+
+def _index():
+    return json.loads(Path("subwoofers/index.json").read_text(encoding="utf-8"))
+
+
+def test_save_db_rewrites_only_changed_buckets(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    base = [_mk(1, 8.0), _mk(2, 12.0), _mk(3, 15.0), _mk(4, 18.0)]
+    mod.save_db(base)
+    before = _mtimes()
+    assert set(before) == {"8", "12", "15", "18"}
+    assert _index()["counts"] == {"8": 1, "12": 1, "15": 1, "18": 1}
+    time.sleep(0.01)
+    mod.save_db(base + [_mk(5, 8.0)])  # an 8" crawl
+    after = _mtimes()
+    assert after["8"] != before["8"]
+    assert all(after[s] == before[s] for s in ("12", "15", "18"))
+    assert _index()["counts"]["8"] == 2
+    assert not list(Path("subwoofers").rglob("*.tmp"))
+
+
+def test_bucket_rewritten_if_changed_on_disk_and_vacated_buckets_removed(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    base = [_mk(1, 8.0), _mk(2, 12.0)]
+    mod.save_db(base)
+    Path("subwoofers/12/latest.json").write_text("[]", encoding="utf-8")  # external edit
+    mod.save_db(base)
+    assert len(json.loads(Path("subwoofers/12/latest.json").read_text(encoding="utf-8"))) == 1
+    # Upsert moves item 2 from 12" to 10": the 12" bucket empties out
+    mod.upsert_db([_mk(2, 10.0)])
+    assert not Path("subwoofers/12/latest.json").exists()
+    idx = _index()
+    assert "12" not in idx["sizes"] and idx["counts"] == {"8": 1, "10": 1}
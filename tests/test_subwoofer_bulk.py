@@ -0,0 +1,126 @@
+import asyncio
+import json
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.api.routes import subwoofers as mod
+from app.catalog import JsonStore, SearchFilters, wal
+from app.catalog.bulk import DeletePredicate
+from app.catalog.catalog import Catalog
+from app.catalog.sqlite_store import SqliteStore
+from app.core.write_coordinator import read_version
+from app.models.subwoofer import Subwoofer
+from main import app
+
+
+def _sub(i, source="partner", size=12.0, rms=500, scraped=1.0):
+    return Subwoofer(source=source, url=f"http://example.com/{i}", brand="B", model=f"M{i}", size_in=size,
+                     rms_w=rms, price_usd=100.0 + i, scraped_at=scraped)
+
+
+def _ndjson(records):
+    return "".join(json.dumps(r.to_dict()) + "\n" for r in records)
+
+
+def test_bulk_upsert_streams_ndjson_in_batches(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    mod.save_db([_sub(0, size=10.0)])
+    base_before = mod.DB_PATH.read_bytes()
+    version = read_version(mod.DB_PATH)
+    body = _ndjson([_sub(1), _sub(2, size=8.0)]) + "not json\n\n" + _ndjson([_sub(0, size=12.0), _sub(3)])
+    resp = TestClient(app).post("/subwoofers/bulk?batch_size=2", content=body.rstrip("\n"),
+                                headers={"Content-Type": "application/x-ndjson"})
+    out = resp.json()
+    assert (out["received"], out["upserted"], out["batches"], out["error_count"], out["total"]) == (5, 4, 2, 1, 4)
+    assert out["errors"][0]["line"] == 3
+    assert read_version(mod.DB_PATH) == version + 3  # one short write section per batch, one for the buckets
+    # One log append per batch; the base file is not rewritten
+    assert mod.DB_PATH.read_bytes() == base_before
+    stamp, *ops = wal.read_ops(wal.log_path_for(mod.DB_PATH))[0]
+    assert stamp["op"] == wal.OP_BASE and len(ops) == 4
+    index = json.loads((tmp_path / "subwoofers" / "index.json").read_text())
+    assert index["counts"] == {"8": 1, "12": 3}  # record 0 moved out of the 10" bucket
+
+
+
+
+def test_bulk_upsert_converts_numeric_strings_and_reports_bad_fields(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    lines = [
+        {"url": "http://a/1", "size_in": "12", "rms_w": "500", "price_usd": "99.5"},
+        {"url": "http://a/2", "size_in": 12.0, "rms_w": "500", "price_usd": "abc"},
+        {"url": "http://a/3", "size_in": [12]},
+        {"url": "http://a/4", "rms_w": 350.5},
+        {"url": "http://a/5", "price_usd": "nan"},
+        {"url": "http://a/6", "brand": {"name": "B"}},
+    ]
+    client = TestClient(app)
+    out = client.post("/subwoofers/bulk", content="".join(json.dumps(d) + "\n" for d in lines)).json()
+    assert (out["upserted"], out["error_count"]) == (1, 5)
+    assert [e["line"] for e in out["errors"]] == [2, 3, 4, 5, 6]
+    stored = mod._store().snapshot().items[0]
+    assert (stored.size_in, stored.rms_w, stored.price_usd) == (12.0, 500, 99.5)
+    for path in ("/subwoofers?sort=price", "/subwoofers?sort=rms", "/subwoofers/picker", "/subwoofers/facets"):
+        assert client.get(path).status_code == 200
+
+def test_writes_during_a_streamed_upload_do_not_block(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    mod.save_db([_sub(0, source="p")])
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://t") as client:
+            purged = []
+
+            async def body():
+                yield _ndjson([_sub(1)]).encode()
+                await asyncio.sleep(0.05)  # first batch applied; the lock must be free again
+                purged.append((await client.post("/subwoofers/purge?remove_sources=p")).json())
+                yield _ndjson([_sub(2)]).encode()
+
+            resp = await asyncio.wait_for(client.post("/subwoofers/bulk?batch_size=1", content=body()), 10)
+            return resp.json(), purged
+
+    out, purged = asyncio.run(run())
+    assert purged[0]["removed"] == 1
+    assert (out["upserted"], out["batches"], out["total"]) == (2, 2, 2)
+
+def test_bulk_delete_by_predicate(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    mod.save_db([_sub(1, scraped=10.0), _sub(2, rms=900, scraped=10.0), _sub(3, source="sonic", scraped=10.0),
+                 _sub(4, scraped=99.0)])
+    client = TestClient(app)
+    version = client.get("/subwoofers/changes").json()["version"]
+    assert client.post("/subwoofers/bulk/delete").status_code == 400
+    query = "/subwoofers/bulk/delete?source=PARTNER&scraped_before=50&rms_max=600"
+    dry = client.post(query + "&dry_run=true").json()
+    assert (dry["matched"], dry["deleted"], dry["total"]) == (1, 0, 4)
+    out = client.post(query).json()
+    assert (out["deleted"], out["sample_urls"], out["total"]) == (1, ["http://example.com/1"], 3)
+    events = client.get(f"/subwoofers/changes?since={version}").json()["events"]
+    assert [(e["op"], e["url"]) for e in events] == [("delete", "http://example.com/1")]
+    # The delete op replays from disk for a cold reader
+    assert [i.url for i in Catalog(mod.DB_PATH).snapshot().items] == [f"http://example.com/{i}" for i in (2, 3, 4)]
+
+
+def test_sqlite_pushdown_matches_json_selection(tmp_path):
+    records = [_sub(i, source=("sonic", "partner")[i % 2], size=(8.0, 10.0, 12.0)[i % 3], rms=100 * (i % 7),
+                    scraped=float(i)) for i in range(40)]
+    js = JsonStore(tmp_path / "subwoofers.json")
+    sq = SqliteStore(tmp_path / "subwoofers.sqlite3")
+    js.replace_all(records)
+    sq.replace_all(records)
+    predicates = [
+        DeletePredicate(sources=("Sonic",)),
+        DeletePredicate(url_contains="/1", scraped_before=20.0),
+        DeletePredicate(SearchFilters(size_min=10, rms_max=300), sources=("partner",)),
+    ]
+    for predicate in predicates:
+        assert js.select_urls(predicate) == sq.select_urls(predicate)
+    urls = sq.select_urls(predicates[0])
+    assert sq.delete(urls) == 20 and sq.count() == 20
+    sq.close()
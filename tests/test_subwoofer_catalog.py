@@ -0,0 +1,77 @@
+import json, random, time
+
+from app.api.routes import subwoofers as mod
+from app.api.routes.subwoofers import Subwoofer, matches
+from app.catalog import SearchFilters, get_catalog
+
+
+def _mk(i, size=None, rms=None, price=None, brand="Brand", imp=None, box=None):
+    return Subwoofer(source="synthetic", url=f"http://example.com/{i}", brand=brand, model=f"M{i}", size_in=size,
+                     rms_w=rms, peak_w=None, impedance_ohm=imp, sensitivity_db=None, mounting_depth_in=None,
+                     cutout_diameter_in=None, displacement_cuft=None, recommended_box=box, price_usd=price,
+                     image=None, scraped_at=time.time())
+
+
+def test_catalog_reuses_snapshot_and_reloads_on_external_write(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # keep per-size buckets out of the repo tree
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    mod.save_db([_mk(1, size=8.0)])
+    cat = get_catalog(mod.DB_PATH)
+    first = cat.snapshot()
+    assert cat.snapshot() is first  # no re-parse while file unchanged
+    assert [i.url for i in mod.load_db()] == ["http://example.com/1"]
+    # Another writer (e.g. sonic router) rewrites the file directly
+    from dataclasses import asdict
+    mod.DB_PATH.write_text(json.dumps([asdict(_mk(1, size=8.0)), asdict(_mk(2, size=10.0))]), encoding="utf-8")
+    second = cat.snapshot()
+    assert second is not first
+    assert len(second) == 2
+
+
+def test_catalog_search_matches_reference_semantics(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # keep per-size buckets out of the repo tree
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    rnd = random.Random(7)
+    items = []
+    for i in range(300):
+        items.append(_mk(
+            i,
+            size=rnd.choice([None, 8.0, 10.0, 10.2, 12.0, 15.0]),
+            rms=rnd.choice([None, 0, 250, 400, 600, 1000]),
+            price=rnd.choice([None, 99.0, 150.0, 220.0]),
+            brand=rnd.choice(["Alpha", "Beta", ""]),
+            imp=rnd.choice([None, 2.0, 4.0]),
+            box=rnd.choice([None, "sealed", "ported"]),
+        ))
+    mod.save_db(items)
+    snap = get_catalog(mod.DB_PATH).snapshot()
+    cases = [
+        SearchFilters(size_min=10.0),
+        SearchFilters(size_max=10.0),
+        SearchFilters(size_min=8.0, size_max=12.0, rms_min=300),
+        SearchFilters(rms_max=500, brand="alp"),
+        SearchFilters(impedance_ohm=4.0, box_type="sealed"),
+        SearchFilters(text="m1"),
+    ]
+    for f in cases:
+        expected = {i.url for i in items if matches(i, f.brand, f.size_min, f.size_max, f.rms_min, f.rms_max,
+                                                      f.impedance_ohm, f.box_type, f.text)}
+        for sort in (None, "price", "rms", "size"):
+            got = snap.search(f, sort)
+            assert {i.url for i in got} == expected
+    # Sorted view honours the historical price ordering (None last)
+    prices = [i.price_usd for i in snap.search(SearchFilters(size_min=10.0), "price")]
+    present = [p for p in prices if p is not None]
+    assert present == sorted(present)
+    assert all(p is None for p in prices[len(present):])
+
+
+def test_picker_uses_prebuilt_view(monkeypatch, tmp_path, client):
+    monkeypatch.chdir(tmp_path)  # keep per-size buckets out of the repo tree
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    mod.save_db([_mk(1, size=8.0, rms=300), _mk(2, size=12.0, rms=500), _mk(3, size=12.0, rms=800), _mk(4)])
+    r = client.get("/subwoofers/picker?limit=2")
+    assert r.status_code == 200
+    data = r.json()
+    assert data["total"] == 4
+    assert [i["model"] for i in data["items"]] == ["M3", "M2"]
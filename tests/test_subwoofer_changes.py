@@ -0,0 +1,84 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from app.api.routes import subwoofers as mod
+from app.catalog.changes import ChangeFeed
+from app.models.subwoofer import Subwoofer
+from main import app
+
+
+def _sub(i, price=100.0, brand="B"):
+    return Subwoofer(source="synthetic", url=f"http://example.com/{i}", brand=brand, model=f"M{i}", size_in=12.0,
+                     rms_w=500, price_usd=price, scraped_at=1.0)
+
+
+def _sse_events(text):
+    out = []
+    for frame in text.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.splitlines() if ": " in line and not line.startswith(":"))
+        if "event" in fields:
+            out.append((fields["event"], int(fields["id"]), json.loads(fields["data"])))
+    return out
+
+
+def test_writes_publish_upserts_and_deletes(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    client = TestClient(app)
+    start = client.get("/subwoofers/changes").json()
+    assert start == {"version": 0, "reset": False, "events": []}
+    mod.save_db([_sub(1), _sub(2), _sub(3, brand="BrandX")])
+    mod.upsert_db([_sub(2, price=80.0), _sub(1)])  # record 1 unchanged -> no event
+    client.post("/subwoofers/purge")
+    body = client.get("/subwoofers/changes?since=0").json()
+    assert [(e["op"], e["url"][-1]) for e in body["events"]] == [
+        ("upsert", "1"), ("upsert", "2"), ("upsert", "3"), ("upsert", "2"), ("delete", "3")]
+    assert body["events"][3]["item"]["price_usd"] == 80.0 and body["events"][4]["item"] is None
+    assert body["version"] == 5 and not body["reset"]
+    assert client.get("/subwoofers/changes?since=5").json()["events"] == []
+    assert client.get("/subwoofers/changes?since=99").json() == {"version": 5, "reset": True, "events": []}
+
+
+def test_sse_stream_resumes_from_last_event_id(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    mod.save_db([_sub(1), _sub(2)])
+    client = TestClient(app)
+    headers = {"Accept": "text/event-stream", "Last-Event-ID": "1"}
+    resp = client.get("/subwoofers/changes?timeout=0", headers=headers)
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    assert [(op, seq, d["url"]) for op, seq, d in _sse_events(resp.text)] == [("upsert", 2, "http://example.com/2")]
+
+
+def test_ring_buffer_overflow_asks_for_reset_and_wakes_waiters():
+    feed = ChangeFeed(capacity=3)
+    feed.publish(("upsert", f"u{i}", None) for i in range(5))
+    assert [e.seq for e in feed.since(2)[0]] == [3, 4, 5] and feed.since(2)[1]
+    assert feed.since(1) == ([], False)
+
+    async def scenario():
+        waiter = asyncio.ensure_future(feed.wait(5, timeout=5))
+        await asyncio.sleep(0)
+        feed.publish([("delete", "u0", None)])
+        return await waiter, await feed.wait(6, timeout=0.01)
+
+    assert asyncio.run(scenario()) == (True, False)
+
+
+def test_feeds_share_sequence_through_events_file(tmp_path):
+    path = tmp_path / "subwoofers.changes.jsonl"
+    worker_a, worker_b = ChangeFeed(capacity=4, path=path), ChangeFeed(capacity=4, path=path)
+    worker_a.publish([("upsert", "u1", _sub(1)), ("upsert", "u2", _sub(2))])
+    assert worker_b.version == 2
+    assert worker_b.publish([("delete", "u1", None)]) == 3  # continues the other worker's sequence
+    events, complete = worker_a.since(1)
+    assert complete and [(e.seq, e.op, e.url) for e in events] == [(2, "upsert", "u2"), (3, "delete", "u1")]
+    assert events[0].record == _sub(2)
+    for i in range(4, 12):  # file is trimmed to the buffer; both workers keep following
+        (worker_a if i % 2 else worker_b).publish([("upsert", f"u{i}", None)])
+    assert len(path.read_text().splitlines()) <= 8
+    assert worker_b.since(7) == worker_a.since(7) and [e.seq for e in worker_b.since(7)[0]] == [8, 9, 10, 11]
+    assert worker_a.since(2) == ([], False)
+    assert ChangeFeed(capacity=4, path=path).version == 11  # restart resumes the sequence
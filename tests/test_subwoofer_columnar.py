@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.api.routes.subwoofers import Subwoofer  # noqa: E402
+from app.catalog import CatalogSnapshot, SearchFilters  # noqa: E402
+from app.catalog import catalog as catalog_mod  # noqa: E402
+
+
+def _items(n=600, seed=11):
+    rnd = random.Random(seed)
+    return [Subwoofer(
+        source="synthetic", url=f"http://example.com/{i}", brand=rnd.choice(["Alpha", "Beta Audio", "", None]),
+        model=f"M{i}", size_in=rnd.choice([None, 0.0, 8.0, 10.0, 12.0]), rms_w=rnd.choice([None, 0, 300, 500, 900]),
+        peak_w=None, impedance_ohm=rnd.choice([None, 0.0, 2.0, 3.99, 4.0, 4.02]), sensitivity_db=None,
+        mounting_depth_in=None, cutout_diameter_in=None, displacement_cuft=None,
+        recommended_box=rnd.choice([None, "", "Sealed", "ported"]), price_usd=rnd.choice([None, 0.0, 89.0, 150.0]),
+        image=None, scraped_at=0.0,
+    ) for i in range(n)]
+
+
+CASES = [
+    SearchFilters(),
+    SearchFilters(size_min=10.0),
+    SearchFilters(size_max=10.0, rms_min=300),
+    SearchFilters(rms_max=500, brand="alp"),
+    SearchFilters(impedance_ohm=4.0),
+    SearchFilters(box_type="seal", brand="audio"),
+    SearchFilters(size_min=8.0, size_max=12.0, box_type="port", text="m1"),
+    SearchFilters(text="-"),
+]
+
+
+def test_columnar_search_matches_reference(monkeypatch):
+    items = _items()
+    monkeypatch.setattr(catalog_mod, "COLUMNAR_MIN_ITEMS", 0)
+    snap = CatalogSnapshot(items, None, 1)
+    assert snap.columnar_index() is not None
+    for f in (c for c in CASES if c.text is None):
+        for sort in (None, "price", "rms", "size"):
+            view = snap.view(sort or "brand")
+            assert [i.url for i in snap.search(f, sort)] == [i.url for i in view if f.matches(i)], (f, sort)
+
+
+def test_columnar_mode_matches_python_path(monkeypatch):
+    items = _items(seed=5)
+    py_snap = CatalogSnapshot(items, None, 1)
+    expected = {(f, s): [i.url for i in py_snap.search(f, s)] for f in CASES for s in (None, "price", "rms", "size", "relevance")}
+    monkeypatch.setattr(catalog_mod, "COLUMNAR_MIN_ITEMS", 0)
+    np_snap = CatalogSnapshot(items, None, 1)
+    for (f, s), urls in expected.items():
+        assert [i.url for i in np_snap.search(f, s)] == urls, (f, s)
+
+
+def test_columnar_keyset_pages_match_search(monkeypatch):
+    monkeypatch.setattr(catalog_mod, "COLUMNAR_MIN_ITEMS", 0)
+    snap = CatalogSnapshot(_items(seed=9), None, 1)
+    f = SearchFilters(size_min=8.0, box_type="port")
+    urls, after = [], None
+    while True:
+        page, key = snap.page_after(f, "price", after, 25)
+        urls.extend(i.url for i in page)
+        if key is None:
+            break
+        after = (key, page[-1].url)
+    assert urls == [i.url for i in snap.search(f, "price")]
@@ -0,0 +1,74 @@
+import time
+
+import pytest
+
+from app.catalog import catalog as catalog_mod
+from app.api.routes import subwoofers as mod
+from app.api.routes.subwoofers import Subwoofer
+
+
+def _mk(i, price=None, size=12.0):
+    return Subwoofer(source="synthetic", url=f"http://example.com/{i}", brand=f"Brand{i % 3}", model=f"M{i:03d}",
+                     size_in=size, rms_w=None, peak_w=None, impedance_ohm=None, sensitivity_db=None,
+                     mounting_depth_in=None, cutout_diameter_in=None, displacement_cuft=None, recommended_box=None,
+                     price_usd=price, image=None, scraped_at=time.time())
+
+
+def _walk(client, query, limit):
+    seen, cursor = [], None
+    r = client.get(f"/subwoofers?{query}&limit={limit}")
+    while True:
+        body = r.json()
+        seen.extend(i["url"] for i in body["items"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            return seen
+        r = client.get(f"/subwoofers?{query}&limit={limit}&cursor={cursor}")
+        assert r.status_code == 200
+
+
+def test_cursor_pages_cover_offset_results(monkeypatch, tmp_path, client):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    mod.save_db([_mk(i, price=float(i % 7) or None) for i in range(40)])
+    for query in ("sort=price", "sort=size", "size_min=10", "q=brand1"):
+        full = [i["url"] for i in client.get(f"/subwoofers?{query}&limit=500").json()["items"]]
+        assert _walk(client, query, 7) == full, query
+
+
+def test_cursor_is_stable_across_concurrent_writes(monkeypatch, tmp_path, client):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    mod.save_db([_mk(i, price=float(10 + i)) for i in range(10)])
+    first = client.get("/subwoofers?sort=price&limit=4").json()
+    assert [i["model"] for i in first["items"]] == ["M000", "M001", "M002", "M003"]
+    # A crawl inserts cheaper items and drops the last row of the page
+    mod.save_db([_mk(i, price=float(10 + i)) for i in range(10) if i != 3] + [_mk(50, price=1.0)])
+    nxt = client.get(f"/subwoofers?sort=price&limit=4&cursor={first['next_cursor']}").json()
+    assert [i["model"] for i in nxt["items"]] == ["M004", "M005", "M006", "M007"]
+
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_cursor_resumes_after_deleted_boundary_row_among_ties(monkeypatch, tmp_path, client, columnar):
+    if columnar:
+        pytest.importorskip("numpy")
+        monkeypatch.setattr(catalog_mod, "COLUMNAR_MIN_ITEMS", 0)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    # Unpriced rows all share the price key; file order differs from URL order
+    mod.save_db([_mk(i) for i in (7, 3, 9, 1, 5, 8, 2, 6, 4)] + [_mk(0, price=5.0)])
+    first = client.get("/subwoofers?sort=price&limit=4").json()
+    seen = [i["url"] for i in first["items"]]
+    mod.delete_db([seen[-1]])
+    rest = client.get(f"/subwoofers?sort=price&limit=10&cursor={first['next_cursor']}").json()["items"]
+    remaining = [i["url"] for i in client.get("/subwoofers?sort=price&limit=500").json()["items"]]
+    assert seen[:-1] + [i["url"] for i in rest] == remaining
+
+def test_cursor_rejects_mismatched_filters(monkeypatch, tmp_path, client):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    mod.save_db([_mk(i) for i in range(5)])
+    token = client.get("/subwoofers?limit=2").json()["next_cursor"]
+    assert client.get(f"/subwoofers?limit=2&sort=price&cursor={token}").status_code == 400
+    assert client.get("/subwoofers?limit=2&cursor=not-a-cursor").status_code == 400
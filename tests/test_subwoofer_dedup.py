@@ -0,0 +1,111 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.routes import sonic
+from app.api.routes import subwoofers as mod
+from app.catalog import binsnap, dedup
+from app.core.config import get_settings
+from app.models.subwoofer import Subwoofer
+from main import app
+
+
+def _sub(source, n, brand, model, size=12.0, rms=None, price=None, imp=None, peak=None, scraped=1.0):
+    return Subwoofer(source=source, url=f"http://{source}.example/{n}", brand=brand, model=model, size_in=size,
+                     rms_w=rms, peak_w=peak, impedance_ohm=imp, price_usd=price, scraped_at=scraped)
+
+
+def test_normalized_keys():
+    assert dedup.brand_key("JL Audio®") == dedup.brand_key("jla") == "jlaudio"
+    assert dedup.model_key('P3D4-12 12" Subwoofer', "Rockford Fosgate") == "p3d412"
+    assert dedup.model_key("Rockford Fosgate P3D4-12 Dual Voice Coil", "Rockford Fosgate") == "p3d412"
+
+
+def test_cross_retailer_duplicates_collapse_with_offers():
+    records = [
+        _sub("synthetic", 1, "Rockford Fosgate", "P3D4-12", rms=500, peak=1000, imp=4.0, price=249.0),
+        _sub("sonic", 2, "Rockford Fosgate", 'P3D4-12 12" Subwoofer', rms=500, price=229.0, scraped=2.0),
+        _sub("crutchfield", 3, "rockford fosgate", "Rockford Fosgate P3D4-12", size=None, price=239.0),
+        _sub("crutchfield", 4, "Rockford Fosgate", "P3D2-12", rms=500, price=239.0),  # other impedance variant
+        _sub("sonic", 5, "Rockford Fosgate", "P3D4-10", size=10.0),  # other size
+        _sub("synthetic", 6, "Rockford Fosgate", "P3D4-12", size=15.0),  # no bridging via the size-less listing
+    ]
+    out = dedup.dedupe(records)
+    assert [r.url for r in out] == ["http://synthetic.example/1", "http://crutchfield.example/4",
+                                    "http://sonic.example/5", "http://synthetic.example/6"]
+    canon = out[0]
+    assert (canon.peak_w, canon.price_usd) == (1000, 249.0)  # richest member's own data
+    assert [(o.source, o.price_usd) for o in canon.offers] == [("sonic", 229.0), ("crutchfield", 239.0),
+                                                               ("synthetic", 249.0)]
+    assert out[1].offers is None
+    assert dedup.dedupe(out) == out  # idempotent
+    # A re-crawled duplicate listing folds back into its canonical record by URL, refreshing its offer
+    again = dedup.dedupe(out + [_sub("sonic", 2, "Rockford Fosgate", "P3D4-12 (renamed)", price=199.0, scraped=9.0)])
+    assert len(again) == 4
+    assert [(o.url, o.price_usd) for o in again[0].offers][0] == ("http://sonic.example/2", 199.0)
+
+
+def test_save_db_and_lite_merge_keep_one_row_per_product(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    monkeypatch.setattr(sonic, "DB_PATH", tmp_path / "subwoofers.json")
+    mod.save_db([_sub("synthetic", 1, "JL Audio", "10W3v3-4", size=10.0, rms=500, price=300.0)])
+    sonic._merge_save([_sub("sonic", 7, "JL Audio", '10W3v3-4 10" Subwoofer', size=10.0, price=280.0, scraped=5.0)])
+    stored = json.loads(mod.DB_PATH.read_text(encoding="utf-8"))
+    assert len(stored) == 1
+    assert [o["price_usd"] for o in stored[0]["offers"]] == [280.0, 300.0]
+    # Offers survive the binary snapshot and the HTTP layer
+    assert binsnap.snapshot_path_for(mod.DB_PATH).exists()
+    item = TestClient(app).get("/subwoofers").json()["items"][0]
+    assert item["offers"][0] == {"source": "sonic", "url": "http://sonic.example/7", "price_usd": 280.0,
+                                 "scraped_at": 5.0}
+
+
+def test_dedupe_endpoint_collapses_existing_rows(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    store = mod._store()
+    monkeypatch.setattr(store, "dedupe", False)  # rows written before dedup existed (the endpoint re-reads settings)
+    store.upsert([_sub("sonic", 1, "Kicker", "CompR 12"), _sub("crutchfield", 2, "Kicker", "CompR12 Subwoofer"),
+                  _sub("sonic", 3, "Kicker", "CompVR 12")])
+    body = TestClient(app).post("/subwoofers/dedupe").json()
+    assert (body["before"], body["after"], body["merged_products"]) == (3, 2, 1)
+    assert len(mod.load_db()) == 2
+
+
+def test_offers_round_trip_through_sqlite(tmp_path):
+    from app.catalog.sqlite_store import SqliteStore
+
+    merged = dedup.dedupe([_sub("sonic", 1, "Kicker", "CompR 12", price=150.0), _sub("crutchfield", 2, "Kicker", "CompR12")])
+    store = SqliteStore(tmp_path / "subwoofers.sqlite3")
+    store.replace_all(merged)
+    assert store.select_all() == merged and len(merged[0].offers) == 2
+    store.close()
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_upserts_fold_into_a_stable_canonical_row(monkeypatch, tmp_path, backend):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("SUBWOOFER_STORE", backend)
+    get_settings.cache_clear()
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    try:
+        mod.upsert_db([_sub("sonic", 1, "Kicker", "CompR 12", price=150.0)])
+        # A richer listing from another retailer joins the stored product instead of replacing its URL
+        mod.upsert_db([_sub("crutchfield", 2, "Kicker", "CompR12 Subwoofer", rms=500, peak=1000, imp=4.0,
+                            price=140.0, scraped=2.0)])
+        items = mod._store().snapshot().items
+        assert [i.url for i in items] == ["http://sonic.example/1"]
+        assert (items[0].rms_w, items[0].peak_w) == (500, 1000)  # gaps filled from the new member
+        assert [o.url for o in items[0].offers] == ["http://crutchfield.example/2", "http://sonic.example/1"]
+        # Re-crawls of either listing refresh their offer and keep the canonical URL
+        mod.upsert_db([_sub("crutchfield", 2, "Kicker", "CompR12", price=120.0, scraped=3.0)])
+        mod.upsert_db([_sub("sonic", 1, "Kicker", "CompR 12", price=155.0, scraped=4.0)])
+        mod._store().merge([_sub("sonic", 3, "Kicker", "CompVR 12")])
+        items = mod._store().snapshot().items
+        assert [i.url for i in items] == ["http://sonic.example/1", "http://sonic.example/3"]
+        assert [(o.url, o.price_usd) for o in items[0].offers] == [("http://crutchfield.example/2", 120.0),
+                                                                   ("http://sonic.example/1", 155.0)]
+    finally:
+        get_settings.cache_clear()
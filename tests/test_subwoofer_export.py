@@ -0,0 +1,42 @@
+import gzip, json
+from dataclasses import asdict
+
+from app.api.routes import subwoofers as mod
+from app.api.routes.subwoofers import Subwoofer
+
+
+def _mk(i, size=10.0, rms=300):
+    return Subwoofer(source="synthetic", url=f"http://example.com/{i}", brand="Brand", model=f"M{i:04d}", size_in=size,
+                     rms_w=rms, peak_w=None, impedance_ohm=None, sensitivity_db=None, mounting_depth_in=None,
+                     cutout_diameter_in=None, displacement_cuft=None, recommended_box=None, price_usd=None,
+                     image=None, scraped_at=1.0)
+
+
+def test_export_streams_all_matching_records(monkeypatch, tmp_path, client):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    monkeypatch.setattr(mod, "EXPORT_CHUNK", 7)
+    items = [_mk(i, size=12.0 if i % 3 else 8.0, rms=100 + i) for i in range(1200)]
+    mod.save_db(items)
+    r = client.get("/subwoofers/export.ndjson")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = r.content.decode("utf-8").splitlines()
+    assert len(lines) == 1200  # no 500-record cap
+    assert json.loads(lines[0]) == asdict(items[0])
+    filtered = client.get("/subwoofers/export.ndjson?size_min=10&sort=rms").content.decode("utf-8").splitlines()
+    expected = client.get("/subwoofers?size_min=10&sort=rms&limit=500").json()["items"]
+    assert [json.loads(l) for l in filtered[:500]] == expected
+    assert len(filtered) == 800
+
+
+def test_export_gzip_variant(monkeypatch, tmp_path, client):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    mod.save_db([_mk(i) for i in range(20)])
+    r = client.get("/subwoofers/export.ndjson.gz?q=m0001")
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/gzip"
+    lines = gzip.decompress(r.content).decode("utf-8").splitlines()
+    assert [json.loads(l)["model"] for l in lines] == ["M0001"]
+    assert client.get("/subwoofers/export.ndjson.gz?q=m0001", headers={"If-None-Match": r.headers["etag"]}).status_code == 304
@@ -0,0 +1,61 @@
+from fastapi.testclient import TestClient
+
+from app.api.routes import subwoofers as mod
+from app.catalog import CatalogSnapshot, SearchFilters, facets
+from app.models.subwoofer import Subwoofer
+from main import app
+
+
+def _sub(i, brand, size, rms, imp, price):
+    return Subwoofer(source="synthetic", url=f"http://example.com/{i}", brand=brand, model=f"M{i}", size_in=size,
+                     rms_w=rms, impedance_ohm=imp, price_usd=price, scraped_at=1.0)
+
+
+RECORDS = [
+    _sub(0, "Rockford", 10.0, 400, 4.0, 120.0),
+    _sub(1, "rockford", 12.0, 800, 2.0, 260.0),
+    _sub(2, "JL Audio", 10.2, 600, 4.0, 320.0),
+    _sub(3, "JL Audio", 8.0, 250, None, None),
+    _sub(4, "Kicker", 12.0, None, 2.0, 80.0),
+]
+
+
+def _by_value(buckets):
+    return {b["value"]: b["count"] for b in buckets}
+
+
+def test_facets_count_each_field_without_its_own_filter(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    mod.save_db(RECORDS)
+    client = TestClient(app)
+    resp = client.get("/subwoofers/facets")
+    assert resp.status_code == 200 and resp.headers["etag"]
+    body = resp.json()
+    assert body["total"] == 5
+    assert _by_value(body["facets"]["size"]) == {8: 1, 10: 2, 12: 2}
+    # case-insensitive buckets labelled with the first spelling; count desc, then name
+    assert body["facets"]["brand"] == [{"value": "JL Audio", "count": 2}, {"value": "Rockford", "count": 2},
+                                       {"value": "Kicker", "count": 1}]
+    assert _by_value(body["facets"]["impedance"]) == {2.0: 2, 4.0: 2, None: 1}
+    rms = body["facets"]["rms"]
+    assert rms[0] == {"min": 0, "max": 150, "count": 0} and rms[-1] == {"min": None, "max": None, "count": 1}
+    assert sum(b["count"] for b in body["facets"]["price"]) == 5
+
+    body = client.get("/subwoofers/facets", params={"brand": "jl", "size_min": 10}).json()
+    assert body["total"] == 1
+    # brand counts keep size_min but drop the brand filter
+    assert _by_value(body["facets"]["brand"]) == {"Rockford": 2, "JL Audio": 1, "Kicker": 1}
+    # size counts keep the brand filter but drop the size bounds
+    assert _by_value(body["facets"]["size"]) == {8: 1, 10: 1}
+    etag = client.get("/subwoofers/facets", params={"brand": "jl"}).headers["etag"]
+    assert client.get("/subwoofers/facets", params={"brand": "jl"},
+                      headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_facets_match_without_numpy(monkeypatch):
+    filters = SearchFilters(rms_min=300, text="audio")
+    expected = CatalogSnapshot(RECORDS, None, 1).facets(filters)
+    monkeypatch.setattr(facets, "np", None)
+    assert CatalogSnapshot(RECORDS, None, 2).facets(filters) == expected
+    assert expected["total"] == 1
@@ -1,5 +1,4 @@
 import json
-from pathlib import Path
 from dataclasses import dataclass
 from time import time
 
@@ -28,6 +27,7 @@ class FakeSub:
 def test_size_grouping_latest(monkeypatch, tmp_path):
     # Point DB_PATH to temp to avoid polluting real dataset
     monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    monkeypatch.setattr(mod, "SIZE_ROOT", tmp_path / "subwoofers")
     # Prepare multiple sizes
     subs = [FakeSub(size_in=8.0, url="http://example.com/a"), FakeSub(size_in=10.0, url="http://example.com/b"), FakeSub(size_in=10.2, url="http://example.com/c"), FakeSub(size_in=12.0, url="http://example.com/d")]
     mod.save_db(subs)
@@ -36,7 +36,7 @@ def test_size_grouping_latest(monkeypatch, tmp_path):
     data = json.loads(mod.DB_PATH.read_text(encoding="utf-8"))
     assert len(data) == 4
     # Verify per-size directories and latest.json snapshots
-    root = Path("subwoofers")
+    root = mod.SIZE_ROOT
     for size in [8,10,12]:
         d = root / str(size)
         assert d.exists(), f"Directory for size {size} missing"
@@ -0,0 +1,47 @@
+from fastapi.testclient import TestClient
+
+from app.api.routes import subwoofers as mod
+from app.catalog import history
+from app.models.subwoofer import Subwoofer
+from main import app
+
+
+def _sub(i, price, scraped, rms=500, size=12.0):
+    return Subwoofer(source="synthetic", url=f"http://example.com/{i}", brand="B", model=f"M{i}", size_in=size,
+                     rms_w=rms, price_usd=price, scraped_at=scraped)
+
+
+def test_history_stores_only_changed_fields(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    mod.save_db([_sub(1, 200.0, 10.0), _sub(2, 150.0, 10.0)])
+    mod.upsert_db([_sub(1, 200.0, 20.0)])  # re-crawl, nothing changed but scraped_at
+    mod.upsert_db([_sub(1, 180.0, 30.0, rms=550)])
+    mod.save_db([_sub(1, 180.0, 30.0, rms=550)])  # record 2 dropped
+    lines = history.history_path_for(mod.DB_PATH).read_text().splitlines()
+    assert len(lines) == 4
+    client = TestClient(app)
+    body = client.get("/subwoofers/history", params={"url": "http://example.com/1"}).json()
+    assert [e["changes"] for e in body["entries"]][1] == {"price_usd": 180.0, "rms_w": 550}
+    assert body["price_points"] == [{"at": 10.0, "price_usd": 200.0}, {"at": 30.0, "price_usd": 180.0}]
+    assert body["entries"][0]["changes"]["model"] == "M1"
+    removed = client.get("/subwoofers/history", params={"url": "http://example.com/2"}).json()
+    assert removed["current"] is None and removed["entries"][-1]["removed"] is True
+    assert client.get("/subwoofers/history", params={"url": "http://nope"}).status_code == 404
+
+
+def test_price_dropped_since_filter(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    mod.save_db([_sub(1, 200.0, 10.0), _sub(2, 100.0, 10.0, size=10.0), _sub(3, 100.0, 10.0)])
+    mod.upsert_db([_sub(1, 150.0, 20.0), _sub(2, 50.0, 20.0, size=10.0), _sub(3, 120.0, 20.0),
+                   _sub(4, 10.0, 20.0)])
+    mod.upsert_db([_sub(4, 5.0, 30.0)])  # new after `since`: no earlier price
+    client = TestClient(app)
+    body = client.get("/subwoofers/price-drops?since=15").json()
+    assert [(i["url"][-1], i["price_then"], i["price_drop_pct"]) for i in body["items"]] == [
+        ("2", 100.0, 50.0), ("1", 200.0, 25.0)]
+    filtered = client.get("/subwoofers/price-drops?since=15&size_min=11").json()
+    assert [i["url"][-1] for i in filtered["items"]] == ["1"]
+    later = client.get("/subwoofers/price-drops?since=25").json()
+    assert [(i["url"][-1], i["price_then"]) for i in later["items"]] == [("4", 10.0)]
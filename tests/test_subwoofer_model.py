@@ -0,0 +1,74 @@
+import json
+
+from app.api.routes import crutchfield, sonic
+from app.api.routes import subwoofers as mod
+from app.catalog import JsonStore
+from app.models.subwoofer import LITE_FIELDS, Subwoofer, from_any, merge_records, provided_fields
+from app.schemas.subwoofer import SubwooferSchema
+
+
+def _full(url="http://example.com/a", **kw):
+    base = dict(source="synthetic", url=url, brand="Brand", model="M", size_in=10.0, rms_w=500, peak_w=1000,
+                impedance_ohm=4.0, sensitivity_db=88.0, mounting_depth_in=5.5, cutout_diameter_in=9.1,
+                displacement_cuft=0.08, recommended_box="sealed", price_usd=199.0, image="img.png", scraped_at=1.0)
+    base.update(kw)
+    return Subwoofer(**base)
+
+
+def test_record_is_slotted_and_interns_source_and_brand():
+    a = _full(brand="".join(["Ro", "ckford"]))
+    b = from_any({"url": "http://example.com/b", "brand": "".join(["Rock", "ford"]), "source": "sonic"})
+    assert not hasattr(a, "__dict__")
+    assert a.brand is b.brand
+    assert sonic.SonicSubLite is crutchfield.SubwooferLite is Subwoofer
+
+
+def test_converters_are_lossless_for_existing_shapes():
+    full = _full()
+    assert from_any(full.to_dict()) == full
+    lite = {f: full.to_dict()[f] for f in LITE_FIELDS}
+    rec = from_any(lite)
+    assert rec.to_dict(LITE_FIELDS) == lite and rec.peak_w is None
+    assert provided_fields(lite) == LITE_FIELDS
+    schema = SubwooferSchema(name="X12", brand="Brand", size_in_inches=12, rms_watts=600, max_watts=1200,
+                             impedance_ohms=2, price=249.99, product_url="https://example.com/x12", source="shop")
+    rec = from_any(schema)
+    assert (rec.model, rec.size_in, rec.rms_w, rec.peak_w, rec.impedance_ohm, rec.price_usd) == \
+        ("X12", 12, 600, 1200, 2, 249.99)
+    assert rec.url == "https://example.com/x12"
+
+
+def test_lite_merge_keeps_full_fields():
+    stored = _full()
+    lite = Subwoofer(source="sonic", url=stored.url, brand="Brand", model="M", size_in=None, rms_w=550,
+                     price_usd=179.0, scraped_at=2.0)
+    merged = merge_records(stored, lite, LITE_FIELDS)
+    assert (merged.rms_w, merged.price_usd, merged.source, merged.scraped_at) == (550, 179.0, "sonic", 2.0)
+    # None never erases, fields outside the lite set are untouched
+    assert (merged.size_in, merged.peak_w, merged.recommended_box) == (10.0, 1000, "sealed")
+
+
+def test_sonic_merge_save_preserves_richer_records(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    monkeypatch.setattr(sonic, "DB_PATH", tmp_path / "subwoofers.json")
+    mod.save_db([_full(), _full("http://example.com/b", model="X9")])
+    sonic._merge_save([sonic.SonicSubLite(source="sonic", url="http://example.com/a", brand="Brand", model="M",
+                                          size_in=None, rms_w=None, price_usd=150.0, scraped_at=3.0),
+                       sonic.SonicSubLite(source="sonic", url="http://example.com/new", brand="Other", model="N",
+                                          size_in=8.0, rms_w=300, price_usd=99.0, scraped_at=3.0)])
+    stored = {d["url"]: d for d in json.loads(mod.DB_PATH.read_text(encoding="utf-8"))}
+    assert len(stored) == 3
+    assert stored["http://example.com/a"]["price_usd"] == 150.0
+    assert stored["http://example.com/a"]["peak_w"] == 1000
+    assert stored["http://example.com/new"]["peak_w"] is None
+    assert len(mod.load_db()) == 3
+
+
+def test_catalog_skips_only_malformed_records(tmp_path):
+    path = tmp_path / "subwoofers.json"
+    full = _full().to_dict()
+    lite = {f: full[f] for f in LITE_FIELDS} | {"url": "http://example.com/lite"}
+    path.write_text(json.dumps([full, lite, {"brand": "no url"}]), encoding="utf-8")
+    items = JsonStore(path).snapshot().items
+    assert [i.url for i in items] == ["http://example.com/a", "http://example.com/lite"]
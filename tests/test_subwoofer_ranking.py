@@ -0,0 +1,79 @@
+import random
+
+from fastapi.testclient import TestClient
+
+from app.api.routes import subwoofers as mod
+from app.catalog import CatalogSnapshot, JsonStore, ranking
+from app.models.subwoofer import Subwoofer
+from main import app
+
+
+def _sub(i, size=None, rms=None, price=None):
+    return Subwoofer(source="synthetic", url=f"http://example.com/{i}", brand="B", model=f"M{i % 4}",
+                     size_in=size, rms_w=rms, price_usd=price, scraped_at=1.0)
+
+
+def _random_subs(n):
+    rnd = random.Random(7)
+    return [_sub(i, rnd.choice([None, 8.0, 10.0, 12.0]), rnd.choice([None, 300, 500]), rnd.choice([None, 99.0, 150.0]))
+            for i in range(n)]
+
+
+def test_heap_top_k_matches_full_sort_including_ties():
+    items = _random_subs(300)
+    snap = CatalogSnapshot(items, None, 1)
+    for name, key in ranking.SCORERS.items():
+        full = sorted(items, key=key)
+        for k in (1, 7, 50, 400):
+            assert ranking.top_k(items, k, key) == full[:k]
+            assert snap.top(name, k) == full[:k]
+    assert snap.top("picker", 10) == snap.view("picker", 10)
+
+
+def test_rank_keys_are_carried_over_and_only_new_records_scored(tmp_path):
+    calls = []
+
+    @ranking.register_scorer("counting")
+    def _counting(it):
+        calls.append(it.url)
+        return (it.url,)
+
+    try:
+        store = JsonStore(tmp_path / "subwoofers.json")
+        store.replace_all(_random_subs(20))
+        store.snapshot().top("counting", 3)
+        assert len(calls) == 20
+        calls.clear()
+        store.upsert([_sub(5, rms=900), _sub(99, rms=100)])
+        assert store.snapshot().top("counting", 3)[0].url == "http://example.com/0"
+        assert sorted(calls) == ["http://example.com/5", "http://example.com/99"]
+    finally:
+        ranking.SCORERS.pop("counting", None)
+
+
+def test_rank_caches_are_separate_from_views_and_reset_on_register():
+    items = _random_subs(50)
+    snap = CatalogSnapshot(items, None, 1)
+    snap.view("price")  # builds the VIEW_KEYS "price" order (cheapest first)
+    original = ranking.SCORERS.get("price")
+    try:
+        ranking.register_scorer("price")(lambda it: (it.price_usd is None, -(it.price_usd or 0)))
+        assert snap.top("price", 5) == sorted(items, key=ranking.SCORERS["price"])[:5]  # priciest first
+        ranking.register_scorer("price")(lambda it: (it.url,))
+        assert snap.top("price", 3) == sorted(items, key=lambda it: it.url)[:3]
+    finally:
+        ranking.SCORERS.pop("price", None)
+        if original is not None:
+            ranking.SCORERS["price"] = original
+
+
+def test_picker_accepts_pluggable_rank(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    mod.save_db([_sub(1, 12.0, 500, 250.0), _sub(2, 8.0, 300, 60.0), _sub(3, 10.0, 400, None)])
+    client = TestClient(app)
+    default = client.get("/subwoofers/picker?limit=2").json()["items"]
+    assert [i["url"] for i in default] == ["http://example.com/1", "http://example.com/3"]
+    value = client.get("/subwoofers/picker?limit=3&rank=rms_per_dollar").json()["items"]
+    assert [i["url"] for i in value] == ["http://example.com/2", "http://example.com/1", "http://example.com/3"]
+    assert client.get("/subwoofers/picker?rank=nope").status_code == 400
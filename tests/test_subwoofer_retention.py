@@ -0,0 +1,66 @@
+import json
+from datetime import datetime, timedelta
+
+from app.catalog import retention
+
+NOW = datetime(2026, 3, 20, 12, 0, 0)
+
+
+def _name(t):
+    return f"snapshot_{t:%Y%m%d-%H%M%S}-{t.microsecond:06d}.json"
+
+
+def _records(n, price):
+    return [{"source": "synthetic", "url": f"http://example.com/{i}", "size_in": 8.0, "price_usd": price + i}
+            for i in range(n)]
+
+
+def test_plan_keeps_last_n_then_daily_and_weekly_rollups():
+    times = [NOW - timedelta(hours=6 * i) for i in range(4 * 10)]  # four per day for 10 days
+    decision = retention.plan(times, NOW, keep_last=3, keep_daily=3, keep_weekly=2)
+    assert [decision[t] for t in times[:3]] == ["full"] * 3
+    deltas = sorted(t for t, d in decision.items() if d == "delta")
+    # newest of each of the last 3 days (today is already covered by "full"), newest of last week
+    assert [t.date().isoformat() for t in deltas] == ["2026-03-15", "2026-03-18", "2026-03-19"]
+    assert sum(d == "drop" for d in decision.values()) == 40 - 3 - 3
+
+
+def test_compact_dir_rewrites_old_snapshots_as_gzipped_deltas(tmp_path):
+    d = tmp_path / "8"
+    d.mkdir()
+    (d / "latest.json").write_text(json.dumps(_records(30, 100.0)))
+    originals = {}
+    for day in range(6):
+        t = NOW - timedelta(days=day, hours=1)
+        recs = _records(30 - day, 100.0 + day) + [{"url": f"http://other/{day}", "price_usd": 1.0}]
+        (d / _name(t)).write_text(json.dumps(recs, indent=2))
+        originals[_name(t)] = recs
+    (d / "notes.txt").write_text("left alone")
+    before = {p.name for p in d.iterdir()}
+    dry = retention.compact_dir(d, keep_last=2, keep_daily=4, keep_weekly=0, now=NOW, dry_run=True)
+    assert {p.name for p in d.iterdir()} == before and len(dry.compacted) == 2
+    report = retention.compact_dir(d, keep_last=2, keep_daily=4, keep_weekly=0, now=NOW)
+    assert (len(report.kept), len(report.compacted), len(report.deleted)) == (2, 2, 2)
+    assert report.bytes_after < report.bytes_before
+    deltas = sorted(d.glob("snapshot_*.delta.json.gz"))
+    assert len(deltas) == 2 and len(list(d.glob("base_*.json.gz"))) == 1
+    for path in deltas:
+        assert retention.load_snapshot(path) == originals[path.name.replace(".delta.json.gz", ".json")]
+    # latest.json moving on keeps old deltas decodable; a second pass is a no-op
+    (d / "latest.json").write_text(json.dumps(_records(3, 5.0)))
+    again = retention.compact_dir(d, keep_last=2, keep_daily=4, keep_weekly=0, now=NOW)
+    assert (len(again.compacted), len(again.deleted)) == (0, 0)
+    assert retention.load_snapshot(deltas[0]) == originals[deltas[0].name.replace(".delta.json.gz", ".json")]
+    # Unreferenced bases are removed once their deltas age out
+    retention.compact_dir(d, keep_last=2, keep_daily=0, keep_weekly=0, now=NOW)
+    assert not list(d.glob("base_*")) and (d / "notes.txt").exists()
+
+
+def test_cli_runs_over_size_directories(tmp_path, capsys):
+    d = tmp_path / "12"
+    d.mkdir()
+    for i in range(3):
+        (d / _name(datetime(2020, 1, 1 + i))).write_text("[]")
+    assert retention.main([str(tmp_path), "--keep-last", "1", "--daily", "0", "--weekly", "0"]) == 0
+    assert "kept 1, compacted 0, deleted 2" in capsys.readouterr().out
+    assert len(list(d.glob("snapshot_*"))) == 1
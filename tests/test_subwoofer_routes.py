@@ -5,6 +5,7 @@ def test_subwoofer_search_empty(monkeypatch, tmp_path, client):
     # Isolate DB path to ensure empty state regardless of prior test runs
     from app.api.routes import subwoofers as mod
     monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    monkeypatch.setattr(mod, "SIZE_ROOT", tmp_path / "subwoofers")
     resp = client.get("/subwoofers")
     assert resp.status_code == 200
     data = resp.json()
@@ -16,6 +17,7 @@ def test_subwoofer_search_sort(monkeypatch, client, tmp_path):
     """Basic sort verification without external scrape logic (Crutchfield removed)."""
     from app.api.routes import subwoofers as mod
     monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    monkeypatch.setattr(mod, "SIZE_ROOT", tmp_path / "subwoofers")
     # Seed DB manually
     from dataclasses import asdict
     from app.api.routes.subwoofers import Subwoofer, save_db
@@ -0,0 +1,46 @@
+import json, time
+from dataclasses import asdict
+
+from app.api.routes import subwoofers as mod
+from app.api.routes.subwoofers import Subwoofer
+from app.catalog import JsonStore, serialize
+
+
+def _mk(i, price=None, size=10.0):
+    return Subwoofer(source="synthetic", url=f"http://example.com/{i}", brand="Brändé", model=f"M{i}", size_in=size,
+                     rms_w=300, peak_w=None, impedance_ohm=None, sensitivity_db=None, mounting_depth_in=None,
+                     cutout_diameter_in=None, displacement_cuft=None, recommended_box=None, price_usd=price,
+                     image=None, scraped_at=1.5)
+
+
+def test_encoded_bytes_cached_and_replaced_on_upsert(tmp_path):
+    store = JsonStore(tmp_path / "subwoofers.json")
+    store.replace_all([_mk(1), _mk(2)])
+    snap = store.snapshot()
+    first = snap.encoded(snap.items)
+    assert [json.loads(b) for b in first] == [asdict(i) for i in snap.items]
+    assert snap.encoded(snap.items)[0] is first[0]  # cached
+    store.upsert([_mk(2, price=42.0)])
+    snap2 = store.snapshot()
+    again = snap2.encoded(snap2.items)
+    assert again[0] is first[0]  # unchanged record keeps its bytes across the tail replay
+    assert json.loads(again[1])["price_usd"] == 42.0
+
+
+def test_list_response_matches_dict_serialization():
+    items = [_mk(1), _mk(2)]
+    resp = serialize.list_response({"total": 2, "limit": 5}, [serialize.encode_record(i) for i in items])
+    assert json.loads(resp.body) == {"total": 2, "limit": 5, "items": [asdict(i) for i in items]}
+    assert json.loads(serialize.list_response({}, []).body) == {"items": []}
+
+
+def test_search_and_size_responses_use_prebuilt_bodies(monkeypatch, tmp_path, client):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    items = [_mk(i, price=float(i + 1)) for i in range(5)]
+    mod.save_db(items)
+    body = client.get("/subwoofers?sort=price&limit=3").json()
+    assert body["items"] == [asdict(i) for i in items[:3]]
+    assert body["total"] == 5 and body["offset"] == 0 and body["next_cursor"]
+    size = client.get("/subwoofers/size/10").json()
+    assert size["count"] == 5 and size["items"] == [asdict(i) for i in items]
@@ -27,6 +27,7 @@ class FakeSub:
 
 def test_size_endpoint_success(monkeypatch, client, tmp_path):
     monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    monkeypatch.setattr(mod, "SIZE_ROOT", tmp_path / "subwoofers")
     subs = [FakeSub(size_in=10.0, url="http://example.com/a"), FakeSub(size_in=10.2, url="http://example.com/b"), FakeSub(size_in=8.0, url="http://example.com/c")]
     mod.save_db(subs)
     r = client.get("/subwoofers/size/10")
@@ -39,6 +40,7 @@ def test_size_endpoint_success(monkeypatch, client, tmp_path):
 
 def test_size_endpoint_missing(monkeypatch, client, tmp_path):
     monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    monkeypatch.setattr(mod, "SIZE_ROOT", tmp_path / "subwoofers")
     # Do not create bucket
     r = client.get("/subwoofers/size/15")
     assert r.status_code == 404
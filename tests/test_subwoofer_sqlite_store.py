@@ -0,0 +1,101 @@
+import json, random, time
+from dataclasses import asdict
+
+from app.api.routes import subwoofers as mod
+from app.api.routes.subwoofers import Subwoofer
+from app.catalog import JsonStore, SearchFilters
+from app.catalog.sqlite_store import SqliteStore, import_json
+from app.core.config import get_settings
+
+
+def _mk(i, size=None, rms=None, price=None, brand="Brand", imp=None, box=None):
+    return Subwoofer(source="synthetic", url=f"http://example.com/{i}", brand=brand, model=f"M{i}", size_in=size,
+                     rms_w=rms, peak_w=None, impedance_ohm=imp, sensitivity_db=None, mounting_depth_in=None,
+                     cutout_diameter_in=None, displacement_cuft=None, recommended_box=box, price_usd=price,
+                     image=None, scraped_at=time.time())
+
+
+def _random_items(n=250, seed=3):
+    rnd = random.Random(seed)
+    return [_mk(
+        i,
+        size=rnd.choice([None, 8.0, 10.0, 10.2, 12.0]),
+        rms=rnd.choice([None, 0, 300, 500, 900]),
+        price=rnd.choice([None, 0.0, 89.0, 150.0, 310.0]),
+        brand=rnd.choice(["Alpha", "Beta", ""]),
+        imp=rnd.choice([None, 0.0, 2.0, 3.99, 4.0, 4.01]),
+        box=rnd.choice([None, "sealed", "ported"]),
+    ) for i in range(n)]
+
+
+def test_sqlite_search_matches_json_backend(tmp_path):
+    items = _random_items()
+    json_store = JsonStore(tmp_path / "subwoofers.json")
+    json_store.replace_all(items)
+    sql_store = SqliteStore(tmp_path / "subwoofers.sqlite3")
+    sql_store.replace_all(items)
+    cases = [
+        SearchFilters(),
+        SearchFilters(size_min=10.0),
+        SearchFilters(size_max=10.0, rms_min=300),
+        SearchFilters(rms_max=500, brand="alp"),
+        SearchFilters(impedance_ohm=4.0),
+        SearchFilters(size_min=8.0, size_max=12.0, box_type="port", text="m1"),
+    ]
+    for f in cases:
+        for sort in (None, "price", "rms", "size"):
+            expected = [i.url for i in json_store.search(f, sort)]
+            assert [i.url for i in sql_store.search(f, sort)] == expected, (f, sort)
+    sql_store.close()
+
+
+def test_sqlite_upsert_touches_single_row_and_keeps_position(tmp_path):
+    store = SqliteStore(tmp_path / "subwoofers.sqlite3")
+    store.replace_all([_mk(1, size=8.0, price=100.0), _mk(2, size=10.0), _mk(3, size=12.0)])
+    first = store.snapshot()
+    store.upsert([_mk(2, size=10.0, price=55.0), _mk(4, size=15.0)])
+    snap = store.snapshot()
+    assert snap is not first  # own writes invalidate the cached snapshot
+    assert [i.url.rsplit("/", 1)[-1] for i in snap.items] == ["1", "2", "3", "4"]
+    assert snap.items[1].price_usd == 55.0
+    assert store.count() == 4
+    store.close()
+
+
+def test_sqlite_writes_publish_without_loading_the_table(monkeypatch, tmp_path):
+    store = SqliteStore(tmp_path / "subwoofers.sqlite3")
+    one = _mk(1, price=100.0)
+    store.replace_all([one, _mk(2, price=90.0)])
+    monkeypatch.setattr(store, "select_all", lambda: (_ for _ in ()).throw(AssertionError("full table read")))
+    version = store.changes.version
+    store.upsert([one, _mk(2, price=70.0), _mk(3)])  # record 1 unchanged -> no event
+    store.delete([_mk(3).url, "http://example.com/missing"])
+    events = store.changes.since(version)[0]
+    assert [(e.op, e.url[-1]) for e in events] == [("upsert", "2"), ("upsert", "3"), ("delete", "3")]
+    assert events[0].record.price_usd == 70.0
+    store.close()
+
+
+def test_import_json_accepts_lite_records(tmp_path):
+    src = tmp_path / "subwoofers.json"
+    lite = {"source": "sonic", "url": "https://sonic.example/item-1", "brand": "BrandX", "model": "Beta",
+            "size_in": 8.0, "rms_w": 325, "price_usd": 149.99, "scraped_at": 1.0}
+    src.write_text(json.dumps([asdict(_mk(1, size=12.0)), lite]), encoding="utf-8")
+    assert import_json(src, tmp_path / "subwoofers.sqlite3") == 2
+
+
+def test_routes_use_sqlite_backend_when_selected(monkeypatch, tmp_path, client):
+    monkeypatch.chdir(tmp_path)  # keep per-size buckets out of the repo tree
+    monkeypatch.setattr(mod, "DB_PATH", tmp_path / "subwoofers.json")
+    monkeypatch.setenv("SUBWOOFER_STORE", "sqlite")
+    get_settings.cache_clear()
+    try:
+        mod.save_db([_mk(1, size=12.0, rms=500), _mk(2, size=8.0, rms=250)])
+        mod.upsert_db([_mk(3, size=12.0, rms=800)])
+        assert (tmp_path / "subwoofers.sqlite3").exists()
+        assert not (tmp_path / "subwoofers.json").exists()
+        r = client.get("/subwoofers?size_min=10&sort=rms")
+        assert r.status_code == 200
+        assert [i["model"] for i in r.json()["items"]] == ["M3", "M1"]
+    finally:
+        get_settings.cache_clear()
@@ -0,0 +1,64 @@
+import time
+
+from app.api.routes.subwoofers import Subwoofer
+from app.catalog import CatalogSnapshot, SearchFilters
+from app.catalog.text_index import TextIndex, tokenize
+
+
+def _mk(i, brand="Brand", model=None, box=None, url=None, size=None):
+    return Subwoofer(source="synthetic", url=url or f"http://example.com/{i}", brand=brand, model=model or f"M{i}",
+                     size_in=size, rms_w=None, peak_w=None, impedance_ohm=None, sensitivity_db=None,
+                     mounting_depth_in=None, cutout_diameter_in=None, displacement_cuft=None, recommended_box=box,
+                     price_usd=None, image=None, scraped_at=time.time())
+
+
+ITEMS = [
+    _mk(0, brand="JL Audio", model="12W3v3-4", box="sealed"),
+    _mk(1, brand="JL Audio", model="10W6v3", box="ported"),
+    _mk(2, brand="Sundown Audio", model="X-12 v3", box="ported"),
+    _mk(3, brand="Kicker", model="CompR 12", url="http://example.com/jl-audio-compatible"),
+    _mk(4, brand="Rockford Fosgate", model="P3D4-12", size=12.0),
+]
+
+
+def _models(items):
+    return [i.model for i in items]
+
+
+def test_tokenize_splits_on_punctuation():
+    assert tokenize("12W3v3-4 (Sealed)") == ["12w3v3", "4", "sealed"]
+    assert tokenize(None) == []
+
+
+def test_prefix_infix_and_multi_term():
+    snap = CatalogSnapshot(ITEMS, None, 1)
+    assert _models(snap.search(SearchFilters(text="12w3"))) == ["12W3v3-4"]  # model-number prefix
+    assert _models(snap.search(SearchFilters(text="W6"))) == ["10W6v3"]  # infix inside a token
+    assert _models(snap.search(SearchFilters(text="audio ported"))) == ["10W6v3", "X-12 v3"]  # AND, brand order
+    assert snap.search(SearchFilters(text="kicker sealed")) == []
+
+
+def test_brand_alias_and_relevance():
+    snap = CatalogSnapshot(ITEMS, None, 1)
+    assert _models(snap.search(SearchFilters(text="rf"))) == ["P3D4-12"]
+    # Brand hits outrank a URL-only hit; explicit sort keeps sort order
+    assert _models(snap.search(SearchFilters(text="jl")))[-1] == "CompR 12"
+    assert _models(snap.search(SearchFilters(text="jl"), sort="relevance"))[-1] == "CompR 12"
+    sized = snap.search(SearchFilters(text="12", size_min=10.0), sort="size")
+    assert _models(sized) == ["P3D4-12"]
+
+
+def test_punctuation_only_query_falls_back_to_substring():
+    snap = CatalogSnapshot(ITEMS, None, 1)
+    assert _models(snap.search(SearchFilters(text="-"))) == ["12W3v3-4", "CompR 12", "P3D4-12", "X-12 v3"]
+
+
+def test_lookup_is_fast_on_large_catalog():
+    items = [_mk(i, brand=f"Brand{i % 50}", model=f"X{i}Q{i % 7}") for i in range(20000)]
+    index = TextIndex(items)
+    start = time.perf_counter()
+    for _ in range(100):
+        hits = index.search("x1234q")
+    per_query = (time.perf_counter() - start) / 100
+    assert set(hits) == {1234}
+    assert per_query < 0.005
@@ -0,0 +1,99 @@
+import json, time
+
+import pytest
+
+from app.api.routes.subwoofers import Subwoofer
+from app.catalog import JsonStore
+from app.catalog import wal
+
+
+def _mk(i, size=8.0, price=None):
+    return Subwoofer(source="synthetic", url=f"http://example.com/{i}", brand="Brand", model=f"M{i}", size_in=size,
+                     rms_w=None, peak_w=None, impedance_ohm=None, sensitivity_db=None, mounting_depth_in=None,
+                     cutout_diameter_in=None, displacement_cuft=None, recommended_box=None, price_usd=price,
+                     image=None, scraped_at=time.time())
+
+
+def test_upsert_appends_to_log_without_rewriting_base(tmp_path):
+    store = JsonStore(tmp_path / "subwoofers.json")
+    store.replace_all([_mk(1), _mk(2)])
+    base_before = store.path.stat().st_mtime_ns
+    store.upsert([_mk(2, price=99.0), _mk(3)])
+    assert store.path.stat().st_mtime_ns == base_before
+    stamp, *lines = store.log_path.read_text(encoding="utf-8").splitlines()
+    assert json.loads(stamp) == wal.base_stamp(store.path)
+    assert [json.loads(l)["record"]["url"] for l in lines] == ["http://example.com/2", "http://example.com/3"]
+    items = store.snapshot().items
+    # Existing URL keeps its position, new one is appended
+    assert [i.model for i in items] == ["M1", "M2", "M3"]
+    assert items[1].price_usd == 99.0
+    # A further append is replayed from the log tail only
+    store.upsert([_mk(4)])
+    assert [i.model for i in store.snapshot().items] == ["M1", "M2", "M3", "M4"]
+
+
+def test_compaction_folds_log_and_preserves_lite_records(tmp_path):
+    base = tmp_path / "subwoofers.json"
+    lite = {"source": "sonic", "url": "https://sonic.example/item-1", "brand": "BrandX", "model": "Beta",
+            "size_in": 8.0, "rms_w": 325, "price_usd": 149.99, "scraped_at": 1.0}
+    base.write_text(json.dumps([lite]), encoding="utf-8")
+    store = JsonStore(base)
+    store.upsert([_mk(1)])
+    assert store.compact() is True
+    assert not store.log_path.exists()
+    assert not wal.compacting_path_for(base).exists()
+    stored = json.loads(base.read_text(encoding="utf-8"))
+    assert [d["url"] for d in stored] == ["https://sonic.example/item-1", "http://example.com/1"]
+    assert stored[0] == lite
+    assert store.compact() is False
+
+
+def test_background_compaction_past_threshold(tmp_path):
+    store = JsonStore(tmp_path / "subwoofers.json", compact_threshold=200)
+    store.replace_all([_mk(0)])
+    store.upsert([_mk(i) for i in range(1, 6)])
+    worker = store.schedule_compaction()
+    worker.join(timeout=5)
+    assert not store.log_path.exists()
+    assert len(json.loads(store.path.read_text(encoding="utf-8"))) == 6
+    assert len(store.snapshot().items) == 6
+
+
+def test_replace_all_supersedes_log(tmp_path):
+    store = JsonStore(tmp_path / "subwoofers.json")
+    store.upsert([_mk(1), _mk(2)])
+    store.replace_all([_mk(3)])
+    assert not store.log_path.exists()
+    assert [i.model for i in store.snapshot().items] == ["M3"]
+
+
+def test_failed_replace_all_keeps_base_and_log(monkeypatch, tmp_path):
+    from app.catalog import store as store_mod
+    store = JsonStore(tmp_path / "subwoofers.json")
+    store.replace_all([_mk(1)])
+    store.upsert([_mk(2)])
+
+    def crash(path, text):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(store_mod, "atomic_write_text", crash)
+    with pytest.raises(OSError):
+        store.replace_all([_mk(3)])
+    assert store.log_path.exists()
+    assert [i.model for i in JsonStore(store.path).snapshot().items] == ["M1", "M2"]
+
+
+def test_log_is_discarded_when_base_file_is_rewritten(tmp_path):
+    base = tmp_path / "subwoofers.json"
+    store = JsonStore(base)
+    store.replace_all([_mk(1)])
+    store.upsert([_mk(2), _mk(3)])
+    # Something else restores / seeds the base file; the old log must not be replayed over it
+    base.write_text(json.dumps([_mk(9).to_dict()]), encoding="utf-8")
+    assert [i.model for i in store.snapshot().items] == ["M9"]
+    assert [i.model for i in JsonStore(base).snapshot().items] == ["M9"]
+    store.upsert([_mk(4)])  # starts a fresh log stamped for the new base
+    assert [i.model for i in store.snapshot().items] == ["M9", "M4"]
+    assert len(store.log_path.read_text(encoding="utf-8").splitlines()) == 2
+    assert store.compact() is True
+    assert [d["model"] for d in wal.read_base(base)] == ["M9", "M4"]
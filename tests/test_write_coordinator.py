@@ -0,0 +1,57 @@
+import json, multiprocessing, time
+
+from app.api.routes import sonic
+from app.api.routes import subwoofers as mod
+from app.api.routes.subwoofers import Subwoofer
+from app.catalog import JsonStore, wal
+from app.core.write_coordinator import get_coordinator, read_version
+
+ROUNDS = 12
+
+
+def _mk(url):
+    return Subwoofer(source="synthetic", url=url, brand="Brand", model="M", size_in=None, rms_w=None, peak_w=None,
+                     impedance_ohm=None, sensitivity_db=None, mounting_depth_in=None, cutout_diameter_in=None,
+                     displacement_cuft=None, recommended_box=None, price_usd=None, image=None, scraped_at=time.time())
+
+
+def _worker(worker_id, db_path):
+    # Simulates one uvicorn worker mixing log upserts with whole-file lite merges
+    mod.DB_PATH = sonic.DB_PATH = db_path
+    for n in range(ROUNDS):
+        url = f"http://example.com/{worker_id}/{n}"
+        if n % 2:
+            sonic._merge_save([sonic.SonicSubLite(source="sonic", url=url, brand="B", model="M", size_in=None,
+                                                  rms_w=None, price_usd=None, scraped_at=1.0)])
+        else:
+            mod.upsert_db([_mk(url)])
+
+
+def test_concurrent_workers_do_not_lose_records(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    db_path = tmp_path / "subwoofers.json"
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_worker, args=(w, db_path)) for w in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(timeout=60)
+        assert p.exitcode == 0
+    JsonStore(db_path).compact()
+    urls = {d["url"] for d in wal.read_base(db_path)}
+    assert len(urls) == 4 * ROUNDS
+    assert read_version(db_path) >= 4 * ROUNDS
+
+
+def test_version_bumps_once_per_outermost_section_and_refreshes_catalog(tmp_path):
+    store = JsonStore(tmp_path / "subwoofers.json")
+    store.replace_all([_mk("http://example.com/a")])
+    snap = store.snapshot()
+    coord = get_coordinator(store.path)
+    v = coord.version()
+    with coord.write():
+        with coord.write():
+            pass
+    assert coord.version() == v + 1
+    # Another worker's write is detected through the version even if file stats look the same
+    assert store.snapshot() is not snap